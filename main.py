@@ -1,15 +1,12 @@
 from src.ingame_loop import IngameLoop
 from src.settings import LevelSetupConsts
-from tests.sim_validation import SimValidation
+from tests.snapshot_runner import SnapshotRunner
 import cProfile
 
 #%%
 def main() -> None:
     # Run tests
-    SimValidation.simulate_game_in_console(
-            LevelSetupConsts.BRAVO_SETUP_SPELL_IDS,
-            LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING
-        )
+    SnapshotRunner.run_all_scenarios()
     # Actually play the play
     IngameLoop.play_game_in_pygame(
         LevelSetupConsts.BRAVO_SETUP_SPELL_IDS,
@@ -6,7 +6,7 @@ from src.world_state.world_state import DisplayObj, SpellVfxData, WorldState
 class IngameLoop:
 
     @staticmethod
-    def play_game_in_pygame(setup_spell_ids: list[int], scripted_player_input: dict[int, list[str]] | None = None) -> None:
+    def play_game_in_pygame(setup_spell_ids: list[int], scripted_player_input: dict[int, list[int]] | None = None) -> None:
 
         # Initialization
         rendering_framework = PygameRenderer()
@@ -17,8 +17,10 @@ class IngameLoop:
         world_state = WorldState()
         world_state.process_setup_events(ingame_time, setup_spell_ids)
         ui_manager = UiManager()
+        ui_manager.attach_combat_meter(world_state.combat_meter)
+        spell_config_watcher = world_state.create_spell_config_watcher()
 
-        player_inputs_this_frame: list[str] = []
+        player_inputs_this_frame: list[int] = []
         while rendering_framework.is_running():
             # Update time (and because smallest in-game timeunit is 1ms, ensure rounding error stays +/- 1ms throughout the game)
             current_time = rendering_framework.get_current_time()
@@ -33,7 +35,7 @@ class IngameLoop:
 
             player_inputs_this_frame.clear()
             if scripted_player_input is None:
-                current_inputs: list[str] = rendering_framework.fetch_player_input()
+                current_inputs: list[int] = rendering_framework.fetch_player_input()
                 if current_inputs:
                     player_inputs_this_frame.extend(current_inputs)
             else:
@@ -43,6 +45,8 @@ class IngameLoop:
                     if (ingame_time - rounded_delta_time_ms) < timestamp <= ingame_time:
                         player_inputs_this_frame.extend(inputs)
 
+            # Pick up spell config edits without restarting the game
+            spell_config_watcher.poll()
             # Simulate next frame
             world_state.process_frame(player_inputs_this_frame, ingame_time)
             # Render the frame we just simulated
@@ -6,9 +6,9 @@ class InputHandler:
     def __init__(self):
         self.running = True
 
-    def fetch_player_input(self) -> list[str]:
+    def fetch_player_input(self) -> list[int]:
         """Process pygame events and return a list of input constants"""
-        inputs: list[str] = []
+        inputs: list[int] = []
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
@@ -20,7 +20,7 @@ class InputHandler:
 
         return inputs
 
-    def _handle_keyup(self, event: pygame.event.Event, inputs: list[str]) -> None:
+    def _handle_keyup(self, event: pygame.event.Event, inputs: list[int]) -> None:
         if event.key == pygame.K_w:
             inputs.append(HardwareInputConsts.KEYBOARD_KEYUP_ARROW_UP)
         elif event.key == pygame.K_a:
@@ -30,7 +30,7 @@ class InputHandler:
         elif event.key == pygame.K_d:
             inputs.append(HardwareInputConsts.KEYBOARD_KEYUP_ARROW_RIGHT)
 
-    def _handle_keydown(self, event: pygame.event.Event, inputs: list[str]) -> None:
+    def _handle_keydown(self, event: pygame.event.Event, inputs: list[int]) -> None:
         if event.key == pygame.K_w:
             inputs.append(HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_UP)
         elif event.key == pygame.K_a:
@@ -42,7 +42,7 @@ class PygameRenderer:
     def is_running(self) -> bool:
         return self._input_handler.is_running()
 
-    def fetch_player_input(self) -> list[str]:
+    def fetch_player_input(self) -> list[int]:
         return self._input_handler.fetch_player_input()
 
     def get_current_time(self) -> float:
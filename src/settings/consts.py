@@ -6,11 +6,16 @@ class Consts:
     MAX_ID: int = 999_999
     EMPTY_TIMESTAMP: int = -999
 
-    EVENT_HEAP_MAX_ITERATIONS: int = 100_000
+    EVENT_BUDGET_PER_FRAME: int = 10_000
 
     BASE_GCD: int = 1000
+    SPELL_QUEUE_WINDOW: int = 400
     MOVEMENT_DISTANCE_PER_SECOND: float = 0.1
     MOVEMENT_UPDATES_PER_SECOND: int = 50
+    PLAY_AREA_MIN: float = 0.0
+    PLAY_AREA_MAX: float = 1.0
+    WALL_CONTACT_SPELL_ID: int = 364
+    DEATH_SPELL_ID: int = 365
 
     @staticmethod
     def is_empty_id(id_num: int) -> bool:
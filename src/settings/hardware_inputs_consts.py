@@ -1,22 +1,24 @@
-
-
 class HardwareInputConsts:
+    """
+    Hardware inputs, interned to small ints where the InputHandler reads them, so that a binding table
+    can resolve an input by indexing instead of hashing a string. 0 is never an input.
+    """
 
-    KEYBOARD_KEYDOWN_1 = "BUILTIN_KEYBOARD_KEYDOWN_1"
-    KEYBOARD_KEYDOWN_2 = "BUILTIN_KEYBOARD_KEYDOWN_2"
-    KEYBOARD_KEYDOWN_3 = "BUILTIN_KEYBOARD_KEYDOWN_3"
-    KEYBOARD_KEYDOWN_4 = "BUILTIN_KEYBOARD_KEYDOWN_4"
+    KEYBOARD_KEYDOWN_1 = 1
+    KEYBOARD_KEYDOWN_2 = 2
+    KEYBOARD_KEYDOWN_3 = 3
+    KEYBOARD_KEYDOWN_4 = 4
 
-    KEYBOARD_KEYDOWN_TAB = "BUILTIN_KEYBOARD_KEYDOWN_TAB"
+    KEYBOARD_KEYDOWN_TAB = 5
 
-    KEYBOARD_KEYDOWN_ARROW_UP = "BUILTIN_KEYBOARD_KEYDOWN_ARROW_UP"
-    KEYBOARD_KEYUP_ARROW_UP = "BUILTIN_KEYBOARD_KEYUP_ARROW_UP"
+    KEYBOARD_KEYDOWN_ARROW_UP = 6
+    KEYBOARD_KEYUP_ARROW_UP = 7
 
-    KEYBOARD_KEYDOWN_ARROW_LEFT  = "BUILTIN_KEYBOARD_KEYDOWN_ARROW_LEFT"
-    KEYBOARD_KEYUP_ARROW_LEFT  = "BUILTIN_KEYBOARD_KEYUP_ARROW_LEFT"
+    KEYBOARD_KEYDOWN_ARROW_LEFT  = 8
+    KEYBOARD_KEYUP_ARROW_LEFT  = 9
 
-    KEYBOARD_KEYDOWN_ARROW_DOWN  = "BUILTIN_KEYBOARD_KEYDOWN_ARROW_DOWN"
-    KEYBOARD_KEYUP_ARROW_DOWN  = "BUILTIN_KEYBOARD_KEYUP_ARROW_DOWN"
+    KEYBOARD_KEYDOWN_ARROW_DOWN  = 10
+    KEYBOARD_KEYUP_ARROW_DOWN  = 11
 
-    KEYBOARD_KEYDOWN_ARROW_RIGHT  = "BUILTIN_KEYBOARD_KEYDOWN_ARROW_RIGHT"
-    KEYBOARD_KEYUP_ARROW_RIGHT  = "BUILTIN_KEYBOARD_KEYUP_ARROW_RIGHT"
\ No newline at end of file
+    KEYBOARD_KEYDOWN_ARROW_RIGHT  = 12
+    KEYBOARD_KEYUP_ARROW_RIGHT  = 13
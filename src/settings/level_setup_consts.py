@@ -4,7 +4,7 @@ class LevelSetupConsts:
 
     BRAVO_SETUP_SPELL_IDS: list[int] = [9001]
     TEST_SETUP_SPELL_IDS: list[int] = [300]
-    SCRIPTED_PLAYER_INPUT_FOR_TESTING: dict[int, list[str]] = {
+    SCRIPTED_PLAYER_INPUT_FOR_TESTING: dict[int, list[int]] = {
         200: [HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_UP],
         300: [HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_RIGHT ],
         400: [HardwareInputConsts.KEYBOARD_KEYUP_ARROW_RIGHT , HardwareInputConsts.KEYBOARD_KEYUP_ARROW_UP],
@@ -127,6 +127,12 @@ class UiEvent:
         return cls(event_type=event_type, source_id=source_id, spell_id=spell_id, target_id=target_id, amount=amount)
 
 
+class ICombatMeter(Protocol):
+    def get_dps(self, source_id: int, current_time: int) -> float: ...
+    def get_hps(self, source_id: int, current_time: int) -> float: ...
+    def get_damage_taken_per_second(self, target_id: int, current_time: int) -> float: ...
+
+
 class IWeakAura(Protocol):
     def apply_event_to_weakaura(self, ui_event: UiEvent) -> None: ...
     # Not fully implemented
@@ -149,6 +155,15 @@ class UiManager:
         self._current_frame_id: int = 0
         self._weakauras: list[IWeakAura] = []
         self._render_actions: list[IRenderAction] = []
+        self._combat_meter: Optional[ICombatMeter] = None
+
+    @property
+    def combat_meter(self) -> Optional[ICombatMeter]:
+        return self._combat_meter
+
+    def attach_combat_meter(self, combat_meter: ICombatMeter) -> None:
+        """Gives meter displays read access to the world state's live damage and healing numbers."""
+        self._combat_meter = combat_meter
 
     def clear_current_frame_event_cache(self) -> None:
         self._current_frame_id += 1
@@ -10,6 +10,7 @@ class Logger:
     FOLDERNAME_LOGS = "logs"
     FILENAME_COMBAT_EVENT_LOG = "combat_events"
     FILENAME_OBJ_UPDATES_LOG = "obj_updates"
+    FILENAME_SPELL_CONFIG_LOG = "spell_configs"
 
     _initialized_loggers: dict[str, logging.Logger] = {}
 
@@ -1,7 +1,9 @@
+from ._frame_budget import FrameBudget
 from .event_handler import EventHandler
 from .id_gen import IdGen
 
 __all__ = [
     "EventHandler",
+    "FrameBudget",
     "IdGen",
 ]
\ No newline at end of file
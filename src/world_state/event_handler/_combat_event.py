@@ -2,7 +2,7 @@ import json
 from dataclasses import dataclass
 
 from src.settings import Consts
-from ._outcome import Outcome
+from ._outcome import Outcome, OutcomeCode
 
 @dataclass(slots=True)
 class CombatEvent:
@@ -13,7 +13,7 @@ class CombatEvent:
     spell_id: int = Consts.EMPTY_ID
     target_id: int = Consts.EMPTY_ID
 
-    outcome: Outcome = Outcome.EMPTY
+    outcome: int = OutcomeCode.EMPTY
 
     spell_modifier: float = 1.0
 
@@ -41,4 +41,8 @@ class CombatEvent:
 
     @property
     def outcome_is_valid(self) -> bool:
-        return self.outcome.outcome_is_valid
\ No newline at end of file
+        return self.outcome == OutcomeCode.SUCCESS
+
+    @property
+    def outcome_enum(self) -> Outcome:
+        return Outcome(self.outcome)
\ No newline at end of file
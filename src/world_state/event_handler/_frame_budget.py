@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+from src.settings import Consts
+
+
+@dataclass(slots=True)
+class FrameBudget:
+    """
+    Caps how many events a single frame may process.
+
+    Once the budget is spent, the remaining due events stay in the heap and are processed first
+    next frame, still in timestamp order. A busy frame therefore spreads its work over a few frames
+    instead of stalling the game loop.
+    """
+    events_per_frame: int = Consts.EVENT_BUDGET_PER_FRAME
+    events_this_frame: int = 0
+    events_last_frame: int = 0
+    carried_over_events: int = 0  # Due events that were left in the heap when the last frame ended
+    overflowing_frames: int = 0  # Frames so far that ran out of budget
+    overflow_streak: int = 0  # Consecutive frames that ran out of budget, up to and including the last frame
+    peak_events_per_frame: int = 0
+    total_events: int = 0
+
+    @property
+    def is_spent(self) -> bool:
+        return self.events_this_frame >= self.events_per_frame
+
+    @property
+    def is_overflowing(self) -> bool:
+        return self.overflow_streak > 0
+
+    def count_event(self) -> None:
+        self.events_this_frame += 1
+
+    def close_frame(self, carried_over_events: int) -> None:
+        self.events_last_frame = self.events_this_frame
+        self.peak_events_per_frame = max(self.peak_events_per_frame, self.events_this_frame)
+        self.total_events += self.events_this_frame
+        self.events_this_frame = 0
+        self.carried_over_events = carried_over_events
+        if carried_over_events > 0:
+            self.overflowing_frames += 1
+            self.overflow_streak += 1
+        else:
+            self.overflow_streak = 0
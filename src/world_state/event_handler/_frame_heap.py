@@ -1,14 +1,20 @@
 import heapq
-from typing import Optional
+from typing import Iterable, Optional
 
-from src.settings import Consts
 from ._combat_event import CombatEvent
 
 
 class FrameHeap:
+    """
+    Events ordered by timestamp, then event_id.
+
+    Cancelled events are deleted lazily: their ids are remembered and the entries are skipped once
+    they reach the top of the heap, so cancelling never has to search or re-heapify. Only when cancelled
+    entries make up most of the heap is it rebuilt without them, so they stop weighing on every push and pop.
+    """
     def __init__(self) -> None:
         self._event_heap: list[tuple[int, int, CombatEvent]] = []
-        self._iterations_remaining = Consts.EVENT_HEAP_MAX_ITERATIONS
+        self._cancelled_event_ids: set[int] = set()
 
     @classmethod
     def create_heap_from_list_of_events(cls, events: list[CombatEvent]) -> 'FrameHeap':
@@ -21,18 +27,45 @@ class FrameHeap:
         next_event = self.peek_next_event()
         return next_event is not None and next_event.timestamp <= timestamp_to_stop_after
 
+    def count_unprocessed_events(self, timestamp_to_stop_after: float) -> int:
+        return sum(
+            1 for timestamp, event_id, _ in self._event_heap
+            if timestamp <= timestamp_to_stop_after and event_id not in self._cancelled_event_ids
+        )
+
     def insert_event(self, event: CombatEvent) -> None:
         event_key = (event.timestamp, event.event_id)
         heapq.heappush(self._event_heap, (*event_key, event))
         # Events are inserted by timestamp (primary) and event_id (secondary)
 
+    def cancel_event(self, event_id: int) -> None:
+        self._cancelled_event_ids.add(event_id)
+        self._compact_if_mostly_cancelled()
+
+    def cancel_events(self, event_ids: Iterable[int]) -> None:
+        self._cancelled_event_ids.update(event_ids)
+        self._compact_if_mostly_cancelled()
+
     def pop_next_event(self) -> CombatEvent:
-        assert self._iterations_remaining > 0, f"Event limit of {Consts.EVENT_HEAP_MAX_ITERATIONS} reached."
-        self._iterations_remaining -= 1
+        self._discard_cancelled_events()
         _, _, event = heapq.heappop(self._event_heap)
         return event
 
     def peek_next_event(self) -> Optional[CombatEvent]:
+        self._discard_cancelled_events()
         if len(self._event_heap) > 0:
             return self._event_heap[0][-1]
-        return None
\ No newline at end of file
+        return None
+
+    def _discard_cancelled_events(self) -> None:
+        cancelled_event_ids = self._cancelled_event_ids
+        while cancelled_event_ids and self._event_heap and self._event_heap[0][1] in cancelled_event_ids:
+            _, event_id, _ = heapq.heappop(self._event_heap)
+            cancelled_event_ids.discard(event_id)
+
+    def _compact_if_mostly_cancelled(self) -> None:
+        cancelled_event_ids = self._cancelled_event_ids
+        if 2 * len(cancelled_event_ids) > len(self._event_heap):
+            self._event_heap = [entry for entry in self._event_heap if entry[1] not in cancelled_event_ids]
+            heapq.heapify(self._event_heap)
+            cancelled_event_ids.clear()
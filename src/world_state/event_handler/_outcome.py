@@ -12,4 +12,16 @@ class Outcome(Enum):
 
     @property
     def outcome_is_valid(self) -> bool:
-        return self == Outcome.SUCCESS
\ No newline at end of file
+        return self == Outcome.SUCCESS
+
+
+class OutcomeCode:
+    """Plain-int outcome codes stored on CombatEvent; `Outcome(code)` turns one back into the enum for reporting."""
+    EMPTY: int = Outcome.EMPTY.value
+    SUCCESS: int = Outcome.SUCCESS.value
+    OUT_OF_RANGE: int = Outcome.OUT_OF_RANGE.value
+    GCD_NOT_READY: int = Outcome.GCD_NOT_READY.value
+    NO_TARGET_WAS_SELECTED: int = Outcome.NO_TARGET_WAS_SELECTED.value
+    SOURCE_IS_DISABLED: int = Outcome.SOURCE_IS_DISABLED.value
+    TARGET_IS_INVALID: int = Outcome.TARGET_IS_INVALID.value
+    AURA_NO_LONGER_EXISTS: int = Outcome.AURA_NO_LONGER_EXISTS.value
\ No newline at end of file
@@ -1,22 +1,36 @@
-from typing import Iterable
+import itertools
+from collections import deque
+from typing import Iterable, Iterator
 
 from src.settings import Consts
+from src.utils import Logger
 from ._combat_event import CombatEvent
 from ._event_log import EventLog
+from ._frame_budget import FrameBudget
 from ._frame_heap import FrameHeap
-from ._outcome import Outcome
-from .id_gen import IdGen
+from ._outcome import OutcomeCode
 
 
 class EventHandler:
     EMPTY_EVENT = CombatEvent(event_id=Consts.EMPTY_ID)
     def __init__(self) -> None:
         self._event_heap: FrameHeap = FrameHeap()
-        self._event_id_gen: IdGen = IdGen.create_preassigned_range(1, 100_000)
+        # Immediate events the frame budget cut off; they are older than anything due on the heap, so they go first
+        self._deferred_events: deque[CombatEvent] = deque()
+        self._event_ids: Iterator[int] = itertools.count(1)  # Event ids only order the heap, so they never run out
+        self._frame_budget: FrameBudget = FrameBudget()
         self._event_log_for_each_frame: dict[int, EventLog] = {}
         self._event_log_for_current_frame: EventLog = EventLog()
         self._current_event: CombatEvent = EventHandler.EMPTY_EVENT
 
+    @property
+    def frame_budget(self) -> FrameBudget:
+        return self._frame_budget
+
+    @property
+    def current_events_id(self) -> int:
+        return self._current_event.event_id
+
     @property
     def current_events_timestamp(self) -> int:
         return self._current_event.timestamp
@@ -34,13 +48,39 @@ class EventHandler:
         return self._current_event.target_id
 
     def has_unprocessed_events(self, frame_end: int) -> bool:
-        return self._event_heap.has_unprocessed_events(frame_end)
+        """Whether the frame should process another event; false once the frame budget is spent."""
+        return not self._frame_budget.is_spent and (bool(self._deferred_events) or self._event_heap.has_unprocessed_events(frame_end))
+
+    def has_due_events(self, timestamp: int) -> bool:
+        """Whether events up to the timestamp are still scheduled, even if the frame budget left them for a later frame."""
+        return bool(self._deferred_events) or self._event_heap.has_unprocessed_events(timestamp)
 
     def fetch_next_event(self) -> None:
         assert self._current_event.event_id == EventHandler.EMPTY_EVENT.event_id, "New event was fetched before previous event was finalized."
-        self._current_event = self._event_heap.pop_next_event()
+        self._current_event = self._deferred_events.popleft() if self._deferred_events else self._event_heap.pop_next_event()
+        self._frame_budget.count_event()
+
+    def discard_current_event(self) -> None:
+        """Drops the current event without logging it, e.g. when it is replaced by its expansion."""
+        self._current_event = EventHandler.EMPTY_EVENT
+
+    def start_immediate_event(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> None:
+        """Makes a new event current right away, bypassing the heap."""
+        assert self._current_event.event_id == EventHandler.EMPTY_EVENT.event_id, "New event was started before previous event was finalized."
+        event_id = next(self._event_ids)
+        self._current_event = CombatEvent(event_id, timestamp, source_id, spell_id, target_id)
+        self._frame_budget.count_event()
+
+    def defer_immediate_events(self, timestamp: int, source_id: int, spell_ids: Iterable[int]) -> None:
+        """
+        Self-targeted events that were due to start right away, but the frame budget is spent.
 
-    def finalize_event(self, finalized_target_id: int, outcome: Outcome) -> None:
+        They are fetched next frame ahead of the heap, since everything due there was dispatched after them.
+        """
+        for spell_id in spell_ids:
+            self._deferred_events.append(CombatEvent(next(self._event_ids), timestamp, source_id, spell_id, source_id))
+
+    def finalize_event(self, finalized_target_id: int, outcome: int) -> None:
         finalized_event = CombatEvent(
             event_id=self._current_event.event_id,
             timestamp=self._current_event.timestamp,
@@ -53,33 +93,62 @@ class EventHandler:
         self._current_event = EventHandler.EMPTY_EVENT
 
     def assign_outcome_success(self, finalized_target_id: int) -> None:
-        self.finalize_event(finalized_target_id, Outcome.SUCCESS)
+        self.finalize_event(finalized_target_id, OutcomeCode.SUCCESS)
 
     def assign_outcome_source_is_disabled(self, finalized_target_id: int) -> None:
-        self.finalize_event(finalized_target_id, Outcome.SOURCE_IS_DISABLED)
+        self.finalize_event(finalized_target_id, OutcomeCode.SOURCE_IS_DISABLED)
 
     def assign_outcome_gcd_not_ready(self, finalized_target_id: int) -> None:
-        self.finalize_event(finalized_target_id, Outcome.GCD_NOT_READY)
+        self.finalize_event(finalized_target_id, OutcomeCode.GCD_NOT_READY)
 
     def assign_outcome_invalid_target(self, finalized_target_id: int) -> None:
-        self.finalize_event(finalized_target_id, Outcome.TARGET_IS_INVALID)
+        self.finalize_event(finalized_target_id, OutcomeCode.TARGET_IS_INVALID)
 
     def assign_outcome_out_of_range(self, finalized_target_id: int) -> None:
-        self.finalize_event(finalized_target_id, Outcome.OUT_OF_RANGE)
+        self.finalize_event(finalized_target_id, OutcomeCode.OUT_OF_RANGE)
 
     def finalize_event_log_for_current_frame(self, current_frame_timestamp: int) -> None:
         self._event_log_for_each_frame[current_frame_timestamp] = self._event_log_for_current_frame
         self._event_log_for_current_frame = EventLog()
+        self._close_frame_budget(current_frame_timestamp)
+
+    def _close_frame_budget(self, current_frame_timestamp: int) -> None:
+        carried_over_events = 0
+        if self._frame_budget.is_spent:
+            carried_over_events = len(self._deferred_events) + self._event_heap.count_unprocessed_events(current_frame_timestamp)
+        was_overflowing = self._frame_budget.is_overflowing
+        overflow_streak = self._frame_budget.overflow_streak
+        self._frame_budget.close_frame(carried_over_events)
+        if self._frame_budget.is_overflowing and not was_overflowing:
+            Logger.warning(
+                f"Frame {current_frame_timestamp} exceeded its budget of {self._frame_budget.events_per_frame} events; "
+                f"{carried_over_events} events carried over to the next frame.",
+                Logger.FILENAME_COMBAT_EVENT_LOG
+            )
+        elif was_overflowing and not self._frame_budget.is_overflowing:
+            Logger.debug(
+                f"Event backlog cleared at frame {current_frame_timestamp} after {overflow_streak} overflowing frames.",
+                Logger.FILENAME_COMBAT_EVENT_LOG
+            )
 
     def get_successful_spell_ids(self, current_frame_timestamp: int) -> Iterable[int]:
         return self._event_log_for_each_frame[current_frame_timestamp].get_successful_spell_ids
 
-    def dispatch_upcoming_targeted_event(self, timestamp: int, source_id: int, spell_id: int, target_id) -> None:
-        event_id=self._event_id_gen.generate_new_id()
+    def dispatch_upcoming_targeted_event(self, timestamp: int, source_id: int, spell_id: int, target_id) -> int:
+        event_id = next(self._event_ids)
         setup_event = CombatEvent(event_id, timestamp, source_id, spell_id, target_id)
         self._event_heap.insert_event(setup_event)
+        return event_id
+
+    def cancel_upcoming_event(self, event_id: int) -> None:
+        """Cancels a dispatched event that has not been processed yet."""
+        self._event_heap.cancel_event(event_id)
+
+    def cancel_upcoming_events(self, event_ids: Iterable[int]) -> None:
+        """Cancels many dispatched events that have not been processed yet in one go."""
+        self._event_heap.cancel_events(event_ids)
 
     def dispatch_upcoming_untargeted_event(self, timestamp: int, source_id: int, spell_id: int) -> None:
-        event_id=self._event_id_gen.generate_new_id()
+        event_id = next(self._event_ids)
         setup_event = CombatEvent(event_id, timestamp, source_id, spell_id)
         self._event_heap.insert_event(setup_event)
\ No newline at end of file
@@ -30,6 +30,14 @@ class IdGen:
         assert new_id < Consts.MAX_ID, "ID is higher than Consts.MAX_ID."
         return new_id
 
+    def generate_new_id_block(self, count: int) -> list[int]:
+        """The next `count` IDs, taken in one go for a batch spawn."""
+        assert len(self._assigned_ids) >= count, "No more IDs available."
+        assigned_ids = self._assigned_ids
+        new_ids = [assigned_ids.popleft() for _ in range(count)]
+        assert all(Consts.MIN_ID < new_id < Consts.MAX_ID for new_id in new_ids), "ID is outside of Consts.MIN_ID and Consts.MAX_ID."
+        return new_ids
+
     def reserve_id(self, reserved_id: int) -> None:
         self._reserved_ids.add(reserved_id)
         self._assigned_ids = deque(id_num for id_num in self._assigned_ids if id_num != reserved_id)
\ No newline at end of file
@@ -1,8 +1,29 @@
 from .state_handler import StateHandler, DisplayObj
+from ._casting_system import Channel
+from ._combat_meter import CombatMeter, HealthChange, MeterEntry
+from ._movement_system import Pursuit, RangeWatch, WallContact
+from ._event_budget_analyzer import EventBudgetAnalyzer, EventBudgetReport, SpellEventBudget
+from ._spell_config_loader import SpellConfigLoader
+from ._spell_config_watcher import SpellConfigWatcher
+from ._spell_table import SpellConfigError, SpellTableDiff
 from ._vfx_and_sfx_system import SpellVfxData
 
 __all__ = [
+    "Channel",
+    "CombatMeter",
     "DisplayObj",
+    "EventBudgetAnalyzer",
+    "EventBudgetReport",
+    "HealthChange",
+    "MeterEntry",
+    "Pursuit",
+    "RangeWatch",
+    "SpellConfigError",
+    "SpellConfigLoader",
+    "SpellConfigWatcher",
+    "SpellEventBudget",
+    "SpellTableDiff",
     "SpellVfxData",
     "StateHandler",
+    "WallContact",
 ]
@@ -1,8 +1,11 @@
+import math
 from dataclasses import dataclass, field
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional, Tuple
 from enum import IntFlag, auto
 
 from src.settings import Consts
+from ._movement_system import RangeWatch
+from ._spell_table import SpellTable, SpellTableDiff
 
 
 class CastingBehavior(IntFlag):
@@ -14,26 +17,32 @@ class CastingBehavior(IntFlag):
     STOP_CHANNEL = auto()
 
 
-@dataclass(slots=True)
-class SpellCastingData:
-    flags: CastingBehavior = CastingBehavior.NONE
-    timeline: dict[int, list[int]] = field(default_factory=dict)
-    base_cooldown: float = 0.0
-    hardware_bindings: dict[str, int] = field(default_factory=dict)
-    gcd_mod: float = 1.0
-    channel_duration: int = field(init=False, default=0)
+# Plain-int masks for the hot path; an IntFlag operand would route every `&` through enum code
+_TRIGGER_GCD = CastingBehavior.TRIGGER_GCD.value
+_TRIGGER_COOLDOWN = CastingBehavior.TRIGGER_COOLDOWN.value
+_START_CHANNEL = CastingBehavior.START_CHANNEL.value
+_STOP_CHANNEL = CastingBehavior.STOP_CHANNEL.value
 
-    def __post_init__(self):
-        # Infer how long this channel lasts by the final timestamp in its timeline
-        self.channel_duration = max(self.timeline.keys()) if self.timeline else 0
+# Ready-at timestamp of a GCD or cooldown that never ran; every in-game timestamp is at or after it
+_ALWAYS_READY = 0
+# Binding table without a single bound input, shared by every object that never receives input
+_NO_BINDINGS_ID = 0
 
 
 @dataclass(slots=True)
 class ObjCastingData:
-    ability_cd_start: dict[int, int] = field(default_factory=dict)
-    gcd_start: int = -10000
+    """
+    Casting state of a GameObj. The GCD and cooldowns are stored as the absolute timestamp they are ready
+    at, so checking one is a single comparison. `cooldown_ready_at` is indexed by the SpellTable's
+    cooldown slots and only grows once the object triggers a cooldown. Input bindings are not copied
+    into the object; it refers to one of the CastingSystem's shared binding tables by id.
+    Inputs arriving at most `spell_queue_window` ms before the GCD is ready are queued instead of rejected.
+    """
+    gcd_ready_at: int = _ALWAYS_READY
+    cooldown_ready_at: list[int] = field(default_factory=list)
     gcd_mod: float = 1.0
-    hardware_bindings: dict[str, int] = field(default_factory=dict)
+    binding_table_id: int = _NO_BINDINGS_ID
+    spell_queue_window: int = Consts.SPELL_QUEUE_WINDOW
     current_spell_cast: int = Consts.EMPTY_ID
     cast_start_time: int = 0
 
@@ -42,125 +51,318 @@ class ObjCastingData:
         return cls()
 
     @classmethod
-    def create_from_spell(cls, timestamp: int, spell_data: SpellCastingData) -> 'ObjCastingData':
+    def create_from_spell(cls, timestamp: int, spell_table: SpellTable, slot: int, binding_table_id: int) -> 'ObjCastingData':
         return cls(
-            ability_cd_start={},
-            gcd_start=-10000,
-            gcd_mod=spell_data.gcd_mod,
-            hardware_bindings=spell_data.hardware_bindings.copy() if spell_data.hardware_bindings else {},
+            gcd_ready_at=_ALWAYS_READY,
+            cooldown_ready_at=[],
+            gcd_mod=spell_table.gcd_mods[slot],
+            binding_table_id=binding_table_id,
+            spell_queue_window=Consts.SPELL_QUEUE_WINDOW,
             current_spell_cast=Consts.EMPTY_ID,
             cast_start_time=timestamp,
         )
 
 
+@dataclass(slots=True)
+class QueuedCast:
+    """An input that arrived shortly before its source's GCD was ready, scheduled for the ready timestamp."""
+    obj_id: int
+    spell_id: int
+    cast_time: int
+    event_id: int = Consts.EMPTY_ID
+
+
+@dataclass(slots=True, eq=False)
+class Channel:
+    """
+    A channel an object is running, with the upcoming events and range watches its cast scheduled.
+    Processed events leave `event_ids`, so interrupting the channel only cancels events still in the heap.
+    """
+    obj_id: int
+    spell_id: int
+    event_ids: set[int] = field(default_factory=set)
+    range_watches: list[RangeWatch] = field(default_factory=list)
+
+
 class CastingSystem:
-    def __init__(self, spell_data_dct: Dict[int, SpellCastingData]) -> None:
-        self.spell_data_dct: Dict[int, SpellCastingData] = spell_data_dct
+    """
+    Manages casting, cooldowns and input bindings.
+
+    Binding tables are immutable tuples indexed by input code and interned by content, so every object
+    spawned by the same spell (and every object with no bindings at all) shares one table. Rebinding an
+    input builds a new table instead of editing the shared one.
+
+    Each object holds at most one queued cast; a later early input replaces it, so its event must be cancelled.
+    Likewise, each object runs at most one channel. A stop spell, a new channel, death or despawn interrupt it,
+    and interrupted channels are handed out by `pop_interrupted_channels` to retire their scheduled events.
+    """
+    def __init__(self, spell_table: SpellTable) -> None:
+        self.spell_table: SpellTable = spell_table
         self.game_obj_data_dct: Dict[int, ObjCastingData] = {}
+        self._binding_tables: list[Tuple[int, ...]] = [()]
+        self._binding_table_ids: Dict[Tuple[int, ...], int] = {(): _NO_BINDINGS_ID}
+        self._queued_casts: Dict[int, QueuedCast] = {}  # Keyed by obj_id
+        self._queued_casts_by_event: Dict[int, QueuedCast] = {}
+        self._channels: Dict[int, Channel] = {}  # Keyed by obj_id
+        self._channels_by_event: Dict[int, Channel] = {}
+        self._interrupted_channels: list[Channel] = []
+
+    def patch_spell_table(self, spell_table: SpellTable, diff: SpellTableDiff) -> None:
+        old_table, self.spell_table = self.spell_table, spell_table
+        # Added cooldown spells shift the dense cooldown slots, so running cooldowns move to their new slots
+        old_cooldown_spell_ids = [spell_id for spell_id, cooldown_slot in zip(old_table.spell_ids, old_table.cooldown_slots) if cooldown_slot != SpellTable.MISSING_SLOT]
+        new_cooldown_slots = [spell_table.cooldown_slots[spell_table.slot_of(spell_id)] for spell_id in old_cooldown_spell_ids]
+        if new_cooldown_slots == list(range(len(new_cooldown_slots))):
+            return
+        for obj_data in self.game_obj_data_dct.values():
+            old_ready_at = obj_data.cooldown_ready_at
+            obj_data.cooldown_ready_at = []
+            for old_cooldown_slot, ready_at in enumerate(old_ready_at):
+                new_cooldown_slot = new_cooldown_slots[old_cooldown_slot]
+                if new_cooldown_slot != SpellTable.MISSING_SLOT:
+                    CastingSystem._set_cooldown_ready_at(obj_data, new_cooldown_slot, ready_at)
 
     def create_environment_obj(self, obj_id: int) -> None:
         self.game_obj_data_dct[obj_id] = ObjCastingData.create_environment()
 
     def spawn_game_obj(self, timestamp: int, new_obj_id: int, spell_id: int) -> None:
-        if spell_id not in self.spell_data_dct or new_obj_id in self.game_obj_data_dct:
+        self.spawn_game_objs(timestamp, [new_obj_id], spell_id)
+
+    def spawn_game_objs(self, timestamp: int, new_obj_ids: list[int], spell_id: int) -> None:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
-        spell_data = self.spell_data_dct[spell_id]
-        self.game_obj_data_dct[new_obj_id] = ObjCastingData.create_from_spell(timestamp, spell_data)
+        binding_table_id = self._intern_binding_table(self.spell_table.input_bindings[slot])
+        for new_obj_id in new_obj_ids:
+            if new_obj_id not in self.game_obj_data_dct:
+                self.game_obj_data_dct[new_obj_id] = ObjCastingData.create_from_spell(timestamp, self.spell_table, slot, binding_table_id)
 
     def despawn_game_obj(self, obj_id: int) -> None:
         self.game_obj_data_dct.pop(obj_id, None)
 
+    def _intern_binding_table(self, input_bindings: Tuple[int, ...]) -> int:
+        binding_table_id = self._binding_table_ids.get(input_bindings)
+        if binding_table_id is None:
+            binding_table_id = self._binding_table_ids[input_bindings] = len(self._binding_tables)
+            self._binding_tables.append(input_bindings)
+        return binding_table_id
+
+    def rebind_input(self, obj_id: int, input_code: int, spell_id: int) -> None:
+        """Binds an input of one object to a spell (EMPTY_ID unbinds it), without touching the table it shared."""
+        obj_data = self.game_obj_data_dct.get(obj_id)
+        if obj_data is None:
+            return
+        input_bindings = list(self._binding_tables[obj_data.binding_table_id])
+        if input_code >= len(input_bindings):
+            input_bindings.extend([Consts.EMPTY_ID] * (input_code + 1 - len(input_bindings)))
+        input_bindings[input_code] = spell_id
+        while input_bindings and input_bindings[-1] == Consts.EMPTY_ID:
+            input_bindings.pop()
+        obj_data.binding_table_id = self._intern_binding_table(tuple(input_bindings))
+
+    def get_bound_spell_ids(self, obj_id: int) -> list[int]:
+        obj_data = self.game_obj_data_dct.get(obj_id)
+        if obj_data is None:
+            return []
+        return [spell_id for spell_id in self._binding_tables[obj_data.binding_table_id] if spell_id != Consts.EMPTY_ID]
+
     def apply_casting_event(self, timestamp: int, source_id: int, spell_id: int) -> None:
-        if spell_id not in self.spell_data_dct:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
 
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
+        flags = self.spell_table.casting_flags[slot]
         source_data = self.game_obj_data_dct.get(source_id)
 
         if source_data:
-            if flags & CastingBehavior.TRIGGER_GCD:
-                source_data.gcd_start = timestamp
-            if flags & CastingBehavior.TRIGGER_COOLDOWN:
-                source_data.ability_cd_start[spell_id] = timestamp
-            if flags & CastingBehavior.START_CHANNEL:
+            if flags & _TRIGGER_GCD:
+                source_data.gcd_ready_at = timestamp + math.ceil(Consts.BASE_GCD * source_data.gcd_mod)
+            if flags & _TRIGGER_COOLDOWN:
+                ready_at = timestamp + math.ceil(self.spell_table.base_cooldowns[slot])
+                CastingSystem._set_cooldown_ready_at(source_data, self.spell_table.cooldown_slots[slot], ready_at)
+            if flags & _START_CHANNEL:
                 source_data.cast_start_time = timestamp
                 source_data.current_spell_cast = spell_id
-            if flags & CastingBehavior.STOP_CHANNEL:
+            if flags & _STOP_CHANNEL:
                 source_data.cast_start_time = timestamp
                 source_data.current_spell_cast = Consts.EMPTY_ID
+                self.interrupt_channel(source_id)
 
-    # ---- Cooldown & Input Methods ----
-
-    def get_gcd_progress(self, obj_id: int, spell_id: int, current_timestamp: int) -> float:
-        spell_data = self.spell_data_dct.get(spell_id)
-        if spell_data is None or not (spell_data.flags & CastingBehavior.TRIGGER_GCD):
-            return 1.0
+    @staticmethod
+    def _set_cooldown_ready_at(obj_data: ObjCastingData, cooldown_slot: int, ready_at: int) -> None:
+        cooldown_ready_at = obj_data.cooldown_ready_at
+        if cooldown_slot >= len(cooldown_ready_at):
+            cooldown_ready_at.extend([_ALWAYS_READY] * (cooldown_slot + 1 - len(cooldown_ready_at)))
+        cooldown_ready_at[cooldown_slot] = ready_at
 
-        obj_data = self.game_obj_data_dct.get(obj_id)
-        if obj_data is None:
-            return 1.0
-
-        base_gcd = float(getattr(Consts, "BASE_GCD", 0.0))
-        gcd_duration = base_gcd * obj_data.gcd_mod
-        if gcd_duration <= 0:
-            return 1.0
-
-        progress = (current_timestamp - obj_data.gcd_start) / gcd_duration
-        return min(1.0, max(0.0, progress))
+    # ---- Cooldown & Input Methods ----
 
     def is_gcd_ready(self, obj_id: int, spell_id: int, current_timestamp: int) -> bool:
-        return self.get_gcd_progress(obj_id, spell_id, current_timestamp) >= 1.0
-
-    def get_cooldown_progress(self, obj_id: int, spell_id: int, current_timestamp: int) -> float:
-        spell_data = self.spell_data_dct.get(spell_id)
-        if spell_data is None or not (spell_data.flags & CastingBehavior.TRIGGER_COOLDOWN):
-            return 1.0
-
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT or not self.spell_table.casting_flags[slot] & _TRIGGER_GCD:
+            return True
         obj_data = self.game_obj_data_dct.get(obj_id)
-        if obj_data is None:
-            return 1.0
-
-        cd_duration = spell_data.base_cooldown
-        if cd_duration <= 0:
-            return 1.0
-
-        cd_start = obj_data.ability_cd_start.get(spell_id, -10000)
-        progress = (current_timestamp - cd_start) / cd_duration
-        return min(1.0, max(0.0, progress))
+        return obj_data is None or current_timestamp >= obj_data.gcd_ready_at
 
     def is_cooldown_ready(self, obj_id: int, spell_id: int, current_timestamp: int) -> bool:
-        return self.get_cooldown_progress(obj_id, spell_id, current_timestamp) >= 1.0
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
+            return True
+        cooldown_slot = self.spell_table.cooldown_slots[slot]
+        obj_data = self.game_obj_data_dct.get(obj_id)
+        if cooldown_slot == SpellTable.MISSING_SLOT or obj_data is None or cooldown_slot >= len(obj_data.cooldown_ready_at):
+            return True
+        return current_timestamp >= obj_data.cooldown_ready_at[cooldown_slot]
 
-    def get_spell_ids_for_inputs(self, obj_id: int, hardware_inputs: list[str]) -> Iterable[int]:
-        if not hardware_inputs:
+    def get_ready_time(self, obj_id: int, spell_id: int) -> int:
+        """Earliest timestamp at which neither the GCD nor the spell's own cooldown blocks the object from casting it."""
+        slot = self.spell_table.slot_of(spell_id)
+        obj_data = self.game_obj_data_dct.get(obj_id)
+        if slot == SpellTable.MISSING_SLOT or obj_data is None:
+            return _ALWAYS_READY
+        ready_at = obj_data.gcd_ready_at if self.spell_table.casting_flags[slot] & _TRIGGER_GCD else _ALWAYS_READY
+        cooldown_slot = self.spell_table.cooldown_slots[slot]
+        if cooldown_slot != SpellTable.MISSING_SLOT and cooldown_slot < len(obj_data.cooldown_ready_at):
+            ready_at = max(ready_at, obj_data.cooldown_ready_at[cooldown_slot])
+        return ready_at
+
+    def get_next_ready_time(self, obj_id: int, current_timestamp: int, spell_ids: Iterable[int] | None = None) -> int:
+        """
+        Earliest timestamp from now on at which the object can cast any of the spells, e.g. to schedule AI casts.
+        Defaults to the spells bound to the object's inputs.
+        """
+        if spell_ids is None:
+            spell_ids = self.get_bound_spell_ids(obj_id)
+        ready_at = min((self.get_ready_time(obj_id, spell_id) for spell_id in spell_ids), default=_ALWAYS_READY)
+        return max(current_timestamp, ready_at)
+
+    def get_spell_ids_for_inputs(self, obj_id: int, input_codes: list[int]) -> Iterable[int]:
+        if not input_codes:
             return
-
         obj_data = self.game_obj_data_dct.get(obj_id)
-        if not obj_data or not obj_data.hardware_bindings:
+        if obj_data is None or obj_data.binding_table_id == _NO_BINDINGS_ID:
+            return
+        input_bindings = self._binding_tables[obj_data.binding_table_id]
+        bound_input_count = len(input_bindings)
+        for input_code in input_codes:
+            if input_code < bound_input_count:
+                spell_id = input_bindings[input_code]
+                if spell_id != Consts.EMPTY_ID:
+                    yield spell_id
+
+    # ---- Spell Queue ----
+
+    def get_cast_time(self, obj_id: int, spell_id: int, current_timestamp: int) -> int:
+        """
+        Timestamp an input for the spell is cast at: right away, or the ready timestamp of the GCD if that is at most
+        the object's queue window away. Casts further away are not held back and fail with GCD_NOT_READY.
+        """
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT or not self.spell_table.casting_flags[slot] & _TRIGGER_GCD:
+            return current_timestamp
+        obj_data = self.game_obj_data_dct.get(obj_id)
+        if obj_data is None or current_timestamp >= obj_data.gcd_ready_at:
+            return current_timestamp
+        if obj_data.gcd_ready_at - current_timestamp > obj_data.spell_queue_window:
+            return current_timestamp
+        return obj_data.gcd_ready_at
+
+    def queue_cast(self, obj_id: int, spell_id: int, cast_time: int, event_id: int) -> QueuedCast:
+        assert obj_id not in self._queued_casts, f"Object {obj_id} already has a queued cast; pop it first."
+        queued_cast = QueuedCast(obj_id, spell_id, cast_time, event_id)
+        self._queued_casts[obj_id] = queued_cast
+        self._queued_casts_by_event[event_id] = queued_cast
+        return queued_cast
+
+    def pop_queued_cast(self, obj_id: int) -> Optional[QueuedCast]:
+        """The object's queued cast, removed so that a new input can replace it; its event is still scheduled."""
+        queued_cast = self._queued_casts.pop(obj_id, None)
+        if queued_cast is not None:
+            self._queued_casts_by_event.pop(queued_cast.event_id, None)
+        return queued_cast
+
+    def pop_queued_cast_for_event(self, event_id: int) -> Optional[QueuedCast]:
+        """The queued cast that scheduled an event, removed now that the event is being processed."""
+        queued_cast = self._queued_casts_by_event.pop(event_id, None)
+        if queued_cast is not None:
+            del self._queued_casts[queued_cast.obj_id]
+            queued_cast.event_id = Consts.EMPTY_ID
+        return queued_cast
+
+    # ---- Channels ----
+
+    def start_channel(self, obj_id: int, spell_id: int) -> Channel:
+        """Starts tracking what a channel schedules, interrupting the channel the object was running before."""
+        self.interrupt_channel(obj_id)
+        channel = self._channels[obj_id] = Channel(obj_id, spell_id)
+        return channel
+
+    def bind_channel_event(self, channel: Channel, event_id: int) -> None:
+        channel.event_ids.add(event_id)
+        self._channels_by_event[event_id] = channel
+
+    @staticmethod
+    def add_channel_range_watch(channel: Channel, range_watch: RangeWatch) -> None:
+        channel.range_watches.append(range_watch)
+
+    def pop_channel_for_event(self, event_id: int) -> Optional[Channel]:
+        """The channel that scheduled an event, detached from it now that the event is being processed."""
+        channel = self._channels_by_event.pop(event_id, None)
+        if channel is not None:
+            channel.event_ids.discard(event_id)
+        return channel
+
+    def is_channeling(self, obj_id: int) -> bool:
+        return obj_id in self._channels
+
+    def interrupt_channel(self, obj_id: int) -> None:
+        channel = self._channels.pop(obj_id, None)
+        if channel is None:
             return
+        for event_id in channel.event_ids:
+            del self._channels_by_event[event_id]
+        self._interrupted_channels.append(channel)
 
-        for hw_input in hardware_inputs:
-            spell_id = obj_data.hardware_bindings.get(hw_input)
-            if spell_id is not None and Consts.is_valid_id(spell_id):
-                yield spell_id
+    def pop_interrupted_channels(self) -> list[Channel]:
+        if not self._interrupted_channels:
+            return []
+        channels, self._interrupted_channels = self._interrupted_channels, []
+        return channels
 
     # ---- Timeline properties ----
 
     def has_channel_start(self, spell_id: int) -> bool:
-        return bool(self.spell_data_dct[spell_id].flags & CastingBehavior.START_CHANNEL)
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return bool(self.spell_table.casting_flags[slot] & _START_CHANNEL)
+
+    def get_ability_timeline(self, spell_id: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return self.spell_table.timelines[slot]
+
+    def get_range_trigger(self, spell_id: int) -> tuple[int, int, int]:
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return (
+            self.spell_table.range_trigger_spell_ids[slot],
+            self.spell_table.range_trigger_intervals[slot],
+            self.spell_table.range_trigger_durations[slot],
+        )
 
-    def get_ability_timeline(self, spell_id: int) -> dict[int, list[int]]:
-        return self.spell_data_dct[spell_id].timeline
+    def get_trampoline_expansion(self, spell_id: int) -> tuple[int, ...]:
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return self.spell_table.trampoline_expansions[slot]
 
     def is_aura_active(self, current_timestamp: int, obj_id: int, spell_id: int) -> bool:
         obj_data = self.game_obj_data_dct.get(obj_id)
         if obj_data is None:
             return False
-        spell_data = self.spell_data_dct.get(spell_id)
+        slot = self.spell_table.slot_of(spell_id)
 
         # Check against inferred duration
-        if spell_data and current_timestamp > (obj_data.cast_start_time + spell_data.channel_duration):
+        if slot != SpellTable.MISSING_SLOT and current_timestamp > (obj_data.cast_start_time + self.spell_table.channel_durations[slot]):
             return False
 
         if obj_data.current_spell_cast != spell_id:
@@ -0,0 +1,134 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+
+@dataclass(slots=True)
+class HealthChange:
+    """Damage and healing one source dealt to one target with one spell at one timestamp, summed over all its events."""
+    timestamp: int
+    source_id: int
+    spell_id: int
+    target_id: int
+    damage: float = 0.0
+    healing: float = 0.0
+
+
+@dataclass(slots=True)
+class RollingSum:
+    """Sum of the amounts added within the last `window_ms`, with amortized O(1) updates and reads."""
+    window_ms: int
+    value_in_window: float = 0.0
+    _entries: deque[Tuple[int, float]] = field(default_factory=deque)
+
+    def add(self, timestamp: int, amount: float) -> None:
+        entries = self._entries
+        if entries and entries[-1][0] == timestamp:
+            entries[-1] = (timestamp, entries[-1][1] + amount)
+        else:
+            entries.append((timestamp, amount))
+        self.value_in_window += amount
+        self._evict(timestamp)
+
+    def get_value(self, current_time: int) -> float:
+        self._evict(current_time)
+        return self.value_in_window
+
+    def _evict(self, current_time: int) -> None:
+        entries = self._entries
+        window_start = current_time - self.window_ms
+        while entries and entries[0][0] <= window_start:
+            self.value_in_window -= entries.popleft()[1]
+        if not entries:
+            self.value_in_window = 0.0  # Drops the rounding error of the subtractions
+
+
+@dataclass(slots=True)
+class MeterEntry:
+    """Damage and healing totals of one meter row, plus their rolling sums over the meter's window."""
+    recent_damage: RollingSum
+    recent_healing: RollingSum
+    total_damage: float = 0.0
+    total_healing: float = 0.0
+    first_timestamp: int = 0
+    last_timestamp: int = 0
+
+    @classmethod
+    def create(cls, window_ms: int, timestamp: int) -> 'MeterEntry':
+        return cls(RollingSum(window_ms), RollingSum(window_ms), first_timestamp=timestamp, last_timestamp=timestamp)
+
+    def add(self, timestamp: int, damage: float, healing: float) -> None:
+        if damage:
+            self.total_damage += damage
+            self.recent_damage.add(timestamp, damage)
+        if healing:
+            self.total_healing += healing
+            self.recent_healing.add(timestamp, healing)
+        self.last_timestamp = timestamp
+
+
+class CombatMeter:
+    """
+    Streaming damage and healing meter, fed with every HealthChange the HealthSystem applies.
+
+    Rows are kept per source, per (source, spell) and per target (damage taken, healing received).
+    Each row holds lifetime totals and rolling sums over the last `window_ms`, so the current DPS/HPS
+    of any row is read without replaying the event log, however long the fight has been going.
+    """
+    DEFAULT_WINDOW_MS = 5000
+
+    def __init__(self, window_ms: int = DEFAULT_WINDOW_MS) -> None:
+        assert window_ms > 0, "The meter window must be at least 1 ms."
+        self.window_ms = window_ms
+        self.by_source: Dict[int, MeterEntry] = {}
+        self.by_source_and_spell: Dict[int, Dict[int, MeterEntry]] = {}
+        self.by_target: Dict[int, MeterEntry] = {}
+
+    def record(self, health_change: HealthChange) -> None:
+        timestamp, damage, healing = health_change.timestamp, health_change.damage, health_change.healing
+        self._get_entry(self.by_source, health_change.source_id, timestamp).add(timestamp, damage, healing)
+        spell_entries = self.by_source_and_spell.get(health_change.source_id)
+        if spell_entries is None:
+            spell_entries = self.by_source_and_spell[health_change.source_id] = {}
+        self._get_entry(spell_entries, health_change.spell_id, timestamp).add(timestamp, damage, healing)
+        self._get_entry(self.by_target, health_change.target_id, timestamp).add(timestamp, damage, healing)
+
+    def _get_entry(self, entries: Dict[int, MeterEntry], key: int, timestamp: int) -> MeterEntry:
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = MeterEntry.create(self.window_ms, timestamp)
+        return entry
+
+    # ---- Queries ----
+
+    def get_dps(self, source_id: int, current_time: int) -> float:
+        """Damage per second the source dealt over the last window."""
+        entry = self.by_source.get(source_id)
+        return entry.recent_damage.get_value(current_time) * 1000.0 / self.window_ms if entry else 0.0
+
+    def get_hps(self, source_id: int, current_time: int) -> float:
+        """Healing per second the source dealt over the last window."""
+        entry = self.by_source.get(source_id)
+        return entry.recent_healing.get_value(current_time) * 1000.0 / self.window_ms if entry else 0.0
+
+    def get_damage_taken_per_second(self, target_id: int, current_time: int) -> float:
+        """Damage per second the target took over the last window."""
+        entry = self.by_target.get(target_id)
+        return entry.recent_damage.get_value(current_time) * 1000.0 / self.window_ms if entry else 0.0
+
+    def get_spell_breakdown(self, source_id: int) -> list[Tuple[int, MeterEntry]]:
+        """(spell_id, entry) of every spell the source dealt damage or healing with, most total damage and healing first."""
+        breakdown = self.by_source_and_spell.get(source_id, {}).items()
+        return sorted(breakdown, key=lambda item: item[1].total_damage + item[1].total_healing, reverse=True)
+
+    def format_lines(self, current_time: int, top: int = 10) -> list[str]:
+        """Summary table for batch reports, sources with the most total damage first."""
+        lines = [f"{'Source':>6} {'Damage':>10} {'Healing':>10} {'DPS':>8} {'HPS':>8} {'Active':>8}"]
+        ranked = sorted(self.by_source.items(), key=lambda item: (item[1].total_damage, item[1].total_healing), reverse=True)
+        for source_id, entry in ranked[:top]:
+            lines.append(
+                f"{source_id:>6} {entry.total_damage:>10.1f} {entry.total_healing:>10.1f} "
+                f"{self.get_dps(source_id, current_time):>8.1f} {self.get_hps(source_id, current_time):>8.1f} "
+                f"{entry.last_timestamp - entry.first_timestamp:>6}ms"
+            )
+        return lines
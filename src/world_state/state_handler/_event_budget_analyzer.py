@@ -0,0 +1,189 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from src.settings import Consts
+from ._spell_data import TargetingSpellFlags
+from ._spell_table import SpellTable
+
+
+@dataclass(slots=True)
+class SpellEventBudget:
+    """Worst-case event cost of casting a spell once, including every event its timeline triggers."""
+    spell_id: int
+    name: str
+    total_events: float  # math.inf when the spell reaches a timeline cycle
+    duration_ms: int
+    peak_events_per_timestamp: int
+    peak_events_per_second: int
+
+    @property
+    def is_unbounded(self) -> bool:
+        return math.isinf(self.total_events)
+
+
+@dataclass(slots=True)
+class EventBudgetReport:
+    budgets: list[SpellEventBudget] = field(default_factory=list)
+    timeline_cycles: list[list[int]] = field(default_factory=list)
+    zero_delay_cycles: list[list[int]] = field(default_factory=list)
+    event_limit: int = Consts.EVENT_BUDGET_PER_FRAME  # Events past the frame budget are carried over to later frames
+
+    @property
+    def ranked_budgets(self) -> list[SpellEventBudget]:
+        return sorted(self.budgets, key=lambda budget: (budget.total_events, budget.peak_events_per_second), reverse=True)
+
+    @property
+    def over_limit(self) -> list[SpellEventBudget]:
+        return [budget for budget in self.ranked_budgets if budget.peak_events_per_timestamp > self.event_limit]
+
+    def format_lines(self, top: int = 10) -> list[str]:
+        lines = [f"{'Spell':>6} {'Name':<30} {'Events':>9} {'Duration':>9} {'Peak/ts':>8} {'Peak/s':>8}"]
+        for budget in self.ranked_budgets[:top]:
+            total = "unbounded" if budget.is_unbounded else f"{int(budget.total_events)}"
+            lines.append(
+                f"{budget.spell_id:>6} {budget.name:<30} {total:>9} {budget.duration_ms:>7}ms "
+                f"{budget.peak_events_per_timestamp:>8} {budget.peak_events_per_second:>8}"
+            )
+        for cycle in self.zero_delay_cycles:
+            lines.append(f"ERROR: spells {cycle} dispatch each other with zero delay and never leave their timestamp")
+        for cycle in self.timeline_cycles:
+            if cycle not in self.zero_delay_cycles:
+                lines.append(f"WARNING: spells {cycle} dispatch each other in a cycle and never stop")
+        for budget in self.over_limit:
+            lines.append(f"WARNING: spell {budget.spell_id} ({budget.name}) can dispatch more than {self.event_limit} events at one timestamp")
+        return lines
+
+
+class EventBudgetAnalyzer:
+    """
+    Walks the timeline graph of a SpellTable and estimates what each spell costs in events.
+
+    Every timeline entry is assumed to succeed, which makes the numbers an upper bound: a spell that
+    despawns its caster or goes out of range in practice stops its channel early. A range trigger is
+    counted as if its target stayed in range for every tick. AoE timelines are dispatched once per
+    target, so their fan-out is multiplied by `aoe_target_count`, and a batch spawn runs its timeline once
+    per spawned object.
+    """
+    DEFAULT_AOE_TARGET_COUNT = 4
+
+    def __init__(self, spell_table: SpellTable, aoe_target_count: int = DEFAULT_AOE_TARGET_COUNT) -> None:
+        self._spell_table = spell_table
+        self._aoe_target_count = aoe_target_count
+        self._histograms: dict[int, dict[int, int]] = {}
+
+    def analyze(self) -> EventBudgetReport:
+        report = EventBudgetReport()
+        report.timeline_cycles = self._find_cycles(zero_delay_only=False)
+        report.zero_delay_cycles = self._find_cycles(zero_delay_only=True)
+        unbounded_ids = self._find_spells_reaching(set(spell_id for cycle in report.timeline_cycles for spell_id in cycle))
+        for slot, spell_id in enumerate(self._spell_table.spell_ids):
+            if spell_id in unbounded_ids:
+                report.budgets.append(SpellEventBudget(spell_id, self._spell_table.names[slot], math.inf, 0, 0, 0))
+            else:
+                report.budgets.append(self._create_budget(slot, self._event_histogram(spell_id)))
+        return report
+
+    def _create_budget(self, slot: int, histogram: dict[int, int]) -> SpellEventBudget:
+        timestamps = sorted(histogram)
+        peak_per_second = 0
+        window_start = 0
+        events_in_window = 0
+        for timestamp in timestamps:
+            events_in_window += histogram[timestamp]
+            while timestamps[window_start] <= timestamp - 1000:
+                events_in_window -= histogram[timestamps[window_start]]
+                window_start += 1
+            peak_per_second = max(peak_per_second, events_in_window)
+        return SpellEventBudget(
+            spell_id=self._spell_table.spell_ids[slot],
+            name=self._spell_table.names[slot],
+            total_events=sum(histogram.values()),
+            duration_ms=timestamps[-1],
+            peak_events_per_timestamp=max(histogram.values()),
+            peak_events_per_second=peak_per_second,
+        )
+
+    def _event_histogram(self, spell_id: int) -> dict[int, int]:
+        """Number of events at each ms offset after casting the spell once (the cast itself is at 0)."""
+        if spell_id in self._histograms:
+            return self._histograms[spell_id]
+        slot = self._spell_table.slot_of(spell_id)
+        histogram: dict[int, int] = defaultdict(int)
+        histogram[0] = 1
+        if slot != SpellTable.MISSING_SLOT:
+            fan_out = self._aoe_target_count if self._spell_table.targeting_flags[slot] & TargetingSpellFlags.AOE else 1
+            fan_out *= len(self._spell_table.spawn_offsets[slot])
+            for delay, child_ids in self._scheduled_children(slot):
+                for child_id in child_ids:
+                    for offset, count in self._event_histogram(child_id).items():
+                        histogram[delay + offset] += fan_out * count
+        self._histograms[spell_id] = dict(histogram)
+        return self._histograms[spell_id]
+
+    def _children(self, spell_id: int, zero_delay_only: bool) -> list[int]:
+        slot = self._spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
+            return []
+        return [
+            child_id
+            for delay, child_ids in self._scheduled_children(slot)
+            if delay == 0 or not zero_delay_only
+            for child_id in child_ids
+        ]
+
+    def _scheduled_children(self, slot: int) -> list[tuple[int, tuple[int, ...]]]:
+        """Timeline entries of a spell, plus one entry per tick of its range trigger."""
+        scheduled = list(self._spell_table.timelines[slot])
+        interval = self._spell_table.range_trigger_intervals[slot]
+        if interval > 0:
+            trigger_id = self._spell_table.range_trigger_spell_ids[slot]
+            ticks = self._spell_table.range_trigger_durations[slot] // interval
+            scheduled.extend((interval * tick, (trigger_id,)) for tick in range(1, ticks + 1))
+        return scheduled
+
+    def _find_cycles(self, zero_delay_only: bool) -> list[list[int]]:
+        """Strongly connected components of the timeline graph that contain a cycle (Tarjan)."""
+        index_of: dict[int, int] = {}
+        lowlink: dict[int, int] = {}
+        stack: list[int] = []
+        on_stack: set[int] = set()
+        cycles: list[list[int]] = []
+
+        def visit(spell_id: int) -> None:
+            index_of[spell_id] = lowlink[spell_id] = len(index_of)
+            stack.append(spell_id)
+            on_stack.add(spell_id)
+            children = self._children(spell_id, zero_delay_only)
+            for child_id in children:
+                if child_id not in index_of:
+                    visit(child_id)
+                    lowlink[spell_id] = min(lowlink[spell_id], lowlink[child_id])
+                elif child_id in on_stack:
+                    lowlink[spell_id] = min(lowlink[spell_id], index_of[child_id])
+            if lowlink[spell_id] == index_of[spell_id]:
+                component: list[int] = []
+                while True:
+                    member_id = stack.pop()
+                    on_stack.discard(member_id)
+                    component.append(member_id)
+                    if member_id == spell_id:
+                        break
+                if len(component) > 1 or spell_id in children:
+                    cycles.append(sorted(component))
+
+        for spell_id in self._spell_table.spell_ids:
+            if spell_id not in index_of:
+                visit(spell_id)
+        return sorted(cycles)
+
+    def _find_spells_reaching(self, target_ids: set[int]) -> set[int]:
+        reaching_ids = set(target_ids)
+        changed = True
+        while changed:
+            changed = False
+            for spell_id in self._spell_table.spell_ids:
+                if spell_id not in reaching_ids and any(child_id in reaching_ids for child_id in self._children(spell_id, zero_delay_only=False)):
+                    reaching_ids.add(spell_id)
+                    changed = True
+        return reaching_ids
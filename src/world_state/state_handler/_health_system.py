@@ -1,8 +1,13 @@
+import bisect
 import math
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
 from enum import IntFlag, auto
 
+from src.settings import Consts
+from ._combat_meter import CombatMeter, HealthChange
+from ._spell_table import SpellTable, SpellTableDiff
+
 
 class HealthBehavior(IntFlag):
     """ Various bitflags that define spell health behavior. """
@@ -11,14 +16,15 @@ class HealthBehavior(IntFlag):
     DAMAGING = auto()
     HEALING = auto()
     IS_CHANNEL = auto()
+    MORTAL = auto()
 
 
-@dataclass(slots=True)
-class SpellHealthData:
-    """Stores the health relevant template data extracted from a Spell."""
-    power: float = 1.0
-    flags: HealthBehavior = HealthBehavior.NONE
-    hp: float = 0.0
+# Plain-int masks for the hot path; an IntFlag operand would route every `&` through enum code
+_DAMAGING = HealthBehavior.DAMAGING.value
+_HEALING = HealthBehavior.HEALING.value
+_MORTAL = HealthBehavior.MORTAL.value
+# Display size of an object at 0 hp
+_MIN_SIZE = 0.01
 
 
 @dataclass(slots=True)
@@ -39,64 +45,165 @@ class ObjHealthData:
         )
 
     @classmethod
-    def create_from_spell(cls, spell_data: SpellHealthData) -> 'ObjHealthData':
+    def create_from_spell(cls, spell_table: SpellTable, slot: int) -> 'ObjHealthData':
         return cls(
-            hp=spell_data.hp,
-            max_hp=spell_data.hp,
+            hp=spell_table.hps[slot],
+            max_hp=spell_table.hps[slot],
             spell_modifier=1.0,
             is_environment=False
         )
 
 
+@dataclass(slots=True)
+class HpWatchers:
+    """Spells an object dispatches at itself whenever its hp drops to a threshold, sorted by threshold."""
+    thresholds: list[float] = field(default_factory=list)
+    spell_ids: list[int] = field(default_factory=list)
+
+    def add(self, threshold: float, spell_id: int) -> None:
+        index = bisect.bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(index, threshold)
+        self.spell_ids.insert(index, spell_id)
+
+
 class HealthSystem:
     """
     Manages all health-related logic, resources, and damage/healing.
+
+    Health events are batched per timestamp: each event only adds its amount to its target's pending
+    net change and to the (source, spell, target) attribution, and every touched target's hp is written once
+    when the timestamp is flushed. Flushing happens when an event with a later timestamp arrives, or
+    when WorldState finds no more events due at the timestamp, even if the frame budget cut the frame
+    short. Hp lookups add the pending change instead of flushing, so they never flush a timestamp early.
+
+    Objects can watch their hp: a flush bisects the sorted thresholds of each watched target that took
+    a net loss, so only crossed thresholds are visited and unwatched objects cost a single dict miss.
+    A crossed threshold queues its spell, and a mortal object's death is a watcher at 0 hp that
+    dispatches the despawning death spell.
+
+    Every flushed HealthChange is also recorded in the combat meter.
     """
-    def __init__(self, spell_data_dct: Dict[int, SpellHealthData]) -> None:
-        self.spell_data_dct: Dict[int, SpellHealthData] = spell_data_dct
+    def __init__(self, spell_table: SpellTable) -> None:
+        self.spell_table: SpellTable = spell_table
         self.game_obj_data_dct: Dict[int, ObjHealthData] = {}
+        self._pending_timestamp: int = 0
+        self._pending_hp_changes: Dict[int, float] = {}
+        self._pending_attributions: Dict[Tuple[int, int, int], HealthChange] = {}
+        self._health_changes: list[HealthChange] = []
+        self._hp_watchers: Dict[int, HpWatchers] = {}
+        self._crossed_hp_thresholds: list[Tuple[int, int, int]] = []
+        self.combat_meter: CombatMeter = CombatMeter()
+
+    def patch_spell_table(self, spell_table: SpellTable, diff: SpellTableDiff) -> None:
+        self.spell_table = spell_table
 
     def create_environment_obj(self, obj_id: int) -> None:
         self.game_obj_data_dct[obj_id] = ObjHealthData.create_environment()
 
     def spawn_game_obj(self, new_obj_id: int, spell_id: int) -> None:
-        if spell_id not in self.spell_data_dct or new_obj_id in self.game_obj_data_dct:
-            return
-        spell_data = self.spell_data_dct[spell_id]
-        self.game_obj_data_dct[new_obj_id] = ObjHealthData.create_from_spell(spell_data)
-
-    def despawn_game_obj(self, obj_id: int) -> None:
-        self.game_obj_data_dct.pop(obj_id, None)
+        self.spawn_game_objs([new_obj_id], spell_id)
 
-    def apply_health_event(self, source_id: int, spell_id: int, target_id: int) -> None:
-        if spell_id not in self.spell_data_dct:
+    def spawn_game_objs(self, new_obj_ids: list[int], spell_id: int) -> None:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
-
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
+        max_hp = self.spell_table.hps[slot]
+        hp_triggers = self.spell_table.hp_triggers[slot]
+        is_mortal = self.spell_table.health_flags[slot] & _MORTAL
+        for new_obj_id in new_obj_ids:
+            if new_obj_id in self.game_obj_data_dct:
+                continue
+            self.game_obj_data_dct[new_obj_id] = ObjHealthData.create_from_spell(self.spell_table, slot)
+            for fraction, trigger_spell_id in hp_triggers:
+                self.watch_hp(new_obj_id, fraction * max_hp, trigger_spell_id)
+            if is_mortal:
+                self.watch_hp(new_obj_id, 0.0, Consts.DEATH_SPELL_ID)
+
+    def watch_hp(self, obj_id: int, threshold: float, spell_id: int) -> None:
+        """Makes the object dispatch a spell at itself each time its hp drops from above the threshold to at or below it."""
+        watchers = self._hp_watchers.get(obj_id)
+        if watchers is None:
+            watchers = self._hp_watchers[obj_id] = HpWatchers()
+        watchers.add(threshold, spell_id)
+
+    def apply_health_event(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> None:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
+            return
+        flags = self.spell_table.health_flags[slot]
+        if not flags & (_DAMAGING | _HEALING):
+            return
+        if target_id not in self.game_obj_data_dct:
+            return
+        # Sources spawned without a health component (e.g., projectiles) deal the spell's unmodified power
         source_data = self.game_obj_data_dct.get(source_id)
-        target_data = self.game_obj_data_dct.get(target_id)
+        spell_modifier = source_data.spell_modifier if source_data is not None else 1.0
+        if timestamp != self._pending_timestamp:
+            self.flush_pending_health_events()
+            self._pending_timestamp = timestamp
 
         # Apply Target Effects
-        if source_data and target_data:
-            if flags & HealthBehavior.DAMAGING:
-                damage_amount = spell_data.power * source_data.spell_modifier
-                target_data.hp -= damage_amount
-            if flags & HealthBehavior.HEALING:
-                healing_amount = spell_data.power * source_data.spell_modifier
-                target_data.hp += healing_amount
+        amount = self.spell_table.powers[slot] * spell_modifier
+        attribution_key = (source_id, spell_id, target_id)
+        attribution = self._pending_attributions.get(attribution_key)
+        if attribution is None:
+            attribution = self._pending_attributions[attribution_key] = HealthChange(timestamp, source_id, spell_id, target_id)
+        hp_change = self._pending_hp_changes.get(target_id, 0.0)
+        if flags & _DAMAGING:
+            attribution.damage += amount
+            hp_change -= amount
+        if flags & _HEALING:
+            attribution.healing += amount
+            hp_change += amount
+        self._pending_hp_changes[target_id] = hp_change
+
+    def flush_pending_health_events(self) -> None:
+        """Writes the summed damage and healing of the pending timestamp into every touched target's hp."""
+        if not self._pending_hp_changes:
+            return
+        for target_id, hp_change in self._pending_hp_changes.items():
+            target_data = self.game_obj_data_dct[target_id]
+            old_hp = target_data.hp
+            target_data.hp += hp_change
+            if hp_change < 0.0 and target_id in self._hp_watchers:
+                self._queue_crossed_hp_thresholds(target_id, old_hp, target_data.hp)
+        for attribution in self._pending_attributions.values():
+            self._health_changes.append(attribution)
+            self.combat_meter.record(attribution)
+        self._pending_hp_changes.clear()
+        self._pending_attributions.clear()
+
+    def _queue_crossed_hp_thresholds(self, obj_id: int, old_hp: float, new_hp: float) -> None:
+        watchers = self._hp_watchers[obj_id]
+        # Thresholds in [new_hp, old_hp) were crossed, and are queued from the highest down
+        first = bisect.bisect_left(watchers.thresholds, new_hp)
+        last = bisect.bisect_left(watchers.thresholds, old_hp)
+        for index in range(last - 1, first - 1, -1):
+            self._crossed_hp_thresholds.append((self._pending_timestamp, obj_id, watchers.spell_ids[index]))
+
+    def pop_crossed_hp_thresholds(self) -> list[Tuple[int, int, int]]:
+        """(timestamp, obj_id, spell_id) of every threshold crossed in the flushed timestamps since the last call."""
+        crossed, self._crossed_hp_thresholds = self._crossed_hp_thresholds, []
+        return crossed
+
+    def pop_health_changes(self) -> list[HealthChange]:
+        """Per-source and per-spell attribution of every flushed timestamp since the last call, in order of first hit."""
+        health_changes, self._health_changes = self._health_changes, []
+        return health_changes
 
     # ---- State Lookups ----
 
     def get_hp(self, obj_id: int) -> float:
+        """Hp including the pending timestamp, which is only flushed once all of its health events are in."""
         if obj_id in self.game_obj_data_dct:
-            return self.game_obj_data_dct[obj_id].hp
+            return self.game_obj_data_dct[obj_id].hp + self._pending_hp_changes.get(obj_id, 0.0)
         return 0.0
 
     def get_size(self, obj_id: int) -> float:
-        if obj_id not in self.game_obj_data_dct:
-            return 0.0
-        data = self.game_obj_data_dct[obj_id]
+        """Display size, growing with hp; objects spawned without a health component get the size of 0 hp."""
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
+            return _MIN_SIZE
         if data.is_environment:
             return 0.0
-        return 0.01 + math.sqrt(0.0001 * abs(data.hp))
\ No newline at end of file
+        return _MIN_SIZE + math.sqrt(0.0001 * abs(self.get_hp(obj_id)))
\ No newline at end of file
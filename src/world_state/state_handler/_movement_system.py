@@ -1,10 +1,11 @@
+import itertools
 import math
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple, Optional
 from enum import IntFlag, auto
 
 from src.settings import Consts
-# Assuming Behavior is importable from your project structure (e.g., src.world_state.behavior)
+from ._spell_table import SpellTable, SpellTableDiff
 
 
 class MovementBehavior(IntFlag):
@@ -27,22 +28,45 @@ class MovementBehavior(IntFlag):
     FORCE_MOVE = auto()
     TRY_MOVE = auto()
     DESPAWN_SELF = auto()
+    APPLY_VELOCITY = auto()
+    REMOVE_VELOCITY = auto()
+    CLAMP_TO_PLAY_AREA = auto()
+    STOP_AT_PLAY_AREA_BOUND = auto()
+
+
+# Plain-int masks for the hot path; an IntFlag operand would route every `&` through enum code
+_MOVE_UP = MovementBehavior.MOVE_UP.value
+_MOVE_LEFT = MovementBehavior.MOVE_LEFT.value
+_MOVE_DOWN = MovementBehavior.MOVE_DOWN.value
+_MOVE_RIGHT = MovementBehavior.MOVE_RIGHT.value
+_STOP_MOVE_X = (MovementBehavior.STOP_MOVE_RIGHT | MovementBehavior.STOP_MOVE_LEFT).value
+_STOP_MOVE_Y = (MovementBehavior.STOP_MOVE_UP | MovementBehavior.STOP_MOVE_DOWN).value
+_MOVE_TOWARDS_TARGET = MovementBehavior.MOVE_TOWARDS_TARGET.value
+_STOP_MOVE_TOWARDS_TARGET = MovementBehavior.STOP_MOVE_TOWARDS_TARGET.value
+_DIRECTIONAL = _MOVE_UP | _MOVE_LEFT | _MOVE_DOWN | _MOVE_RIGHT | _STOP_MOVE_X | _STOP_MOVE_Y
+_TELEPORT_TO_TARGET = MovementBehavior.TELEPORT_TO_TARGET.value
+_DESPAWN_SELF = MovementBehavior.DESPAWN_SELF.value
+_APPLY_VELOCITY = MovementBehavior.APPLY_VELOCITY.value
+_REMOVE_VELOCITY = MovementBehavior.REMOVE_VELOCITY.value
+_CLAMP_TO_PLAY_AREA = MovementBehavior.CLAMP_TO_PLAY_AREA.value
+_STOP_AT_PLAY_AREA_BOUND = MovementBehavior.STOP_AT_PLAY_AREA_BOUND.value
 
 
 @dataclass(slots=True)
-class SpellMovementData:
-    """Stores only the movement-relevant data extracted from a Spell."""
-    power: float
-    range_limit: float
-    flags: MovementBehavior
-    spawned_x_offset: float
-    spawned_y_offset: float
-    spawned_movespeed: float
+class VelocityContribution:
+    """One source's push on an object, in units per ms."""
+    x_vel: float
+    y_vel: float
 
 
 @dataclass(slots=True)
 class ObjMovementData:
-    """ECS-style component storing positional and dead-reckoning data for a GameObj."""
+    """
+    ECS-style component storing positional and dead-reckoning data for a GameObj.
+
+    `x_vel`/`y_vel` are the cached sum of `velocities`, which holds one contribution per source
+    obj_id. An object's own input (WASD, pursuit steering) is the contribution keyed by its own ID.
+    """
     x_pos: float
     y_pos: float
     x_vel: float
@@ -50,6 +74,7 @@ class ObjMovementData:
     x_timestamp: int
     y_timestamp: int
     movespeed: float = 1.0
+    velocities: Dict[int, VelocityContribution] = field(default_factory=dict)
 
     @classmethod
     def create_environment(cls) -> 'ObjMovementData':
@@ -64,28 +89,114 @@ class ObjMovementData:
         )
 
     @classmethod
-    def create_from_spell(cls, timestamp: int, parent_x: float, parent_y: float, spell_data: SpellMovementData) -> 'ObjMovementData':
+    def create_from_spell(cls, timestamp: int, parent_x: float, parent_y: float, spell_table: SpellTable, slot: int) -> 'ObjMovementData':
         return cls(
-            x_pos=float(parent_x + spell_data.spawned_x_offset),
-            y_pos=float(parent_y + spell_data.spawned_y_offset),
+            x_pos=float(parent_x + spell_table.spawned_x_offsets[slot]),
+            y_pos=float(parent_y + spell_table.spawned_y_offsets[slot]),
             x_vel=0.0,
             y_vel=0.0,
             x_timestamp=timestamp,
             y_timestamp=timestamp,
-            movespeed=spell_data.spawned_movespeed,
+            movespeed=spell_table.spawned_movespeeds[slot],
         )
 
 
+@dataclass(slots=True, eq=False)
+class RangeWatch:
+    """
+    A range-gated spell waiting for its target to come within the spell's range_limit.
+
+    The spell may fire on the ticks `start + k * interval` (k = 1 .. duration // interval). Only the
+    first tick where the target is in range is scheduled as an event, and that tick is recomputed
+    whenever the source or the target changes velocity, or the source switches targets.
+    """
+    watch_id: int
+    source_id: int
+    target_id: int
+    spell_id: int
+    start: int
+    interval: int
+    duration: int
+    event_id: int = Consts.EMPTY_ID
+    last_fired_tick: int = Consts.EMPTY_TIMESTAMP
+    is_active: bool = True
+
+    @property
+    def end(self) -> int:
+        return self.start + (self.duration // self.interval) * self.interval
+
+    @property
+    def watched_obj_ids(self) -> Tuple[int, ...]:
+        return (self.source_id,) if self.source_id == self.target_id else (self.source_id, self.target_id)
+
+
+@dataclass(slots=True, eq=False)
+class WallContact:
+    """The ms at which an object clamped to the play area reaches one of its bounds, if it keeps its velocity."""
+    obj_id: int
+    contact_time: Optional[int] = None
+    event_id: int = Consts.EMPTY_ID
+
+
+@dataclass(slots=True, eq=False)
+class Pursuit:
+    """
+    An object homing in on a target at a fixed speed.
+
+    The follower heads for the point where it meets the target if the target keeps its velocity, so
+    its path stays linear until either of them changes velocity. `arrival_time` is the ms at which
+    it catches up; from then on it moves along with the target, or trails it at full speed if the
+    target is faster than the follower.
+    """
+    pursuit_id: int
+    follower_id: int
+    target_id: int
+    spell_id: int
+    speed: float  # Units per ms
+    arrival_time: Optional[int] = None
+    event_id: int = Consts.EMPTY_ID
+    is_active: bool = True
+
+
 class MovementSystem:
     """
     Manages all movement-related logic, geometry, and hitboxes using a dead reckoning design.
+
+    Because positions are linear between velocity changes, the tick at which a RangeWatch target
+    enters range is solved in closed form instead of polling every tick. A Pursuit is re-solved in
+    the same way, only when the follower or its target changes velocity, and so is the WallContact
+    of an object that is clamped to the play area. Positions are never clamped on read.
+
+    Velocities are additive: every source pushing an object (its own input, a knockback) owns one
+    VelocityContribution, and the summed velocity is patched by the difference whenever a single
+    contribution changes. Reads never walk the contributions.
+
+    Targeting, range checks and rendering all ask for the same positions at the same timestamp, so
+    get_position memoizes them until time moves on. Anything that bakes a new base position or
+    velocity into an object drops its memoized position.
     """
     GLOBAL_MOVESPEED_TO_USE = Consts.MOVEMENT_DISTANCE_PER_SECOND
     MS_PER_MOVEMENT_TICK: float = 1000.0 / Consts.MOVEMENT_UPDATES_PER_SECOND
 
-    def __init__(self, spell_data_dct: Dict[int, SpellMovementData]) -> None:
-        self.spell_data_dct: Dict[int, SpellMovementData] = spell_data_dct
+    def __init__(self, spell_table: SpellTable) -> None:
+        self.spell_table: SpellTable = spell_table
         self.game_obj_data_dct: Dict[int, ObjMovementData] = {}
+        self._range_watch_ids: Iterator[int] = itertools.count(1)
+        self._range_watches_by_obj: Dict[int, List[RangeWatch]] = {}
+        self._range_watches_by_event: Dict[int, RangeWatch] = {}
+        self._invalidated_range_watches: Dict[int, RangeWatch] = {}  # Keyed by watch_id, in invalidation order
+        self._pursuit_ids: Iterator[int] = itertools.count(1)
+        self._pursuits_by_follower: Dict[int, Pursuit] = {}
+        self._pursuits_by_target: Dict[int, List[Pursuit]] = {}
+        self._pursuits_by_event: Dict[int, Pursuit] = {}
+        self._rescheduled_pursuits: Dict[int, Pursuit] = {}  # Keyed by pursuit_id, in the order they were re-solved
+        self._solving_follower_ids: set[int] = set()
+        self._wall_contacts: Dict[int, WallContact] = {}  # Keyed by obj_id, only for clamped objects
+        self._wall_contacts_by_event: Dict[int, WallContact] = {}
+        self._rescheduled_wall_contacts: Dict[int, WallContact] = {}
+        self._contributed_obj_ids_by_source: Dict[int, set[int]] = {}
+        self._positions_timestamp: int = Consts.EMPTY_TIMESTAMP
+        self._positions: Dict[int, Tuple[float, float]] = {}  # Memoized at _positions_timestamp
 
     @classmethod
     def extrapolate(cls, data: 'ObjMovementData', current_time: int | float) -> Tuple[float, float]:
@@ -96,24 +207,62 @@ class MovementSystem:
         eff_x, eff_y = float(x_dt), float(y_dt)
         return data.x_pos + data.x_vel * eff_x, data.y_pos + data.y_vel * eff_y
 
+    def patch_spell_table(self, spell_table: SpellTable, diff: SpellTableDiff) -> None:
+        self.spell_table = spell_table
+
     def create_environment_obj(self, obj_id: int) -> None:
         self.game_obj_data_dct[obj_id] = ObjMovementData.create_environment()
 
     def spawn_game_obj(self, timestamp: int, parent_obj_id: int, spawned_obj_id: int, spell_id: int) -> None:
-        if spell_id not in self.spell_data_dct or spawned_obj_id in self.game_obj_data_dct:
+        self.spawn_game_objs(timestamp, parent_obj_id, [spawned_obj_id], spell_id)
+
+    def spawn_game_objs(self, timestamp: int, parent_obj_id: int, spawned_obj_ids: list[int], spell_id: int) -> None:
+        """Spawns a batch around the parent, the i-th object on the i-th offset of the spell's spawn pattern."""
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
-        spell_data = self.spell_data_dct[spell_id]
         parent_x_pos, parent_y_pos = self.get_position(parent_obj_id, timestamp)
-        self.game_obj_data_dct[spawned_obj_id] = ObjMovementData.create_from_spell(
-            timestamp, parent_x_pos, parent_y_pos, spell_data
-        )
-
-    def despawn_game_obj(self, obj_id: int) -> None:
-        """Removes an object from the movement system (e.g., on despawn)."""
+        is_clamped = self.spell_table.movement_flags[slot] & _CLAMP_TO_PLAY_AREA
+        for spawned_obj_id, (x_offset, y_offset) in zip(spawned_obj_ids, self.spell_table.spawn_offsets[slot]):
+            if spawned_obj_id in self.game_obj_data_dct:
+                continue
+            data = ObjMovementData.create_from_spell(timestamp, parent_x_pos + x_offset, parent_y_pos + y_offset, self.spell_table, slot)
+            self.game_obj_data_dct[spawned_obj_id] = data
+            if is_clamped:
+                data.x_pos = MovementSystem._clamp_to_play_area(data.x_pos)
+                data.y_pos = MovementSystem._clamp_to_play_area(data.y_pos)
+                self._wall_contacts[spawned_obj_id] = WallContact(spawned_obj_id)
+
+    def despawn_game_obj(self, obj_id: int, current_time: int) -> None:
+        """Removes an object from the movement system, after retiring it."""
+        self.retire_game_obj(obj_id, current_time)
         self.game_obj_data_dct.pop(obj_id, None)
+        self._positions.pop(obj_id, None)
+
+    def retire_game_obj(self, obj_id: int, current_time: int) -> None:
+        """Halts a despawned object and withdraws every push it applies and every pursuit of it; its position stays readable."""
+        # Pursuits go first, so halting the object cannot re-solve one of them
+        self.stop_pursuit(obj_id)
+        for pursuit in list(self._pursuits_by_target.get(obj_id, ())):
+            self.stop_pursuit(pursuit.follower_id)
+        for target_id in list(self._contributed_obj_ids_by_source.get(obj_id, ())):
+            if target_id != obj_id:
+                self.remove_velocity(target_id, obj_id, current_time)
+        self.clear_velocities(obj_id, current_time)
+        wall_contact = self._wall_contacts.pop(obj_id, None)
+        if wall_contact is not None:
+            wall_contact.contact_time = None
+            self._rescheduled_wall_contacts[obj_id] = wall_contact
 
     def get_position(self, obj_id: int, current_time: int) -> Tuple[float, float]:
-        """Calculates the current (x, y) position of an object using dead reckoning."""
+        """Calculates the current (x, y) position of an object using dead reckoning, memoized per timestamp."""
+        if current_time == self._positions_timestamp:
+            position = self._positions.get(obj_id)
+            if position is not None:
+                return position
+        else:
+            self._positions.clear()
+            self._positions_timestamp = current_time
         if obj_id not in self.game_obj_data_dct:
             raise ValueError(f"Object {obj_id} not found in MovementSystem.")
 
@@ -129,7 +278,8 @@ class MovementSystem:
         current_x = data.x_pos + (data.x_vel * x_dt)
         current_y = data.y_pos + (data.y_vel * y_dt)
 
-        return current_x, current_y
+        position = self._positions[obj_id] = (current_x, current_y)
+        return position
 
     def _update_x_base_position(self, obj_id: int, current_time: int) -> None:
         """Bakes the current X velocity into the base X position and updates the X timestamp."""
@@ -147,101 +297,485 @@ class MovementSystem:
         data.y_pos += data.y_vel * dt
         data.y_timestamp = current_time
 
+    def get_velocity(self, obj_id: int) -> Tuple[float, float]:
+        """Summed velocity of an object, in units per ms."""
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
+            return 0.0, 0.0
+        return data.x_vel, data.y_vel
+
     def set_x_velocity(self, obj_id: int, vx: float, current_time: int) -> None:
-        """Updates ONLY the X velocity. The Y axis is left completely untouched."""
-        if obj_id not in self.game_obj_data_dct:
+        """Updates ONLY the X velocity of the object's own contribution. The Y axis is left completely untouched."""
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
             return
-
-        self._update_x_base_position(obj_id, current_time)
-        self.game_obj_data_dct[obj_id].x_vel = vx
+        own = data.velocities.get(obj_id)
+        self.apply_velocity(obj_id, obj_id, vx, own.y_vel if own is not None else 0.0, current_time)
 
     def set_y_velocity(self, obj_id: int, vy: float, current_time: int) -> None:
-        """Updates ONLY the Y velocity. The X axis is left completely untouched."""
-        if obj_id not in self.game_obj_data_dct:
+        """Updates ONLY the Y velocity of the object's own contribution. The X axis is left completely untouched."""
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
             return
-
-        self._update_y_base_position(obj_id, current_time)
-        self.game_obj_data_dct[obj_id].y_vel = vy
+        own = data.velocities.get(obj_id)
+        self.apply_velocity(obj_id, obj_id, own.x_vel if own is not None else 0.0, vy, current_time)
 
     def set_velocity(self, obj_id: int, vx: float, vy: float, current_time: int) -> None:
-        """Updates both velocities at once (for movement that is inherently 2D)."""
-        self.set_x_velocity(obj_id, vx, current_time)
-        self.set_y_velocity(obj_id, vy, current_time)
+        """Updates both velocities of the object's own contribution at once (for movement that is inherently 2D)."""
+        self.apply_velocity(obj_id, obj_id, vx, vy, current_time)
+
+    def apply_velocity(self, target_id: int, source_id: int, vx: float, vy: float, current_time: int) -> None:
+        """Adds or replaces `source_id`'s contribution to `target_id`'s velocity; a zero velocity removes it."""
+        data = self.game_obj_data_dct.get(target_id)
+        if data is None:
+            return
+        contribution = data.velocities.get(source_id)
+        if contribution is None:
+            if vx == 0.0 and vy == 0.0:
+                return
+            data.velocities[source_id] = VelocityContribution(vx, vy)
+            self._contributed_obj_ids_by_source.setdefault(source_id, set()).add(target_id)
+            self._set_summed_velocity(target_id, data, data.x_vel + vx, data.y_vel + vy, current_time)
+            return
+        summed_x = data.x_vel + vx - contribution.x_vel
+        summed_y = data.y_vel + vy - contribution.y_vel
+        if vx == 0.0 and vy == 0.0:
+            self._drop_contribution(target_id, data, source_id)
+        else:
+            contribution.x_vel = vx
+            contribution.y_vel = vy
+        self._set_summed_velocity(target_id, data, summed_x, summed_y, current_time)
+
+    def remove_velocity(self, target_id: int, source_id: int, current_time: int) -> None:
+        """Removes `source_id`'s contribution to `target_id`'s velocity, if it has one."""
+        self.apply_velocity(target_id, source_id, 0.0, 0.0, current_time)
+
+    def clear_velocities(self, obj_id: int, current_time: int) -> None:
+        """Removes every contribution acting on an object, halting it."""
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
+            return
+        for source_id in list(data.velocities):
+            self._drop_contribution(obj_id, data, source_id)
+        self._set_summed_velocity(obj_id, data, 0.0, 0.0, current_time)
+
+    def _drop_contribution(self, target_id: int, data: ObjMovementData, source_id: int) -> None:
+        del data.velocities[source_id]
+        contributed_obj_ids = self._contributed_obj_ids_by_source[source_id]
+        contributed_obj_ids.discard(target_id)
+        if not contributed_obj_ids:
+            del self._contributed_obj_ids_by_source[source_id]
+
+    def _set_summed_velocity(self, obj_id: int, data: ObjMovementData, vx: float, vy: float, current_time: int) -> None:
+        """Stores an incrementally updated sum, baking the position of each axis whose velocity changes."""
+        if len(data.velocities) <= 1:
+            # Resynchronize, so rounding never leaves a stopped object drifting or a lone push inexact
+            contribution = next(iter(data.velocities.values()), None)
+            vx, vy = (contribution.x_vel, contribution.y_vel) if contribution is not None else (0.0, 0.0)
+        changed = False
+        if data.x_vel != vx:
+            self._update_x_base_position(obj_id, current_time)
+            data.x_vel = vx
+            changed = True
+        if data.y_vel != vy:
+            self._update_y_base_position(obj_id, current_time)
+            data.y_vel = vy
+            changed = True
+        if changed:
+            self._positions.pop(obj_id, None)
+            self._on_velocity_changed(obj_id, current_time)
 
     def teleport(self, obj_id: int, x: float, y: float, current_time: int) -> None:
         """Instantly moves an object to a new position, halting its velocity."""
-        if obj_id not in self.game_obj_data_dct:
+        data = self.game_obj_data_dct.get(obj_id)
+        if data is None:
             return
 
-        data = self.game_obj_data_dct[obj_id]
+        for source_id in list(data.velocities):
+            self._drop_contribution(obj_id, data, source_id)
+        if obj_id in self._wall_contacts:
+            x = MovementSystem._clamp_to_play_area(x)
+            y = MovementSystem._clamp_to_play_area(y)
         data.x_pos = x
         data.y_pos = y
         data.x_vel = 0.0
         data.y_vel = 0.0
         data.x_timestamp = current_time
         data.y_timestamp = current_time
+        self._positions.pop(obj_id, None)
+        self._on_velocity_changed(obj_id, current_time)
+
+    # ---- Range Watches ----
+
+    def start_range_watch(self, source_id: int, target_id: int, spell_id: int, start: int, interval: int, duration: int) -> RangeWatch:
+        watch = RangeWatch(next(self._range_watch_ids), source_id, target_id, spell_id, start, interval, duration)
+        for obj_id in watch.watched_obj_ids:
+            self._range_watches_by_obj.setdefault(obj_id, []).append(watch)
+        return watch
+
+    def stop_range_watch(self, watch: RangeWatch) -> None:
+        self._unregister_range_watch(watch)
+        self._range_watches_by_event.pop(watch.event_id, None)
+        self._invalidated_range_watches.pop(watch.watch_id, None)
+        watch.event_id = Consts.EMPTY_ID
+        watch.is_active = False
+
+    def get_range_watches_of_source(self, source_id: int) -> List[RangeWatch]:
+        return [watch for watch in self._range_watches_by_obj.get(source_id, ()) if watch.source_id == source_id]
+
+    def retarget_range_watch(self, watch: RangeWatch, target_id: int) -> None:
+        """Points a watch at another target; its next tick is recomputed like after a velocity change."""
+        if target_id == watch.target_id:
+            return
+        self._unregister_range_watch(watch)
+        watch.target_id = target_id
+        for obj_id in watch.watched_obj_ids:
+            self._range_watches_by_obj.setdefault(obj_id, []).append(watch)
+        self._invalidated_range_watches[watch.watch_id] = watch
+
+    def _unregister_range_watch(self, watch: RangeWatch) -> None:
+        for obj_id in watch.watched_obj_ids:
+            watches = self._range_watches_by_obj.get(obj_id)
+            if watches is not None and watch in watches:
+                watches.remove(watch)
+                if not watches:
+                    del self._range_watches_by_obj[obj_id]
+
+    def bind_range_watch_event(self, watch: RangeWatch, event_id: int) -> None:
+        self._range_watches_by_event.pop(watch.event_id, None)
+        watch.event_id = event_id
+        if event_id != Consts.EMPTY_ID:
+            self._range_watches_by_event[event_id] = watch
+
+    def pop_range_watch_for_event(self, event_id: int) -> Optional[RangeWatch]:
+        """The watch that scheduled an event, detached from it now that the event is being processed."""
+        watch = self._range_watches_by_event.pop(event_id, None)
+        if watch is not None:
+            watch.event_id = Consts.EMPTY_ID
+        return watch
+
+    def pop_invalidated_range_watches(self) -> List[RangeWatch]:
+        if not self._invalidated_range_watches:
+            return []
+        watches = list(self._invalidated_range_watches.values())
+        self._invalidated_range_watches.clear()
+        return watches
+
+    def find_next_range_tick(self, watch: RangeWatch, earliest_time: int) -> Optional[int]:
+        """First tick at or after `earliest_time` where the target is in range, assuming both objects keep their velocity."""
+        source = self.game_obj_data_dct.get(watch.source_id)
+        target = self.game_obj_data_dct.get(watch.target_id)
+        slot = self.spell_table.slot_of(watch.spell_id)
+        if source is None or target is None or slot == SpellTable.MISSING_SLOT:
+            return None
+        first_tick = max(1, math.ceil((earliest_time - watch.start) / watch.interval))
+        last_tick = watch.duration // watch.interval
+        if first_tick > last_tick:
+            return None
+
+        # Relative motion p(s) = p + v*s (s in ms after earliest_time) is within range r while |p(s)|² <= r²
+        source_x, source_y = self.get_position(watch.source_id, earliest_time)
+        target_x, target_y = self.get_position(watch.target_id, earliest_time)
+        px, py = target_x - source_x, target_y - source_y
+        vx, vy = target.x_vel - source.x_vel, target.y_vel - source.y_vel
+        range_limit = self.spell_table.range_limits[slot]
+        a = vx * vx + vy * vy
+        b = px * vx + py * vy
+        c = px * px + py * py - range_limit * range_limit
+        if a == 0.0:
+            if c > 0.0:
+                return None
+            enter_offset = 0.0
+        else:
+            discriminant = b * b - a * c
+            if discriminant < 0.0:
+                return None
+            root = math.sqrt(discriminant)
+            if (-b + root) / a < 0.0:
+                return None  # Already moving away for good
+            enter_offset = max(0.0, (-b - root) / a)
+
+        # Start one tick early to absorb rounding at the boundary; the exact check is the one validation uses
+        tick = max(first_tick, math.ceil((earliest_time + enter_offset - watch.start) / watch.interval) - 1)
+        for tick in range(tick, min(tick + 3, last_tick + 1)):
+            timestamp = watch.start + tick * watch.interval
+            if self.is_within_range(timestamp, watch.source_id, watch.spell_id, watch.target_id):
+                return timestamp
+        return None
+
+    def _on_velocity_changed(self, obj_id: int, current_time: int) -> None:
+        watches = self._range_watches_by_obj.get(obj_id)
+        if watches:
+            for watch in watches:
+                self._invalidated_range_watches[watch.watch_id] = watch
+        pursuits = self._pursuits_by_target.get(obj_id)
+        if pursuits:
+            for pursuit in list(pursuits):
+                self._solve_pursuit(pursuit, current_time)
+        own_pursuit = self._pursuits_by_follower.get(obj_id)
+        if own_pursuit is not None:
+            self._solve_pursuit(own_pursuit, current_time)  # Pushed by something else, so the course needs correcting
+        wall_contact = self._wall_contacts.get(obj_id)
+        if wall_contact is not None:
+            self._update_wall_contact(wall_contact, current_time)
+
+    # ---- Play Area ----
+
+    def bind_wall_contact_event(self, wall_contact: WallContact, event_id: int) -> None:
+        self._wall_contacts_by_event.pop(wall_contact.event_id, None)
+        wall_contact.event_id = event_id
+        if event_id != Consts.EMPTY_ID:
+            self._wall_contacts_by_event[event_id] = wall_contact
+
+    def pop_wall_contact_for_event(self, event_id: int) -> Optional[WallContact]:
+        """The wall contact that scheduled an event, detached from it now that the event is being processed."""
+        wall_contact = self._wall_contacts_by_event.pop(event_id, None)
+        if wall_contact is not None:
+            wall_contact.event_id = Consts.EMPTY_ID
+        return wall_contact
+
+    def pop_rescheduled_wall_contacts(self) -> List[WallContact]:
+        if not self._rescheduled_wall_contacts:
+            return []
+        wall_contacts = list(self._rescheduled_wall_contacts.values())
+        self._rescheduled_wall_contacts.clear()
+        return wall_contacts
+
+    def _update_wall_contact(self, wall_contact: WallContact, current_time: int) -> None:
+        data = self.game_obj_data_dct[wall_contact.obj_id]
+        x, y = self.get_position(wall_contact.obj_id, current_time)
+        offsets = (MovementSystem._time_to_play_area_bound(x, data.x_vel), MovementSystem._time_to_play_area_bound(y, data.y_vel))
+        offset = min((offset for offset in offsets if offset is not None), default=None)
+        contact_time = None if offset is None else math.ceil(current_time + offset)
+        if contact_time != wall_contact.contact_time or (contact_time is not None and wall_contact.event_id == Consts.EMPTY_ID):
+            wall_contact.contact_time = contact_time
+            self._rescheduled_wall_contacts[wall_contact.obj_id] = wall_contact
+
+    def _stop_at_play_area_bounds(self, obj_id: int, current_time: int) -> None:
+        """Pins every axis that reached a play-area bound to it and zeroes its velocity on that axis."""
+        wall_contact = self._wall_contacts.get(obj_id)
+        if wall_contact is None:
+            return
+        self._update_x_base_position(obj_id, current_time)
+        self._update_y_base_position(obj_id, current_time)
+        data = self.game_obj_data_dct[obj_id]
+        stop_x = MovementSystem._time_to_play_area_bound(data.x_pos, data.x_vel) == 0.0
+        stop_y = MovementSystem._time_to_play_area_bound(data.y_pos, data.y_vel) == 0.0
+        if stop_x:
+            data.x_pos = MovementSystem._clamp_to_play_area(data.x_pos)
+        if stop_y:
+            data.y_pos = MovementSystem._clamp_to_play_area(data.y_pos)
+        if stop_x or stop_y:
+            self._positions.pop(obj_id, None)
+            # The wall absorbs every push along that axis, so removing one later cannot pull the object off it
+            for source_id, contribution in list(data.velocities.items()):
+                contribution.x_vel = 0.0 if stop_x else contribution.x_vel
+                contribution.y_vel = 0.0 if stop_y else contribution.y_vel
+                if contribution.x_vel == 0.0 and contribution.y_vel == 0.0:
+                    self._drop_contribution(obj_id, data, source_id)
+            self._set_summed_velocity(obj_id, data, 0.0 if stop_x else data.x_vel, 0.0 if stop_y else data.y_vel, current_time)
+        # Rounding can leave the object a hair short of the bound, in which case it stops on the next ms
+        self._update_wall_contact(wall_contact, current_time)
+
+    @staticmethod
+    def _time_to_play_area_bound(pos: float, vel: float) -> Optional[float]:
+        """Ms until `pos` reaches the play-area bound it is moving towards (0.0 if it is already there)."""
+        if vel > 0.0:
+            return max(0.0, (Consts.PLAY_AREA_MAX - pos) / vel)
+        if vel < 0.0:
+            return max(0.0, (Consts.PLAY_AREA_MIN - pos) / vel)
+        return None
+
+    @staticmethod
+    def _clamp_to_play_area(pos: float) -> float:
+        return min(max(pos, Consts.PLAY_AREA_MIN), Consts.PLAY_AREA_MAX)
+
+    # ---- Pursuits ----
+
+    def start_pursuit(self, follower_id: int, target_id: int, spell_id: int, speed: float, current_time: int) -> Pursuit:
+        """Replaces the follower's pursuit (if any) and steers it towards the new target right away."""
+        self.stop_pursuit(follower_id)
+        pursuit = Pursuit(next(self._pursuit_ids), follower_id, target_id, spell_id, speed)
+        self._pursuits_by_follower[follower_id] = pursuit
+        self._pursuits_by_target.setdefault(target_id, []).append(pursuit)
+        self._solve_pursuit(pursuit, current_time)
+        return pursuit
+
+    def stop_pursuit(self, follower_id: int) -> None:
+        """Ends the follower's pursuit; the follower keeps its current velocity."""
+        pursuit = self._pursuits_by_follower.pop(follower_id, None)
+        if pursuit is None:
+            return
+        pursuers = self._pursuits_by_target[pursuit.target_id]
+        pursuers.remove(pursuit)
+        if not pursuers:
+            del self._pursuits_by_target[pursuit.target_id]
+        pursuit.is_active = False
+        pursuit.arrival_time = None
+        self._rescheduled_pursuits[pursuit.pursuit_id] = pursuit
+
+    def get_pursuit(self, follower_id: int) -> Optional[Pursuit]:
+        return self._pursuits_by_follower.get(follower_id)
+
+    def bind_pursuit_event(self, pursuit: Pursuit, event_id: int) -> None:
+        self._pursuits_by_event.pop(pursuit.event_id, None)
+        pursuit.event_id = event_id
+        if event_id != Consts.EMPTY_ID:
+            self._pursuits_by_event[event_id] = pursuit
+
+    def pop_pursuit_for_event(self, event_id: int) -> Optional[Pursuit]:
+        """The pursuit that scheduled an arrival event, detached from it now that the event is being processed."""
+        pursuit = self._pursuits_by_event.pop(event_id, None)
+        if pursuit is not None:
+            pursuit.event_id = Consts.EMPTY_ID
+        return pursuit
+
+    def pop_rescheduled_pursuits(self) -> List[Pursuit]:
+        """Pursuits that were re-solved or stopped since the last call, so their arrival event is outdated."""
+        if not self._rescheduled_pursuits:
+            return []
+        pursuits = list(self._rescheduled_pursuits.values())
+        self._rescheduled_pursuits.clear()
+        return pursuits
+
+    def _solve_pursuit(self, pursuit: Pursuit, current_time: int) -> None:
+        follower_id = pursuit.follower_id
+        # A follower that is being steered already caused this change (e.g. two objects chasing each other)
+        if follower_id in self._solving_follower_ids:
+            return
+        follower = self.game_obj_data_dct.get(follower_id)
+        target = self.game_obj_data_dct.get(pursuit.target_id)
+        if follower is None or target is None:
+            return
+        follower_x, follower_y = self.get_position(follower_id, current_time)
+        target_x, target_y = self.get_position(pursuit.target_id, current_time)
+        px, py = target_x - follower_x, target_y - follower_y
+        # Steering only sets the follower's own contribution, so pushes from others act like a moving target
+        own = follower.velocities.get(follower_id)
+        ux = target.x_vel - follower.x_vel + (own.x_vel if own is not None else 0.0)
+        uy = target.y_vel - follower.y_vel + (own.y_vel if own is not None else 0.0)
+        speed = pursuit.speed
+
+        meet_offset = MovementSystem._find_meet_offset(px, py, ux, uy, speed)
+        pursuit.arrival_time = None
+        if meet_offset is not None and meet_offset > 1.0:
+            # Head for the meeting point; the arrival event re-solves once the follower has caught up
+            vx, vy = px / meet_offset + ux, py / meet_offset + uy
+            pursuit.arrival_time = math.ceil(current_time + meet_offset)
+        elif meet_offset is not None and ux * ux + uy * uy <= speed * speed:
+            vx, vy = ux, uy  # Caught up within the current ms, so move along with the target
+        else:
+            # Cannot catch up, so follow the target's current position at full speed
+            dx, dy = (px, py) if px or py else (ux, uy)
+            dist = math.hypot(dx, dy)
+            vx, vy = (dx / dist * speed, dy / dist * speed) if dist > 0.0 else (0.0, 0.0)
+
+        self._rescheduled_pursuits[pursuit.pursuit_id] = pursuit
+        self._solving_follower_ids.add(follower_id)
+        try:
+            self.set_velocity(follower_id, vx, vy, current_time)
+        finally:
+            self._solving_follower_ids.discard(follower_id)
+
+    @staticmethod
+    def _find_meet_offset(px: float, py: float, ux: float, uy: float, speed: float) -> Optional[float]:
+        """Earliest s >= 0 (in ms) where a follower at the origin moving at `speed` can be at the target's position p + u*s."""
+        # |p + u*s| = speed*s  <=>  (u·u - speed²)s² + 2(p·u)s + p·p = 0
+        c = px * px + py * py
+        if c == 0.0:
+            return 0.0
+        a = ux * ux + uy * uy - speed * speed
+        b = px * ux + py * uy
+        if a == 0.0:
+            return -c / (2.0 * b) if b < 0.0 else None
+        discriminant = b * b - a * c
+        if discriminant < 0.0:
+            return None
+        root = math.sqrt(discriminant)
+        return min((offset for offset in ((-b - root) / a, (-b + root) / a) if offset > 0.0), default=None)
 
     def apply_movement_event(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> None:
         """
         Applies a spell's movement behavior using dynamic bitflags.
         """
-        if spell_id not in self.spell_data_dct:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
 
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
+        flags = self.spell_table.movement_flags[slot]
+        power = self.spell_table.powers[slot]
 
         # Apply Source Effects (Move Towards, Teleport)
         if source_id in self.game_obj_data_dct:
             source_data = self.game_obj_data_dct[source_id]
-            speed_per_ms = (source_data.movespeed * spell_data.power) * MovementSystem.GLOBAL_MOVESPEED_TO_USE / 1000.0
+            speed_per_ms = (source_data.movespeed * power) * MovementSystem.GLOBAL_MOVESPEED_TO_USE / 1000.0
 
-            if flags & MovementBehavior.MOVE_TOWARDS_TARGET and target_id in self.game_obj_data_dct:
-                tar_x, tar_y = self.get_position(target_id, timestamp)
-                src_x, src_y = self.get_position(source_id, timestamp)
-                dx = tar_x - src_x
-                dy = tar_y - src_y
-                dist = math.hypot(dx, dy)
-                if dist > 0.0:
-                    vx = (dx / dist) * speed_per_ms
-                    vy = (dy / dist) * speed_per_ms
-                    self.set_velocity(source_id, vx, vy, timestamp)
+            if flags & _MOVE_TOWARDS_TARGET and target_id in self.game_obj_data_dct:
+                if target_id != source_id:
+                    self.start_pursuit(source_id, target_id, spell_id, speed_per_ms, timestamp)
                 return
 
-            if flags & MovementBehavior.STOP_MOVE_TOWARDS_TARGET:
+            if flags & _STOP_MOVE_TOWARDS_TARGET:
+                self.stop_pursuit(source_id)
                 self.set_velocity(source_id, 0.0, 0.0, timestamp)
                 return
 
-            if flags & MovementBehavior.TELEPORT_TO_TARGET and target_id in self.game_obj_data_dct:
+            if flags & _TELEPORT_TO_TARGET and target_id in self.game_obj_data_dct:
                 tar_x, tar_y = self.get_position(target_id, timestamp)
+                self.stop_pursuit(source_id)
                 self.teleport(source_id, tar_x, tar_y, timestamp)
                 return
 
-            if flags & MovementBehavior.DESPAWN_SELF:
-                self.set_velocity(source_id, 0.0, 0.0, timestamp)
+            if flags & _DESPAWN_SELF:
+                self.retire_game_obj(source_id, timestamp)
+                return
+
+            if flags & _STOP_AT_PLAY_AREA_BOUND:
+                self._stop_at_play_area_bounds(source_id, timestamp)
                 return
 
         # Apply Target Effects (Step Up, Down, Left, Right)
         if target_id in self.game_obj_data_dct:
             target_data = self.game_obj_data_dct[target_id]
-            speed_per_ms = (target_data.movespeed * spell_data.power) * MovementSystem.GLOBAL_MOVESPEED_TO_USE / 1000.0
+            speed_per_ms = (target_data.movespeed * power) * MovementSystem.GLOBAL_MOVESPEED_TO_USE / 1000.0
+            if flags & _DIRECTIONAL and target_id in self._pursuits_by_follower:
+                self.stop_pursuit(target_id)  # Steering by hand takes over from a pursuit
+
+            # Pushes from other objects (knockbacks, pulls) stack on top of the target's own movement
+            if flags & _REMOVE_VELOCITY:
+                self.remove_velocity(target_id, source_id, timestamp)
+            if flags & _APPLY_VELOCITY:
+                self._apply_push(timestamp, source_id, target_id, slot, power * MovementSystem.GLOBAL_MOVESPEED_TO_USE / 1000.0)
 
             # X Axis Evaluator
-            if flags & MovementBehavior.MOVE_RIGHT:
+            if flags & _MOVE_RIGHT:
                 self.set_x_velocity(target_id, speed_per_ms, timestamp)
-            elif flags & MovementBehavior.MOVE_LEFT:
+            elif flags & _MOVE_LEFT:
                 self.set_x_velocity(target_id, -speed_per_ms, timestamp)
-            elif flags & (MovementBehavior.STOP_MOVE_RIGHT | MovementBehavior.STOP_MOVE_LEFT):
+            elif flags & _STOP_MOVE_X:
                 self.set_x_velocity(target_id, 0.0, timestamp)
 
             # Y Axis Evaluator
-            if flags & MovementBehavior.MOVE_UP:
+            if flags & _MOVE_UP:
                 self.set_y_velocity(target_id, speed_per_ms, timestamp)
-            elif flags & MovementBehavior.MOVE_DOWN:
+            elif flags & _MOVE_DOWN:
                 self.set_y_velocity(target_id, -speed_per_ms, timestamp)
-            elif flags & (MovementBehavior.STOP_MOVE_UP | MovementBehavior.STOP_MOVE_DOWN):
+            elif flags & _STOP_MOVE_Y:
                 self.set_y_velocity(target_id, 0.0, timestamp)
 
+    def _apply_push(self, timestamp: int, source_id: int, target_id: int, slot: int, speed_per_ms: float) -> None:
+        """Pushes the target away from the source, or along the spell's spawn offset if they share a position."""
+        tar_x, tar_y = self.get_position(target_id, timestamp)
+        if source_id in self.game_obj_data_dct and source_id != target_id:
+            src_x, src_y = self.get_position(source_id, timestamp)
+            dx, dy = tar_x - src_x, tar_y - src_y
+        else:
+            dx, dy = 0.0, 0.0
+        if dx == 0.0 and dy == 0.0:
+            dx, dy = self.spell_table.spawned_x_offsets[slot], self.spell_table.spawned_y_offsets[slot]
+        dist = math.hypot(dx, dy)
+        if dist > 0.0:
+            self.apply_velocity(target_id, source_id, dx / dist * speed_per_ms, dy / dist * speed_per_ms, timestamp)
 
     def get_objects_in_range(self, origin_obj_id: int, range_limit: float, current_time: int) -> List[int]:
         """Returns a list of obj_ids that are within range_limit of the origin_obj_id."""
@@ -266,8 +800,9 @@ class MovementSystem:
 
     def is_within_range(self,  current_time: int, source_id: int, spell_id: int, target_id: int) -> bool:
         """Returns whether two objects are within range of each other."""
-        spell_data = self.spell_data_dct[spell_id]
-        range_limit = spell_data.range_limit
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        range_limit = self.spell_table.range_limits[slot]
         if range_limit <= 0.0:
             return True
         if (source_id not in self.game_obj_data_dct or target_id not in self.game_obj_data_dct):
@@ -290,546 +825,3 @@ class MovementSystem:
         collision_distance_sq = range_limit ** 2
 
         return dist_sq <= collision_distance_sq
-
-
-#BROKEN CODE
-'''
-import math
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
-from enum import IntFlag, auto
-
-from src.settings import Consts
-
-
-class MovementBehavior(IntFlag):
-    """Various bitflags that define spell behavior."""
-    NONE = 0
-
-    # --- WASD-style directional input (key-down / key-up) ---
-    MOVE_UP = auto()
-    MOVE_LEFT = auto()
-    MOVE_DOWN = auto()
-    MOVE_RIGHT = auto()
-    STOP_MOVE_UP = auto()
-    STOP_MOVE_LEFT = auto()
-    STOP_MOVE_DOWN = auto()
-    STOP_MOVE_RIGHT = auto()
-
-    # --- Generic velocity contributions ---
-    APPLY_VELOCITY = auto()
-    REMOVE_VELOCITY = auto()
-
-    MOVE_TOWARDS_TARGET = auto()
-    STOP_MOVE_TOWARDS_TARGET = auto()
-
-    TELEPORT_TO_TARGET = auto()
-    FORCE_MOVE = auto()
-    TRY_MOVE = auto()
-    DESPAWN_SELF = auto()
-
-    # Scale this contribution by the target's own movespeed stat.
-    # Without it, `power` is an absolute rate and the obj's movespeed is ignored
-    # (use for knockbacks, conveyor belts, scripted pulls, etc).
-    USE_MOVESPEED = auto()
-
-
-# Convenience masks
-_MOVE_KEYS = (
-    MovementBehavior.MOVE_UP
-    | MovementBehavior.MOVE_LEFT
-    | MovementBehavior.MOVE_DOWN
-    | MovementBehavior.MOVE_RIGHT
-)
-_STOP_KEYS = (
-    MovementBehavior.STOP_MOVE_UP
-    | MovementBehavior.STOP_MOVE_LEFT
-    | MovementBehavior.STOP_MOVE_DOWN
-    | MovementBehavior.STOP_MOVE_RIGHT
-)
-_WASD_MASK = _MOVE_KEYS | _STOP_KEYS
-
-# (flag, axis_dx, axis_dy, sign) -- sign is +1 for key-down, -1 for key-up.
-# Applying `sign * (dx, dy)` to the current axis value and clamping to [-1, 1]
-# fully reproduces the WASD state machine without storing any key bitmask.
-_WASD_DELTAS: Tuple[Tuple[MovementBehavior, float, float], ...] = (
-    (MovementBehavior.MOVE_UP,         0.0,  1.0),
-    (MovementBehavior.MOVE_DOWN,       0.0, -1.0),
-    (MovementBehavior.MOVE_LEFT,      -1.0,  0.0),
-    (MovementBehavior.MOVE_RIGHT,      1.0,  0.0),
-    (MovementBehavior.STOP_MOVE_UP,    0.0, -1.0),
-    (MovementBehavior.STOP_MOVE_DOWN,  0.0,  1.0),
-    (MovementBehavior.STOP_MOVE_LEFT,  1.0,  0.0),
-    (MovementBehavior.STOP_MOVE_RIGHT, -1.0, 0.0),
-)
-
-
-def _clamp_unit(value: float) -> float:
-    """Clamps an axis component to [-1.0, 1.0]."""
-    if value > 1.0:
-        return 1.0
-    if value < -1.0:
-        return -1.0
-    return value
-
-
-@dataclass(slots=True)
-class SpellMovementData:
-    """Stores only the movement-relevant data extracted from a Spell."""
-    power: float
-    range_limit: float
-    flags: MovementBehavior
-    spawned_x_offset: float
-    spawned_y_offset: float
-    spawned_movespeed: float
-
-
-@dataclass(slots=True)
-class VelocityContribution:
-    """
-    A single source's contribution to a target's movement.
-
-    Stored as a *raw axis vector* whose components live in [-1, 1]. For WASD
-    this doubles as the key state: (-1, 0) means A is held, (0, 0) means either
-    nothing or A+D, and so on. It is deliberately lossy -- see _apply_wasd.
-
-    The contribution is normalised to unit length (then scaled by `power`) at
-    read time, so a single source moving diagonally is not sqrt(2) faster than
-    one moving cardinally.
-
-    `use_movespeed` records whether the target's movespeed stat multiplies this
-    contribution, captured from the spell's USE_MOVESPEED flag at apply time.
-    """
-    axis_x: float
-    axis_y: float
-    power: float
-    use_movespeed: bool = True
-
-
-@dataclass(slots=True)
-class ObjMovementData:
-    """ECS-style component storing positional and dead-reckoning data for a GameObj."""
-    x_pos: float
-    y_pos: float
-    timestamp: int
-    movespeed: float = 1.0
-    # source_obj_id -> that source's current velocity contribution
-    velocities: Dict[int, VelocityContribution] = field(default_factory=dict)
-
-    @classmethod
-    def create_environment(cls) -> 'ObjMovementData':
-        return cls(x_pos=0.0, y_pos=0.0, timestamp=0, movespeed=1.0)
-
-    @classmethod
-    def create_from_spell(
-        cls,
-        timestamp: int,
-        parent_x: float,
-        parent_y: float,
-        spell_data: SpellMovementData,
-    ) -> 'ObjMovementData':
-        return cls(
-            x_pos=float(parent_x + spell_data.spawned_x_offset),
-            y_pos=float(parent_y + spell_data.spawned_y_offset),
-            timestamp=timestamp,
-            movespeed=spell_data.spawned_movespeed,
-        )
-
-
-class MovementSystem:
-    """
-    Manages all movement-related logic, geometry, and hitboxes using a dead
-    reckoning design.
-
-    Each object holds a dict of active velocity contributions keyed by the
-    obj_id of whatever is pushing it. Net velocity is recomputed on demand:
-    each source is individually normalised (so diagonals aren't faster), then
-    all sources are summed as plain vectors (so stacked effects CAN exceed
-    normal movespeed). Positions are always
-        base_pos + net_velocity * (now - timestamp)
-    and every mutation bakes the base position first.
-    """
-    GLOBAL_MOVESPEED_TO_USE = Consts.MOVEMENT_DISTANCE_PER_SECOND
-    MS_PER_MOVEMENT_TICK: float = 1000.0 / Consts.MOVEMENT_UPDATES_PER_SECOND
-
-    def __init__(self, spell_data_dct: Dict[int, SpellMovementData]) -> None:
-        self.spell_data_dct: Dict[int, SpellMovementData] = spell_data_dct
-        self.game_obj_data_dct: Dict[int, ObjMovementData] = {}
-
-    # ------------------------------------------------------------------
-    # Velocity resolution
-    # ------------------------------------------------------------------
-
-    @classmethod
-    def _compute_velocity(cls, data: ObjMovementData) -> Tuple[float, float]:
-        """
-        Resolve the dict of contributions into a single (vx, vy) in units/ms.
-
-        Per-source: normalise to unit length, scale by that source's `power`,
-        and multiply by the obj's movespeed only if that contribution was
-        flagged USE_MOVESPEED.
-
-        Cross-source: plain vector addition. Two sources each pushing at full
-        power in the same direction yield double speed -- this is intentional.
-        """
-        if not data.velocities:
-            return 0.0, 0.0
-
-        sum_x = 0.0
-        sum_y = 0.0
-
-        for contrib in data.velocities.values():
-            length = math.hypot(contrib.axis_x, contrib.axis_y)
-            if length <= 0.0 or contrib.power == 0.0:
-                continue
-
-            magnitude = contrib.power
-            if contrib.use_movespeed:
-                magnitude *= data.movespeed
-
-            scale = magnitude / length
-            sum_x += contrib.axis_x * scale
-            sum_y += contrib.axis_y * scale
-
-        rate = cls.GLOBAL_MOVESPEED_TO_USE / 1000.0
-        return sum_x * rate, sum_y * rate
-
-    def get_velocity(self, obj_id: int) -> Tuple[float, float]:
-        """Current net velocity of an object, in units per millisecond."""
-        data = self.game_obj_data_dct.get(obj_id)
-        if data is None:
-            return 0.0, 0.0
-        return self._compute_velocity(data)
-
-    @classmethod
-    def extrapolate(cls, data: ObjMovementData, current_time: int | float) -> Tuple[float, float]:
-        dt = current_time - data.timestamp
-        assert dt >= 0, f"time went backwards ({current_time} < {data.timestamp})"
-        vx, vy = cls._compute_velocity(data)
-        return data.x_pos + vx * dt, data.y_pos + vy * dt
-
-    # ------------------------------------------------------------------
-    # Lifecycle
-    # ------------------------------------------------------------------
-
-    def create_environment_obj(self, obj_id: int) -> None:
-        self.game_obj_data_dct[obj_id] = ObjMovementData.create_environment()
-
-    def spawn_game_obj(
-        self, timestamp: int, parent_obj_id: int, spawned_obj_id: int, spell_id: int
-    ) -> None:
-        if spell_id not in self.spell_data_dct or spawned_obj_id in self.game_obj_data_dct:
-            return
-        spell_data = self.spell_data_dct[spell_id]
-        parent_x_pos, parent_y_pos = self.get_position(parent_obj_id, timestamp)
-        self.game_obj_data_dct[spawned_obj_id] = ObjMovementData.create_from_spell(
-            timestamp, parent_x_pos, parent_y_pos, spell_data
-        )
-
-    def despawn_game_obj(self, obj_id: int) -> None:
-        """Removes an object from the movement system (e.g., on despawn)."""
-        self.game_obj_data_dct.pop(obj_id, None)
-        # Drop any contributions this object was applying to others, otherwise
-        # a dead pusher keeps pushing forever.
-        for data in self.game_obj_data_dct.values():
-            data.velocities.pop(obj_id, None)
-
-    # ------------------------------------------------------------------
-    # Position / base-position bookkeeping
-    # ------------------------------------------------------------------
-
-    def get_position(self, obj_id: int, current_time: int) -> Tuple[float, float]:
-        """Calculates the current (x, y) position of an object using dead reckoning."""
-        data = self.game_obj_data_dct.get(obj_id)
-        if data is None:
-            raise ValueError(f"Object {obj_id} not found in MovementSystem.")
-
-        # 1 timestamp unit = 1 ms. Events are guaranteed in order; going
-        # backwards is a bug.
-        dt = current_time - data.timestamp
-        assert dt >= 0, f"Obj {obj_id}: time went backwards ({current_time} < {data.timestamp})"
-
-        vx, vy = self._compute_velocity(data)
-        return data.x_pos + vx * dt, data.y_pos + vy * dt
-
-    def _bake_position(self, obj_id: int, current_time: int) -> ObjMovementData:
-        """
-        Advances the base position to `current_time` and resets the timestamp.
-        Must be called before any mutation that changes the net velocity.
-        """
-        data = self.game_obj_data_dct[obj_id]
-        dt = current_time - data.timestamp
-        assert dt >= 0, f"Obj {obj_id}: time went backwards ({current_time} < {data.timestamp})"
-        if dt:
-            vx, vy = self._compute_velocity(data)
-            data.x_pos += vx * dt
-            data.y_pos += vy * dt
-        data.timestamp = current_time
-        return data
-
-    def set_movespeed(self, obj_id: int, movespeed: float, current_time: int) -> None:
-        """
-        Changes an object's movespeed. Bakes first, since USE_MOVESPEED
-        contributions are scaled at read time and we must not retroactively
-        rescale already-travelled distance.
-        """
-        if obj_id not in self.game_obj_data_dct:
-            return
-        data = self._bake_position(obj_id, current_time)
-        data.movespeed = movespeed
-
-    # ------------------------------------------------------------------
-    # Velocity contribution API
-    # ------------------------------------------------------------------
-
-    def apply_velocity(
-        self,
-        target_id: int,
-        source_id: int,
-        dir_x: float,
-        dir_y: float,
-        power: float,
-        current_time: int,
-        use_movespeed: bool = True,
-    ) -> None:
-        """
-        Adds or replaces `source_id`'s velocity contribution on `target_id`.
-        `dir_x`/`dir_y` need not be normalised; only their direction matters,
-        magnitude comes from `power`.
-        """
-        if target_id not in self.game_obj_data_dct:
-            return
-
-        data = self._bake_position(target_id, current_time)
-
-        length = math.hypot(dir_x, dir_y)
-        if length <= 0.0 or power == 0.0:
-            data.velocities.pop(source_id, None)
-            return
-
-        data.velocities[source_id] = VelocityContribution(
-            axis_x=dir_x / length,
-            axis_y=dir_y / length,
-            power=power,
-            use_movespeed=use_movespeed,
-        )
-
-    def remove_velocity(self, target_id: int, source_id: int, current_time: int) -> None:
-        """Removes `source_id`'s contribution from `target_id`, if present."""
-        data = self.game_obj_data_dct.get(target_id)
-        if data is None or source_id not in data.velocities:
-            return
-        self._bake_position(target_id, current_time)
-        data.velocities.pop(source_id, None)
-
-    def clear_velocities(self, target_id: int, current_time: int) -> None:
-        """Removes every contribution acting on `target_id`."""
-        data = self.game_obj_data_dct.get(target_id)
-        if data is None or not data.velocities:
-            return
-        self._bake_position(target_id, current_time)
-        data.velocities.clear()
-
-    def teleport(self, obj_id: int, x: float, y: float, current_time: int) -> None:
-        """Instantly moves an object to a new position, halting all velocity."""
-        data = self.game_obj_data_dct.get(obj_id)
-        if data is None:
-            return
-        data.x_pos = x
-        data.y_pos = y
-        data.timestamp = current_time
-        data.velocities.clear()
-
-    # ------------------------------------------------------------------
-    # WASD handling
-    # ------------------------------------------------------------------
-
-    def _apply_wasd(
-        self,
-        target_id: int,
-        source_id: int,
-        flags: MovementBehavior,
-        power: float,
-        current_time: int,
-        use_movespeed: bool,
-    ) -> None:
-        """
-        Folds WASD key-down/key-up events into the existing contribution from
-        `source_id`, deriving the held-key state from the stored axis vector.
-
-        Each axis component lives in [-1, 1] and IS the key state for that axis:
-            -1 -> negative key alone,  +1 -> positive key alone,
-             0 -> neither, or both (opposites cancelled).
-
-        A key-down adds the key's direction; a key-up subtracts it. Both are
-        clamped to [-1, 1]. Receiving a STOP_MOVE_X is treated as proof that
-        MOVE_X was held, so subtracting correctly resumes motion toward the
-        still-held opposite key. The clamp makes redundant key-downs (e.g.
-        pressing A while already moving left) a no-op rather than double speed,
-        and lets a desynced state re-converge once the key is truly released.
-        """
-        data = self.game_obj_data_dct.get(target_id)
-        if data is None:
-            return
-
-        existing = data.velocities.get(source_id)
-        axis_x = existing.axis_x if existing is not None else 0.0
-        axis_y = existing.axis_y if existing is not None else 0.0
-
-        for flag, dx, dy in _WASD_DELTAS:
-            if flags & flag:
-                axis_x = _clamp_unit(axis_x + dx)
-                axis_y = _clamp_unit(axis_y + dy)
-
-        data = self._bake_position(target_id, current_time)
-
-        if axis_x == 0.0 and axis_y == 0.0:
-            # Either nothing is held, or opposites cancel. Keep a zero-magnitude
-            # record so a later STOP_MOVE can resume toward the opposite key.
-            data.velocities[source_id] = VelocityContribution(
-                0.0, 0.0, power, use_movespeed
-            )
-            return
-
-        data.velocities[source_id] = VelocityContribution(
-            axis_x=axis_x,
-            axis_y=axis_y,
-            power=power,
-            use_movespeed=use_movespeed,
-        )
-
-    # ------------------------------------------------------------------
-    # Event dispatch
-    # ------------------------------------------------------------------
-
-    def apply_movement_event(
-        self, timestamp: int, source_id: int, spell_id: int, target_id: int
-    ) -> None:
-        """Applies a spell's movement behavior using dynamic bitflags."""
-        spell_data = self.spell_data_dct.get(spell_id)
-        if spell_data is None:
-            return
-
-        flags = spell_data.flags
-        power = spell_data.power
-        use_movespeed = bool(flags & MovementBehavior.USE_MOVESPEED)
-
-        # --- Source-centric effects -----------------------------------
-        if source_id in self.game_obj_data_dct:
-            if flags & MovementBehavior.MOVE_TOWARDS_TARGET and target_id in self.game_obj_data_dct:
-                tar_x, tar_y = self.get_position(target_id, timestamp)
-                src_x, src_y = self.get_position(source_id, timestamp)
-                # Keyed by source_id: an object chasing something is pushing
-                # itself, so it composes with (rather than clobbers) its WASD.
-                self.apply_velocity(
-                    target_id=source_id,
-                    source_id=source_id,
-                    dir_x=tar_x - src_x,
-                    dir_y=tar_y - src_y,
-                    power=power,
-                    current_time=timestamp,
-                    use_movespeed=use_movespeed,
-                )
-                return
-
-            if flags & MovementBehavior.STOP_MOVE_TOWARDS_TARGET:
-                self.remove_velocity(source_id, source_id, timestamp)
-                return
-
-            if flags & MovementBehavior.TELEPORT_TO_TARGET and target_id in self.game_obj_data_dct:
-                tar_x, tar_y = self.get_position(target_id, timestamp)
-                self.teleport(source_id, tar_x, tar_y, timestamp)
-                return
-
-            if flags & MovementBehavior.DESPAWN_SELF:
-                self.clear_velocities(source_id, timestamp)
-                return
-
-        # --- Target-centric effects -----------------------------------
-        if target_id not in self.game_obj_data_dct:
-            return
-
-        if flags & MovementBehavior.REMOVE_VELOCITY:
-            self.remove_velocity(target_id, source_id, timestamp)
-            return
-
-        if flags & MovementBehavior.APPLY_VELOCITY:
-            if source_id in self.game_obj_data_dct:
-                src_x, src_y = self.get_position(source_id, timestamp)
-                tar_x, tar_y = self.get_position(target_id, timestamp)
-                dir_x, dir_y = tar_x - src_x, tar_y - src_y
-            else:
-                dir_x, dir_y = 0.0, 0.0
-
-            if dir_x == 0.0 and dir_y == 0.0:
-                # Degenerate (co-located or no source body). Fall back to the
-                # spawn offset as an intent vector, else drop the event.
-                dir_x = spell_data.spawned_x_offset
-                dir_y = spell_data.spawned_y_offset
-
-            self.apply_velocity(
-                target_id=target_id,
-                source_id=source_id,
-                dir_x=dir_x,
-                dir_y=dir_y,
-                power=power,
-                current_time=timestamp,
-                use_movespeed=use_movespeed,
-            )
-            return
-
-        if flags & _WASD_MASK:
-            self._apply_wasd(
-                target_id, source_id, flags, power, timestamp, use_movespeed
-            )
-
-    # ------------------------------------------------------------------
-    # Queries
-    # ------------------------------------------------------------------
-
-    def get_objects_in_range(
-        self, origin_obj_id: int, range_limit: float, current_time: int
-    ) -> List[int]:
-        """Returns a list of obj_ids that are within range_limit of the origin_obj_id."""
-        if origin_obj_id not in self.game_obj_data_dct:
-            return []
-
-        origin_x, origin_y = self.get_position(origin_obj_id, current_time)
-        range_sq = range_limit * range_limit
-        objects_in_range = []
-
-        for obj_id in self.game_obj_data_dct:
-            if obj_id == origin_obj_id:
-                continue
-            x, y = self.get_position(obj_id, current_time)
-            if (x - origin_x) ** 2 + (y - origin_y) ** 2 <= range_sq:
-                objects_in_range.append(obj_id)
-
-        return objects_in_range
-
-    def is_within_range(
-        self, current_time: int, source_id: int, spell_id: int, target_id: int
-    ) -> bool:
-        """Returns whether two objects are within range of each other."""
-        spell_data = self.spell_data_dct[spell_id]
-        range_limit = spell_data.range_limit
-        if range_limit <= 0.0:
-            return True
-        if source_id not in self.game_obj_data_dct or target_id not in self.game_obj_data_dct:
-            return False
-        source_x, source_y = self.get_position(source_id, current_time)
-        target_x, target_y = self.get_position(target_id, current_time)
-        dx = source_x - target_x
-        dy = source_y - target_y
-        return dx * dx + dy * dy <= range_limit * range_limit
-
-    def check_collision(
-        self, obj_id_1: int, obj_id_2: int, current_time: int, range_limit: float
-    ) -> bool:
-        """Checks if two objects' hitboxes are overlapping."""
-        if obj_id_1 not in self.game_obj_data_dct or obj_id_2 not in self.game_obj_data_dct:
-            return False
-        x1, y1 = self.get_position(obj_id_1, current_time)
-        x2, y2 = self.get_position(obj_id_2, current_time)
-        return (x2 - x1) ** 2 + (y2 - y1) ** 2 <= range_limit ** 2
-'''
\ No newline at end of file
@@ -0,0 +1,349 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import tomllib
+from dataclasses import fields
+from enum import Enum, IntFlag
+from pathlib import Path
+from typing import Any
+
+from src.settings import AudioFiles, Colors, Consts, HardwareInputConsts, SpriteFiles
+from src.utils import Logger
+from ._spell_data import (
+    SpellData,
+    CastingSpellFlags,
+    HealthSpellFlags,
+    MovementSpellFlags,
+    SpawnedComponentFlags,
+    SpawnPattern,
+    TargetingSpellFlags,
+    TargetingSpellMode
+)
+from ._event_budget_analyzer import EventBudgetAnalyzer
+from ._spell_table import SpellConfigError, SpellTable
+
+
+class SpellConfigLoader:
+    """
+    Loads spell definitions from the TOML/JSON data files in `spell_configs/`.
+
+    Each file holds a list of `spell` tables. Flags, targeting modes and asset references are
+    written by name, and timelines are keyed by their delay in ms. A `channel` table expands into
+    evenly spaced ticks. A `range_trigger` table has the same shape as a channel, but only fires
+    its spell on the ticks where the target is within that spell's range. Like a channel tick, it
+    follows the caster's current target: the target is resolved again whenever the caster switches
+    targets. `hp_triggers` are keyed by a fraction of max_hp, quoted in TOML. `spawned_components`
+    lists the optional components of the spawned object (all of them if omitted), and `spawn_count`
+    objects are spawned at once, arranged by `spawn_pattern`. The validated spells are compiled into
+    a SpellTable, which is pickled into the user's cache directory under a hash of the data files, so
+    later startups skip parsing and validation. Only the newest few tables are kept, on disk and in memory.
+    """
+    CONFIG_DIR: Path = Path(__file__).parent / "spell_configs"
+    CACHE_DIR: Path = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "dead_mmo" / "spell_tables"
+    CACHE_VERSION = 2
+    CACHED_TABLES_TO_KEEP = 8
+    # The compiled layout and the flag values are part of the cache key, since the cache outlives a checkout
+    _COMPILER_PATHS: tuple[Path, ...] = (Path(__file__).parent / "_spell_table.py", Path(__file__).parent / "_spell_data.py")
+    SUPPORTED_SUFFIXES = (".toml", ".json")
+
+    _FLAG_FIELDS: dict[str, type[IntFlag]] = {
+        "casting_behavior": CastingSpellFlags,
+        "health_behavior": HealthSpellFlags,
+        "movement_behavior": MovementSpellFlags,
+        "targeting_behavior": TargetingSpellFlags,
+        "spawned_components": SpawnedComponentFlags,
+    }
+    _FLOAT_FIELDS = ("base_cooldown", "gcd_mod", "power", "hp", "range_limit", "spawned_x_offset", "spawned_y_offset", "spawned_movespeed", "spawn_spacing", "animation_scale")
+    _NAMED_CONSTANT_FIELDS: dict[str, type] = {
+        "audio_name": AudioFiles,
+        "spawn_audio_name": AudioFiles,
+        "spawn_sprite_name": SpriteFiles,
+        "spawn_color": Colors,
+    }
+
+    # Compiled tables already loaded by this process, keyed by content hash, from least to most recently used
+    _loaded_tables: dict[str, SpellTable] = {}
+
+    @staticmethod
+    def load_spell_table(config_dir: Path | None = None) -> SpellTable:
+        config_dir = config_dir or SpellConfigLoader.CONFIG_DIR
+        config_paths = SpellConfigLoader._find_config_files(config_dir)
+        content_hash = SpellConfigLoader._hash_config_files(config_paths)
+        spell_table = SpellConfigLoader._loaded_tables.pop(content_hash, None)
+        if spell_table is None:
+            spell_table = SpellConfigLoader._read_cached_table(content_hash)
+        if spell_table is None:
+            spell_table = SpellTable.compile(SpellConfigLoader.load_spells(config_dir))
+            SpellConfigLoader._validate_event_budget(spell_table)
+            SpellConfigLoader._write_cached_table(content_hash, spell_table)
+        SpellConfigLoader._loaded_tables[content_hash] = spell_table
+        while len(SpellConfigLoader._loaded_tables) > SpellConfigLoader.CACHED_TABLES_TO_KEEP:
+            del SpellConfigLoader._loaded_tables[next(iter(SpellConfigLoader._loaded_tables))]
+        return spell_table
+
+    @staticmethod
+    def load_spells(config_dir: Path | None = None) -> list[SpellData]:
+        """Parses and validates every data file, bypassing the compiled cache."""
+        config_dir = config_dir or SpellConfigLoader.CONFIG_DIR
+        spells: dict[int, SpellData] = {}
+        for path in SpellConfigLoader._find_config_files(config_dir):
+            for raw_spell in SpellConfigLoader._read_config_file(path):
+                spell = SpellConfigLoader._parse_spell(raw_spell, path)
+                if spell.spell_id in spells:
+                    raise SpellConfigError(f"{path.name}: spell with ID {spell.spell_id} already exists.")
+                spells[spell.spell_id] = spell
+        SpellConfigLoader._validate_references(spells)
+        return list(spells.values())
+
+    # --- Parsing & Validation ---
+
+    @staticmethod
+    def _find_config_files(config_dir: Path) -> list[Path]:
+        config_paths = sorted(path for path in config_dir.iterdir() if path.suffix in SpellConfigLoader.SUPPORTED_SUFFIXES)
+        if not config_paths:
+            raise SpellConfigError(f"No spell config files found in '{config_dir}'.")
+        return config_paths
+
+    @staticmethod
+    def _read_config_file(path: Path) -> list[dict[str, Any]]:
+        with open(path, "rb") as f:
+            try:
+                document = tomllib.load(f) if path.suffix == ".toml" else json.load(f)
+            except ValueError as e:  # Syntax errors of both formats and undecodable bytes are ValueErrors
+                raise SpellConfigError(f"{path.name}: {e}") from e
+        raw_spells = document.get("spell", []) if isinstance(document, dict) else None
+        if not isinstance(raw_spells, list):
+            raise SpellConfigError(f"{path.name}: expected a list of 'spell' tables.")
+        return raw_spells
+
+    @staticmethod
+    def _parse_spell(raw_spell: dict[str, Any], path: Path) -> SpellData:
+        raw_spell = dict(raw_spell)
+        spell_id = raw_spell.pop("spell_id", None)
+        if not isinstance(spell_id, int) or isinstance(spell_id, bool):
+            raise SpellConfigError(f"{path.name}: every spell needs an integer 'spell_id' (got {spell_id!r}).")
+        where = f"{path.name}: spell {spell_id}"
+
+        known_fields = {spell_field.name for spell_field in fields(SpellData)}
+        unknown_fields = set(raw_spell) - known_fields - {"channel", "range_trigger"}
+        if unknown_fields:
+            raise SpellConfigError(f"{where} has unknown fields {sorted(unknown_fields)}.")
+
+        kwargs: dict[str, Any] = {"spell_id": spell_id}
+        for field_name, value in raw_spell.items():
+            if field_name in ("channel", "range_trigger"):
+                continue
+            if field_name in SpellConfigLoader._FLAG_FIELDS:
+                kwargs[field_name] = SpellConfigLoader._parse_flags(SpellConfigLoader._FLAG_FIELDS[field_name], value, f"{where}.{field_name}")
+            elif field_name == "targeting":
+                kwargs[field_name] = SpellConfigLoader._parse_enum(TargetingSpellMode, value, f"{where}.targeting")
+            elif field_name == "spawn_pattern":
+                kwargs[field_name] = SpellConfigLoader._parse_enum(SpawnPattern, value, f"{where}.spawn_pattern")
+            elif field_name == "spawn_count":
+                if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                    raise SpellConfigError(f"{where}.spawn_count must be a positive integer (got {value!r}).")
+                kwargs[field_name] = value
+            elif field_name == "timeline":
+                kwargs[field_name] = SpellConfigLoader._parse_timeline(value, f"{where}.timeline")
+            elif field_name == "hp_triggers":
+                kwargs[field_name] = SpellConfigLoader._parse_hp_triggers(value, f"{where}.hp_triggers")
+            elif field_name == "hardware_bindings":
+                kwargs[field_name] = SpellConfigLoader._parse_hardware_bindings(value, f"{where}.hardware_bindings")
+            elif field_name in SpellConfigLoader._NAMED_CONSTANT_FIELDS:
+                kwargs[field_name] = SpellConfigLoader._parse_named_constant(SpellConfigLoader._NAMED_CONSTANT_FIELDS[field_name], value, f"{where}.{field_name}")
+            elif field_name in SpellConfigLoader._FLOAT_FIELDS:
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    raise SpellConfigError(f"{where}.{field_name} must be a number (got {value!r}).")
+                kwargs[field_name] = float(value)
+            else:
+                kwargs[field_name] = value
+
+        if "channel" in raw_spell:
+            if "timeline" in raw_spell:
+                raise SpellConfigError(f"{where} cannot define both 'timeline' and 'channel'.")
+            kwargs["timeline"] = SpellConfigLoader._parse_channel(raw_spell["channel"], f"{where}.channel")
+        if "range_trigger" in raw_spell:
+            trigger_spell_id, trigger_duration, trigger_ticks = SpellConfigLoader._parse_ticks(raw_spell["range_trigger"], f"{where}.range_trigger")
+            kwargs["range_trigger_spell_id"] = trigger_spell_id
+            kwargs["range_trigger_interval"] = trigger_duration // trigger_ticks
+            kwargs["range_trigger_duration"] = trigger_duration
+        return SpellData(**kwargs)
+
+    @staticmethod
+    def _parse_flags(flag_type: type[IntFlag], names: Any, where: str) -> IntFlag:
+        if not isinstance(names, list):
+            raise SpellConfigError(f"{where} must be a list of flag names (got {names!r}).")
+        flags = flag_type(0)
+        for name in names:
+            flags |= SpellConfigLoader._parse_enum(flag_type, name, where)
+        return flags
+
+    @staticmethod
+    def _parse_enum(enum_type: type[Enum], name: Any, where: str) -> Any:
+        if name not in enum_type.__members__:
+            raise SpellConfigError(f"{where}: '{name}' is not one of {list(enum_type.__members__)}.")
+        return enum_type[name]
+
+    @staticmethod
+    def _parse_named_constant(constants: type, name: Any, where: str) -> Any:
+        value = getattr(constants, name, None) if isinstance(name, str) and not name.startswith("_") else None
+        if value is None:
+            raise SpellConfigError(f"{where}: '{name}' is not defined in {constants.__name__}.")
+        return value
+
+    @staticmethod
+    def _parse_timeline(raw_timeline: Any, where: str) -> dict[int, list[int]]:
+        if not isinstance(raw_timeline, dict):
+            raise SpellConfigError(f"{where} must map delays in ms to lists of spell IDs.")
+        timeline: dict[int, list[int]] = {}
+        for delay, spell_ids in raw_timeline.items():
+            if not str(delay).isdigit():
+                raise SpellConfigError(f"{where}: delay '{delay}' must be a non-negative integer.")
+            if not isinstance(spell_ids, list) or not all(isinstance(spell_id, int) for spell_id in spell_ids):
+                raise SpellConfigError(f"{where}: delay {delay} must list integer spell IDs (got {spell_ids!r}).")
+            timeline[int(delay)] = list(spell_ids)
+        return timeline
+
+    @staticmethod
+    def _parse_hp_triggers(raw_triggers: Any, where: str) -> dict[float, list[int]]:
+        if not isinstance(raw_triggers, dict):
+            raise SpellConfigError(f"{where} must map fractions of max_hp to lists of spell IDs.")
+        hp_triggers: dict[float, list[int]] = {}
+        for raw_fraction, spell_ids in raw_triggers.items():
+            try:
+                fraction = float(raw_fraction)
+            except ValueError:
+                fraction = -1.0
+            if not 0.0 <= fraction < 1.0:
+                raise SpellConfigError(f"{where}: '{raw_fraction}' must be a fraction of max_hp in [0, 1).")
+            if not isinstance(spell_ids, list) or not all(isinstance(spell_id, int) for spell_id in spell_ids):
+                raise SpellConfigError(f"{where}: fraction {raw_fraction} must list integer spell IDs (got {spell_ids!r}).")
+            hp_triggers[fraction] = list(spell_ids)
+        return hp_triggers
+
+    @staticmethod
+    def _parse_channel(raw_channel: Any, where: str) -> dict[int, list[int]]:
+        spell_id, duration, ticks = SpellConfigLoader._parse_ticks(raw_channel, where)
+        interval = duration // ticks
+        return {interval * i: [spell_id] for i in range(1, ticks + 1)}
+
+    @staticmethod
+    def _parse_ticks(raw_ticks: Any, where: str) -> tuple[int, int, int]:
+        if not isinstance(raw_ticks, dict) or set(raw_ticks) != {"spell_id", "duration", "ticks"}:
+            raise SpellConfigError(f"{where} must define exactly 'spell_id', 'duration' and 'ticks'.")
+        spell_id, duration, ticks = raw_ticks["spell_id"], raw_ticks["duration"], raw_ticks["ticks"]
+        if not all(isinstance(value, int) for value in (spell_id, duration, ticks)) or ticks <= 0 or duration < ticks:
+            raise SpellConfigError(f"{where} needs integer values with 0 < ticks <= duration (got {raw_ticks!r}).")
+        return spell_id, duration, ticks
+
+    @staticmethod
+    def _parse_hardware_bindings(raw_bindings: Any, where: str) -> dict[int, int]:
+        if not isinstance(raw_bindings, dict):
+            raise SpellConfigError(f"{where} must map HardwareInputConsts names to spell IDs.")
+        return {
+            SpellConfigLoader._parse_named_constant(HardwareInputConsts, input_name, where): spell_id
+            for input_name, spell_id in raw_bindings.items()
+        }
+
+    @staticmethod
+    def _validate_references(spells: dict[int, SpellData]) -> None:
+        # There is only one player and one boss to spawn
+        single_spawn_flags = TargetingSpellFlags.SPAWN_PLAYER | TargetingSpellFlags.SPAWN_BOSS
+        for spell in spells.values():
+            referenced_ids = [spell_id for spell_ids in spell.timeline.values() for spell_id in spell_ids]
+            referenced_ids += list(spell.hardware_bindings.values())
+            referenced_ids += [spell_id for spell_ids in spell.hp_triggers.values() for spell_id in spell_ids]
+            if spell.range_trigger_spell_id != Consts.EMPTY_ID:
+                referenced_ids.append(spell.range_trigger_spell_id)
+            for spell_id in referenced_ids:
+                if spell_id not in spells:
+                    raise SpellConfigError(f"Spell {spell.spell_id} ({spell.name}) references unknown spell {spell_id}.")
+            if spell.range_trigger_spell_id != Consts.EMPTY_ID and spells[spell.range_trigger_spell_id].range_limit <= 0.0:
+                raise SpellConfigError(f"Spell {spell.spell_id} ({spell.name}) range-triggers spell {spell.range_trigger_spell_id}, which has no range_limit.")
+            if spell.movement_behavior & MovementSpellFlags.CLAMP_TO_PLAY_AREA:
+                wall_contact = spells.get(Consts.WALL_CONTACT_SPELL_ID)
+                if wall_contact is None or not wall_contact.movement_behavior & MovementSpellFlags.STOP_AT_PLAY_AREA_BOUND:
+                    raise SpellConfigError(
+                        f"Spell {spell.spell_id} ({spell.name}) clamps to the play area, "
+                        f"but spell {Consts.WALL_CONTACT_SPELL_ID} does not stop objects at its bounds."
+                    )
+            if spell.spawn_count > 1 and (spell.targeting_behavior & single_spawn_flags or not spell.targeting_behavior & TargetingSpellFlags.SPAWN_OBJ):
+                raise SpellConfigError(f"Spell {spell.spell_id} ({spell.name}) spawns {spell.spawn_count} objects, which only plain SPAWN_OBJ spells can.")
+            if not spell.spawned_components & SpawnedComponentFlags.HEALTH and (spell.hp or spell.hp_triggers or spell.health_behavior & HealthSpellFlags.MORTAL):
+                raise SpellConfigError(f"Spell {spell.spell_id} ({spell.name}) gives its spawned object hp, but no health component.")
+            if not spell.spawned_components & SpawnedComponentFlags.CASTING and spell.hardware_bindings:
+                raise SpellConfigError(f"Spell {spell.spell_id} ({spell.name}) binds inputs for its spawned object, but no casting component.")
+            if spell.health_behavior & HealthSpellFlags.MORTAL:
+                death = spells.get(Consts.DEATH_SPELL_ID)
+                if death is None or not death.targeting_behavior & TargetingSpellFlags.DESPAWN_SELF:
+                    raise SpellConfigError(
+                        f"Spell {spell.spell_id} ({spell.name}) spawns a mortal object, "
+                        f"but spell {Consts.DEATH_SPELL_ID} does not despawn its caster."
+                    )
+
+    @staticmethod
+    def _validate_event_budget(spell_table: SpellTable) -> None:
+        report = EventBudgetAnalyzer(spell_table).analyze()
+        if report.zero_delay_cycles:
+            raise SpellConfigError(f"Spells {report.zero_delay_cycles} dispatch each other with zero delay and would never finish.")
+        for line in report.format_lines(top=0)[1:]:
+            Logger.warning(line, Logger.FILENAME_SPELL_CONFIG_LOG)
+
+    # --- Compiled Cache ---
+
+    @staticmethod
+    def _hash_config_files(config_paths: list[Path]) -> str:
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{SpellConfigLoader.CACHE_VERSION}:".encode())
+        for path in SpellConfigLoader._COMPILER_PATHS:
+            hasher.update(path.read_bytes())
+        for path in config_paths:
+            hasher.update(path.name.encode())
+            hasher.update(path.read_bytes())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _cache_path(content_hash: str) -> Path:
+        return SpellConfigLoader.CACHE_DIR / f"spell_table.{content_hash}.pickle"
+
+    @staticmethod
+    def _read_cached_table(content_hash: str) -> SpellTable | None:
+        try:
+            with open(SpellConfigLoader._cache_path(content_hash), "rb") as f:
+                spell_table = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+        return spell_table if isinstance(spell_table, SpellTable) else None
+
+    @staticmethod
+    def _write_cached_table(content_hash: str, spell_table: SpellTable) -> None:
+        # Each writer renames its own temporary file into place, so parallel workers never see a partial cache.
+        # A reader whose cache was pruned in the meantime just compiles the table again.
+        try:
+            SpellConfigLoader.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=SpellConfigLoader.CACHE_DIR, prefix="spell_table.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(spell_table, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_name, SpellConfigLoader._cache_path(content_hash))
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+            SpellConfigLoader._prune_cached_tables()
+        except OSError:
+            pass  # The cache is only an optimization; a read-only install still works
+
+    @staticmethod
+    def _prune_cached_tables() -> None:
+        """Deletes all but the most recently written caches, so hot reloads do not grow the directory forever."""
+        cached_paths = []
+        for path in SpellConfigLoader.CACHE_DIR.glob("spell_table.*.pickle"):
+            try:
+                cached_paths.append((path.stat().st_mtime, path))
+            except OSError:
+                continue  # Pruned by another process
+        cached_paths.sort(reverse=True)
+        for _, path in cached_paths[SpellConfigLoader.CACHED_TABLES_TO_KEEP:]:
+            path.unlink(missing_ok=True)
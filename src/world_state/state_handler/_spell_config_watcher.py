@@ -0,0 +1,61 @@
+import time
+from pathlib import Path
+
+from src.utils import Logger
+from ._spell_config_loader import SpellConfigLoader
+from ._spell_table import SpellConfigError, SpellTableDiff
+from .state_handler import StateHandler
+
+
+class SpellConfigWatcher:
+    """
+    Hot-reloads the spell config files into a running StateHandler when they change on disk.
+
+    Polling only compares file names, modification times and sizes, and is throttled to
+    `POLL_INTERVAL_S`, so it is cheap enough to call every frame. Objects and scheduled events are
+    kept as they are. An edit that fails to parse or validate is reported, and the game keeps
+    running with the spells it already had.
+    """
+    POLL_INTERVAL_S = 0.5
+
+    def __init__(self, state_handler: StateHandler, config_dir: Path | None = None) -> None:
+        self._state_handler = state_handler
+        self._config_dir = config_dir or SpellConfigLoader.CONFIG_DIR
+        self._file_signature = self._read_file_signature()
+        self._next_poll_time = time.monotonic() + SpellConfigWatcher.POLL_INTERVAL_S
+
+    def poll(self) -> SpellTableDiff | None:
+        """Reloads the spell configs if they changed since the last poll and returns what changed."""
+        now = time.monotonic()
+        if now < self._next_poll_time:
+            return None
+        self._next_poll_time = now + SpellConfigWatcher.POLL_INTERVAL_S
+        return self.reload_if_changed()
+
+    def reload_if_changed(self) -> SpellTableDiff | None:
+        file_signature = self._read_file_signature()
+        if file_signature == self._file_signature:
+            return None
+        self._file_signature = file_signature
+        try:
+            spell_table = SpellConfigLoader.load_spell_table(self._config_dir)
+            diff = self._state_handler.reload_spell_table(spell_table)
+        except (OSError, SpellConfigError) as e:
+            Logger.warning(f"Spell configs were not reloaded: {e}", Logger.FILENAME_SPELL_CONFIG_LOG)
+            return None
+        if not diff.is_empty:
+            Logger.info(
+                f"Reloaded spell configs: {len(diff.changed)} changed {sorted(diff.changed)}, {len(diff.added)} added {sorted(diff.added)}.",
+                Logger.FILENAME_SPELL_CONFIG_LOG
+            )
+        return diff
+
+    def _read_file_signature(self) -> tuple[tuple[str, int, int], ...]:
+        try:
+            return tuple(
+                (path.name, path.stat().st_mtime_ns, path.stat().st_size)
+                for path in sorted(self._config_dir.iterdir())
+                if path.suffix in SpellConfigLoader.SUPPORTED_SUFFIXES
+            )
+        except OSError:
+            return ()  # A file that is being replaced right now is picked up by the next poll
@@ -22,6 +22,7 @@ class HealthSpellFlags(IntFlag):
     DAMAGING = auto()
     HEALING = auto()
     IS_CHANNEL = auto()
+    MORTAL = auto()
 
 class MovementSpellFlags(IntFlag):
     """ Various bitflags that define spell movement behavior. """
@@ -42,6 +43,8 @@ class MovementSpellFlags(IntFlag):
     DESPAWN_SELF = auto()
     APPLY_VELOCITY = auto()
     REMOVE_VELOCITY = auto()
+    CLAMP_TO_PLAY_AREA = auto()
+    STOP_AT_PLAY_AREA_BOUND = auto()
 
 class TargetingSpellFlags(IntFlag):
     """Non-combat, non-movement spell flags related to targeting."""
@@ -53,6 +56,18 @@ class TargetingSpellFlags(IntFlag):
     DESPAWN_SELF = auto()
     UPDATE_CURRENT_TARGET = auto()
 
+class SpawnedComponentFlags(IntFlag):
+    """Optional components a spawned object is built with; every object has movement and targeting."""
+    NONE = 0
+    CASTING = auto()
+    HEALTH = auto()
+
+class SpawnPattern(Enum):
+    """ Arranges the objects of a batch spawn around the spawn offset """
+    NONE = 0  # All on the spawn offset
+    RING = auto()  # Evenly around a circle with a radius of spawn_spacing
+    ROW = auto()  # Along the x-axis, spawn_spacing apart and centered on the spawn offset
+
 class TargetingSpellMode(Enum):
     """ Defines targeting behavior for spell """
     NONE = 0
@@ -82,12 +97,18 @@ class SpellData:
     # Casting Data
     timeline: dict[int, list[int]] = field(default_factory=dict)
     base_cooldown: float = 0.0
-    hardware_bindings: dict[str, int] = field(default_factory=dict)
+    hardware_bindings: dict[int, int] = field(default_factory=dict)  # HardwareInputConsts code -> spell_id
     gcd_mod: float = 1.0
+    # Range trigger: fires the spell on the first tick of the window where its target is within its range_limit
+    range_trigger_spell_id: int = Consts.EMPTY_ID
+    range_trigger_interval: int = 0
+    range_trigger_duration: int = 0
 
     # Health Data
     power: float = 1.0
     hp: float = 0.0
+    # Spells the spawned object dispatches at itself each time its hp drops to a fraction of its max_hp
+    hp_triggers: dict[float, list[int]] = field(default_factory=dict)
 
     # Movement Data
     range_limit: float = 0.0
@@ -95,9 +116,15 @@ class SpellData:
     spawned_x_offset: float = 0.0
     spawned_y_offset: float = 0.0
     spawned_movespeed: float = 1.0
+    # Batch spawns: spawn_count objects in one event, each running the spell's timeline
+    spawn_count: int = 1
+    spawn_pattern: SpawnPattern = SpawnPattern.NONE
+    spawn_spacing: float = 0.0
 
     # Targeting Data
     targeting: TargetingSpellMode = TargetingSpellMode.NONE
+    # Objects that never cast (projectiles, hazards) or cannot be hurt are spawned without those components
+    spawned_components: SpawnedComponentFlags = SpawnedComponentFlags.CASTING | SpawnedComponentFlags.HEALTH
 
     # VFX/SFX Data
     audio_name: str = ""
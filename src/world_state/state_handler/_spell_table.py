@@ -0,0 +1,238 @@
+import math
+from dataclasses import dataclass, field, fields
+from typing import Iterable, Optional, Tuple
+
+from src.settings import Consts
+from ._spell_data import CastingSpellFlags, SpawnPattern, SpellData, TargetingSpellFlags, TargetingSpellMode
+
+
+class SpellConfigError(ValueError):
+    """Spell definitions that cannot be parsed, validated or compiled into a SpellTable."""
+
+
+@dataclass(slots=True)
+class SpellTableDiff:
+    """Spell IDs that differ between two compiled spell tables."""
+    added: set[int] = field(default_factory=set)
+    removed: set[int] = field(default_factory=set)
+    changed: set[int] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+@dataclass(slots=True, frozen=True)
+class SpellTable:
+    """
+    Compiled, read-only spell configuration shared by every system.
+
+    Each spell is assigned a dense slot, and every field is stored in a tuple indexed by that slot.
+    Behavior flags and targeting modes are plain ints, so hot-path checks never touch an enum, and
+    the per-event questions (is it an AoE, does it spawn an object) are answered by boolean columns.
+    Systems resolve a spell_id once with `slot_of` and then read the columns they need by index.
+    Nested values are tuples too, since one table is shared by every world state that loads it.
+
+    A trampoline spell has no effect of its own: it targets its caster and only dispatches other
+    spells with zero delay. For those, `trampoline_expansions` holds the flattened list of spells the
+    chain eventually dispatches, so a cast can apply them directly instead of hopping through the heap.
+    """
+    MISSING_SLOT = -1
+    # Dense indices that shift whenever a spell is added, so they never mark a spell as changed
+    INDEX_COLUMNS = ("slot_by_spell_id", "spell_ids", "cooldown_slots")
+
+    slot_by_spell_id: Tuple[int, ...]
+    spell_ids: Tuple[int, ...]
+    names: Tuple[str, ...]
+
+    # Casting
+    casting_flags: Tuple[int, ...]
+    timelines: Tuple[Tuple[Tuple[int, Tuple[int, ...]], ...], ...]  # (delay in ms, spell_ids), in config order
+    trampoline_expansions: Tuple[Tuple[int, ...], ...]
+    base_cooldowns: Tuple[float, ...]
+    cooldown_slots: Tuple[int, ...]  # Dense index among spells that trigger a cooldown, MISSING_SLOT for the rest
+    input_bindings: Tuple[Tuple[int, ...], ...]  # spell_id bound to each input code, EMPTY_ID where unbound
+    gcd_mods: Tuple[float, ...]
+    channel_durations: Tuple[int, ...]
+    range_trigger_spell_ids: Tuple[int, ...]
+    range_trigger_intervals: Tuple[int, ...]
+    range_trigger_durations: Tuple[int, ...]
+
+    # Health
+    health_flags: Tuple[int, ...]
+    powers: Tuple[float, ...]
+    hps: Tuple[float, ...]
+    hp_triggers: Tuple[Tuple[Tuple[float, int], ...], ...]  # (fraction of max_hp, spell_id), ascending
+
+    # Movement
+    movement_flags: Tuple[int, ...]
+    range_limits: Tuple[float, ...]
+    spawned_x_offsets: Tuple[float, ...]
+    spawned_y_offsets: Tuple[float, ...]
+    spawned_movespeeds: Tuple[float, ...]
+    spawn_offsets: Tuple[Tuple[Tuple[float, float], ...], ...]  # (dx, dy) of each spawned object from the spawn offset
+
+    # Targeting
+    targeting_flags: Tuple[int, ...]
+    targeting_modes: Tuple[int, ...]
+    is_aoe: Tuple[bool, ...]
+    spawns_obj: Tuple[bool, ...]
+    spawns_enemy: Tuple[bool, ...]
+    spawns_boss_or_player: Tuple[bool, ...]
+    spawned_components: Tuple[int, ...]
+
+    # VFX/SFX
+    audio_names: Tuple[str, ...]
+    animation_names: Tuple[str, ...]
+    animation_scales: Tuple[float, ...]
+    animate_on_target: Tuple[bool, ...]
+    spawn_colors: Tuple[Optional[Tuple[int, int, int]], ...]
+    spawn_sprite_names: Tuple[str, ...]
+    spawn_audio_names: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, spells: Iterable[SpellData]) -> 'SpellTable':
+        spells = sorted(spells, key=lambda spell: spell.spell_id)
+        slot_by_spell_id = [SpellTable.MISSING_SLOT] * ((spells[-1].spell_id + 1) if spells else 0)
+        for slot, spell in enumerate(spells):
+            if spell.spell_id < 0:
+                raise SpellConfigError(f"Spell ID {spell.spell_id} cannot be given a slot.")
+            if slot_by_spell_id[spell.spell_id] != SpellTable.MISSING_SLOT:
+                raise SpellConfigError(f"Spell with ID {spell.spell_id} already exists.")
+            slot_by_spell_id[spell.spell_id] = slot
+
+        spawn_flags = TargetingSpellFlags.SPAWN_BOSS | TargetingSpellFlags.SPAWN_PLAYER
+        any_spawn_flags = spawn_flags | TargetingSpellFlags.SPAWN_OBJ
+        spells_by_id = {spell.spell_id: spell for spell in spells}
+        return cls(
+            slot_by_spell_id=tuple(slot_by_spell_id),
+            spell_ids=tuple(spell.spell_id for spell in spells),
+            names=tuple(spell.name for spell in spells),
+            casting_flags=tuple(int(spell.casting_behavior) for spell in spells),
+            timelines=tuple(tuple((delay, tuple(spell_ids)) for delay, spell_ids in spell.timeline.items()) for spell in spells),
+            trampoline_expansions=tuple(SpellTable._expand_trampoline(spell, spells_by_id) for spell in spells),
+            base_cooldowns=tuple(spell.base_cooldown for spell in spells),
+            cooldown_slots=SpellTable._assign_cooldown_slots(spells),
+            input_bindings=tuple(SpellTable.compile_input_bindings(spell.hardware_bindings) for spell in spells),
+            gcd_mods=tuple(spell.gcd_mod for spell in spells),
+            # Infer how long a channel lasts by the final timestamp in its timeline (or its range trigger window)
+            channel_durations=tuple(max(max(spell.timeline.keys(), default=0), spell.range_trigger_duration) for spell in spells),
+            range_trigger_spell_ids=tuple(spell.range_trigger_spell_id for spell in spells),
+            range_trigger_intervals=tuple(spell.range_trigger_interval for spell in spells),
+            range_trigger_durations=tuple(spell.range_trigger_duration for spell in spells),
+            health_flags=tuple(int(spell.health_behavior) for spell in spells),
+            powers=tuple(spell.power for spell in spells),
+            hps=tuple(spell.hp for spell in spells),
+            hp_triggers=tuple(
+                tuple(sorted((fraction, spell_id) for fraction, spell_ids in spell.hp_triggers.items() for spell_id in spell_ids))
+                for spell in spells
+            ),
+            movement_flags=tuple(int(spell.movement_behavior) for spell in spells),
+            range_limits=tuple(spell.range_limit for spell in spells),
+            spawned_x_offsets=tuple(spell.spawned_x_offset for spell in spells),
+            spawned_y_offsets=tuple(spell.spawned_y_offset for spell in spells),
+            spawned_movespeeds=tuple(spell.spawned_movespeed for spell in spells),
+            spawn_offsets=tuple(SpellTable._arrange_spawns(spell) for spell in spells),
+            targeting_flags=tuple(int(spell.targeting_behavior) for spell in spells),
+            targeting_modes=tuple(spell.targeting.value for spell in spells),
+            is_aoe=tuple(bool(spell.targeting_behavior & TargetingSpellFlags.AOE) for spell in spells),
+            spawns_obj=tuple(bool(spell.targeting_behavior & any_spawn_flags) for spell in spells),
+            spawns_enemy=tuple(bool(spell.targeting_behavior & TargetingSpellFlags.SPAWN_BOSS) for spell in spells),
+            spawns_boss_or_player=tuple(bool(spell.targeting_behavior & spawn_flags) for spell in spells),
+            spawned_components=tuple(int(spell.spawned_components) for spell in spells),
+            audio_names=tuple(spell.audio_name for spell in spells),
+            animation_names=tuple(spell.animation_name for spell in spells),
+            animation_scales=tuple(spell.animation_scale for spell in spells),
+            animate_on_target=tuple(spell.animate_on_target for spell in spells),
+            spawn_colors=tuple(spell.spawn_color for spell in spells),
+            spawn_sprite_names=tuple(spell.spawn_sprite_name for spell in spells),
+            spawn_audio_names=tuple(spell.spawn_audio_name for spell in spells),
+        )
+
+    @staticmethod
+    def compile_input_bindings(hardware_bindings: dict[int, int]) -> Tuple[int, ...]:
+        """Dense binding table indexed by input code; an empty tuple when nothing is bound."""
+        input_bindings = [Consts.EMPTY_ID] * (max(hardware_bindings, default=-1) + 1)
+        for input_code, spell_id in hardware_bindings.items():
+            if input_code < 0:
+                raise SpellConfigError(f"Input code {input_code} cannot be bound.")
+            input_bindings[input_code] = spell_id
+        return tuple(input_bindings)
+
+    @staticmethod
+    def _assign_cooldown_slots(spells: list[SpellData]) -> Tuple[int, ...]:
+        cooldown_slots: list[int] = []
+        next_cooldown_slot = 0
+        for spell in spells:
+            if spell.casting_behavior & CastingSpellFlags.TRIGGER_COOLDOWN:
+                cooldown_slots.append(next_cooldown_slot)
+                next_cooldown_slot += 1
+            else:
+                cooldown_slots.append(SpellTable.MISSING_SLOT)
+        return tuple(cooldown_slots)
+
+    @staticmethod
+    def _arrange_spawns(spell: SpellData) -> Tuple[Tuple[float, float], ...]:
+        """Offset of each object the spell spawns from its spawn offset, one entry per object."""
+        count, spacing = spell.spawn_count, spell.spawn_spacing
+        if spell.spawn_pattern == SpawnPattern.RING:
+            return tuple((spacing * math.cos(2.0 * math.pi * i / count), spacing * math.sin(2.0 * math.pi * i / count)) for i in range(count))
+        if spell.spawn_pattern == SpawnPattern.ROW:
+            return tuple((spacing * (i - (count - 1) / 2.0), 0.0) for i in range(count))
+        return ((0.0, 0.0),) * count
+
+    @staticmethod
+    def is_trampoline(spell: SpellData) -> bool:
+        """Whether a spell does nothing but immediately dispatch other spells at its caster."""
+        return (
+            spell.targeting == TargetingSpellMode.SELF
+            and not (spell.casting_behavior or spell.health_behavior or spell.movement_behavior or spell.targeting_behavior)
+            and spell.range_limit <= 0.0
+            and not spell.audio_name
+            and not spell.animation_name
+            and set(spell.timeline) == {0}
+            and spell.range_trigger_spell_id == Consts.EMPTY_ID
+        )
+
+    @staticmethod
+    def _expand_trampoline(spell: SpellData, spells_by_id: dict[int, SpellData], expanding: Tuple[int, ...] = ()) -> Tuple[int, ...]:
+        if not SpellTable.is_trampoline(spell) or spell.spell_id in expanding:
+            return ()  # A zero-delay cycle is left to the event heap; the budget analyzer reports it
+        direct: list[int] = []
+        nested: list[int] = []
+        for spell_id in spell.timeline[0]:
+            nested_expansion = SpellTable._expand_trampoline(spells_by_id[spell_id], spells_by_id, expanding + (spell.spell_id,)) if spell_id in spells_by_id else ()
+            if nested_expansion:
+                # A nested trampoline only dispatched once it ran, after its siblings
+                nested.extend(nested_expansion)
+            else:
+                direct.append(spell_id)
+        return tuple(direct + nested)
+
+    @property
+    def size(self) -> int:
+        return len(self.spell_ids)
+
+    def slot_of(self, spell_id: int) -> int:
+        """Dense slot of a spell, or MISSING_SLOT if no spell with that ID is configured."""
+        if 0 <= spell_id < len(self.slot_by_spell_id):
+            return self.slot_by_spell_id[spell_id]
+        return SpellTable.MISSING_SLOT
+
+    def has_spell(self, spell_id: int) -> bool:
+        return self.slot_of(spell_id) != SpellTable.MISSING_SLOT
+
+    def diff(self, other: 'SpellTable') -> SpellTableDiff:
+        """Which spells `other` adds, removes or configures differently compared to this table."""
+        diff = SpellTableDiff(
+            added=set(other.spell_ids) - set(self.spell_ids),
+            removed=set(self.spell_ids) - set(other.spell_ids),
+        )
+        columns = [table_field.name for table_field in fields(SpellTable) if table_field.name not in SpellTable.INDEX_COLUMNS]
+        for slot, spell_id in enumerate(self.spell_ids):
+            other_slot = other.slot_of(spell_id)
+            if other_slot == SpellTable.MISSING_SLOT:
+                continue
+            if any(getattr(self, column)[slot] != getattr(other, column)[other_slot] for column in columns):
+                diff.changed.add(spell_id)
+        return diff
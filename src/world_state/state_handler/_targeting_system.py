@@ -3,6 +3,7 @@ from typing import Dict, Iterable
 from enum import IntFlag, auto, Enum
 
 from src.settings import Consts
+from ._spell_table import SpellTable, SpellTableDiff
 
 
 class Targeting(Enum):
@@ -35,18 +36,25 @@ class Status(Enum):
 
     @property
     def is_valid_source(self) -> bool:
-        return not self in {
-            Status.DESPAWNED,
-            Status.BANISHED,
-        }
+        return self not in _INVALID_SOURCE_STATUSES
 
     @property
     def is_valid_target(self) -> bool:
-        return not self in {
-            Status.ENVIRONMENT,
-            Status.DESPAWNED,
-            Status.BANISHED,
-        }
+        return self not in _INVALID_TARGET_STATUSES
+
+
+_INVALID_SOURCE_STATUSES = frozenset({Status.DESPAWNED, Status.BANISHED})
+_INVALID_TARGET_STATUSES = frozenset({Status.ENVIRONMENT, Status.DESPAWNED, Status.BANISHED})
+
+# Targeting modes are stored as plain ints in the spell table and compared as such
+_USE_EVENT_TARGET = Targeting.USE_EVENT_TARGET.value
+_DEFAULT_CROSS_TEAM = Targeting.DEFAULT_CROSS_TEAM.value
+_TAB_TO_NEXT = Targeting.TAB_TO_NEXT.value
+_TARGETS_SELF = frozenset({Targeting.SELF.value, Targeting.DEFAULT_SAME_TEAM.value})
+_TARGETS_CURRENT_TARGET = frozenset({Targeting.TARGET.value, Targeting.TARGET_OF_TARGET.value})
+_TARGETS_PARENT = frozenset({Targeting.PARENT.value, Targeting.TARGET_OF_PARENT.value})
+_TARGETS_TARGET_OF = frozenset({Targeting.TARGET_OF_TARGET.value, Targeting.TARGET_OF_PARENT.value})
+_NO_TARGETING = Targeting.NONE.value
 
 @dataclass(slots=True)
 class DefaultIDs:
@@ -94,14 +102,11 @@ class TargetingBehavior(IntFlag):
     UPDATE_CURRENT_TARGET = auto()
 
 
-@dataclass(slots=True)
-class SpellTargetingData:
-    """Stores targeting-related data extracted from a Spell."""
-    spell_id: int
-    targeting: Targeting
-    is_enemy: bool = False
-    is_boss_or_player: bool = False
-    flags: TargetingBehavior = TargetingBehavior.NONE
+# Plain-int masks for the hot path; an IntFlag operand would route every `&` through enum code
+_SPAWN_BOSS = TargetingBehavior.SPAWN_BOSS.value
+_SPAWN_PLAYER = TargetingBehavior.SPAWN_PLAYER.value
+_DESPAWN_SELF = TargetingBehavior.DESPAWN_SELF.value
+_UPDATE_CURRENT_TARGET = TargetingBehavior.UPDATE_CURRENT_TARGET.value
 
 
 @dataclass(slots=True)
@@ -128,14 +133,14 @@ class ObjTargetingData:
     @classmethod
     def create_from_spell(
         cls, timestamp: int, parent_obj_id: int, target_id: int,
-        parent_data: 'ObjTargetingData', spell_data: SpellTargetingData
+        parent_data: 'ObjTargetingData', spell_table: SpellTable, slot: int
     ) -> 'ObjTargetingData':
-        is_enemy = spell_data.is_enemy if parent_data.status == Status.ENVIRONMENT else parent_data.is_enemy
+        is_enemy = spell_table.spawns_enemy[slot] if parent_data.status == Status.ENVIRONMENT else parent_data.is_enemy
         return cls(
             parent_id=parent_obj_id,
             current_target_id=target_id,
             is_enemy=is_enemy,
-            is_boss_or_player=spell_data.is_boss_or_player,
+            is_boss_or_player=spell_table.spawns_boss_or_player[slot],
             status=Status.ALIVE,
             obj_spawn_timestamp=timestamp,
         )
@@ -145,11 +150,14 @@ class TargetingSystem:
     """
     Manages spell targeting and object targeting state.
     """
-    def __init__(self, spell_data_dct: Dict[int, SpellTargetingData]) -> None:
-        self.spell_data_dct: Dict[int, SpellTargetingData] = spell_data_dct
+    def __init__(self, spell_table: SpellTable) -> None:
+        self.spell_table: SpellTable = spell_table
         self.game_obj_data_dct: Dict[int, ObjTargetingData] = {}
         self.default_ids: DefaultIDs = DefaultIDs()
 
+    def patch_spell_table(self, spell_table: SpellTable, diff: SpellTableDiff) -> None:
+        self.spell_table = spell_table
+
     def create_environment_obj(self, obj_id: int) -> None:
         assert not self.default_ids.environment_exists, f"Environment is already initialized (ID={self.default_ids.environment_id})"
         self.default_ids.environment_id = obj_id
@@ -171,49 +179,65 @@ class TargetingSystem:
         spell_id: int,
         target_id: int,
     ) -> None:
-        if spell_id not in self.spell_data_dct:
+        self.spawn_game_objs(timestamp, parent_obj_id, [new_obj_id], spell_id, target_id)
+
+    def spawn_game_objs(
+        self,
+        timestamp: int,
+        parent_obj_id: int,
+        new_obj_ids: list[int],
+        spell_id: int,
+        target_id: int,
+    ) -> None:
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
             return
 
-        spell_data = self.spell_data_dct[spell_id]
         parent_data = self.game_obj_data_dct.get(parent_obj_id)
 
         if parent_data is None:
             return
 
-        self.game_obj_data_dct[new_obj_id] = ObjTargetingData.create_from_spell(
-            timestamp, parent_obj_id, target_id, parent_data, spell_data
-        )
-        self._update_default_ids(new_obj_id, spell_id)
+        for new_obj_id in new_obj_ids:
+            self.game_obj_data_dct[new_obj_id] = ObjTargetingData.create_from_spell(
+                timestamp, parent_obj_id, target_id, parent_data, self.spell_table, slot
+            )
+            self._update_default_ids(new_obj_id, slot)
 
     def despawn_game_obj(self, obj_id: int) -> None:
         self.game_obj_data_dct.pop(obj_id, None)
 
 
-    def apply_targeting_event(self, source_id: int, spell_id: int, target_id: int) -> None:
-        if spell_id not in self.spell_data_dct:
-            return
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
+    def apply_targeting_event(self, source_id: int, spell_id: int, target_id: int) -> bool:
+        """Returns whether the source switched to another current target."""
+        slot = self.spell_table.slot_of(spell_id)
+        if slot == SpellTable.MISSING_SLOT:
+            return False
+        flags = self.spell_table.targeting_flags[slot]
         source_data = self.game_obj_data_dct.get(source_id)
+        switched_target = False
         if source_data:
-            if flags & TargetingBehavior.UPDATE_CURRENT_TARGET:
+            if flags & _UPDATE_CURRENT_TARGET:
+                switched_target = source_data.current_target_id != target_id
                 source_data.current_target_id = target_id
-            if flags & TargetingBehavior.DESPAWN_SELF:
+            if flags & _DESPAWN_SELF:
                 source_data.status = Status.DESPAWNED
+        return switched_target
 
     def is_area_of_effect(self, spell_id: int) -> bool:
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
-        if flags & TargetingBehavior.AOE:
-            return True
-        return False
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return self.spell_table.is_aoe[slot]
 
     def is_obj_spawn(self, spell_id) -> bool:
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
-        if flags & TargetingBehavior.SPAWN_OBJ or flags & TargetingBehavior.SPAWN_BOSS or flags & TargetingBehavior.SPAWN_PLAYER:
-            return True
-        return False
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return self.spell_table.spawns_obj[slot]
+
+    def get_spawn_count(self, spell_id: int) -> int:
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return len(self.spell_table.spawn_offsets[slot])
 
     def is_visible(self, obj_id: int) -> bool:
         if obj_id not in self.game_obj_data_dct:
@@ -240,38 +264,39 @@ class TargetingSystem:
         for obj_id, data in self.game_obj_data_dct.items():
             obj_allied = not data.is_enemy
             team_is_hit = (obj_allied == source_allied) == (source_allied == target_allied)
-            if team_is_hit and data.status.is_valid_target and obj_id != primary_target_id:
+            if team_is_hit and data.status not in _INVALID_TARGET_STATUSES and obj_id != primary_target_id:
                 yield obj_id
 
     def decide_event_targeting(self, source_id: int, spell_id: int, undecided_target_id: int) -> int:
-        spell_data = self.spell_data_dct[spell_id]
-        targeting = spell_data.targeting
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        targeting = self.spell_table.targeting_modes[slot]
 
-        assert targeting != Targeting.NONE or (spell_data.flags & TargetingBehavior.AOE), (
+        assert targeting != _NO_TARGETING or self.spell_table.is_aoe[slot], (
             f"obj {source_id} is casting a spell with neither targeting=NONE or AOE-behavior"
         )
 
         source_data = self.game_obj_data_dct[source_id]
         is_on_players_team = not source_data.is_enemy
 
-        if targeting in {Targeting.SELF, Targeting.DEFAULT_SAME_TEAM}:
+        if targeting in _TARGETS_SELF:
             target_id = source_id
         elif (
-            targeting in {Targeting.TARGET, Targeting.TARGET_OF_TARGET}
+            targeting in _TARGETS_CURRENT_TARGET
             and Consts.is_valid_id(source_data.current_target_id)
         ):
             target_id = source_data.current_target_id
         elif (
-            targeting in {Targeting.PARENT, Targeting.TARGET_OF_PARENT}
+            targeting in _TARGETS_PARENT
             and Consts.is_valid_id(source_data.parent_id)
         ):
             target_id = source_data.parent_id
-        elif targeting == Targeting.DEFAULT_CROSS_TEAM:
+        elif targeting == _DEFAULT_CROSS_TEAM:
             if is_on_players_team:
                 target_id = self.default_ids.boss1_id
             else:
                 target_id = self.default_ids.player_id
-        elif targeting == Targeting.TAB_TO_NEXT:
+        elif targeting == _TAB_TO_NEXT:
             if not is_on_players_team:
                 target_id = self.default_ids.player_id
             elif (
@@ -287,7 +312,7 @@ class TargetingSystem:
             target_id = self.default_ids.missing_target_id
 
         if (
-            targeting in {Targeting.TARGET_OF_TARGET, Targeting.TARGET_OF_PARENT}
+            targeting in _TARGETS_TARGET_OF
             and Consts.is_valid_id(target_id)
         ):
             target_data = self.game_obj_data_dct.get(target_id)
@@ -299,31 +324,30 @@ class TargetingSystem:
             else:
                 target_id = self.default_ids.missing_target_id
 
-        if targeting == Targeting.USE_EVENT_TARGET:
+        if targeting == _USE_EVENT_TARGET:
             target_id = undecided_target_id
 
         return target_id
 
-    def _update_default_ids(self, obj_id: int, spell_id: int) -> None:
-        spell_data = self.spell_data_dct[spell_id]
-        flags = spell_data.flags
-        if flags & TargetingBehavior.SPAWN_BOSS:
+    def _update_default_ids(self, obj_id: int, slot: int) -> None:
+        flags = self.spell_table.targeting_flags[slot]
+        if flags & _SPAWN_BOSS:
             if not self.default_ids.boss1_exists:
                 self.default_ids.boss1_id = obj_id
             else:
                 assert not self.default_ids.boss2_exists, "Second boss already exists."
                 self.default_ids.boss2_id = obj_id
-        if flags & TargetingBehavior.SPAWN_PLAYER:
+        if flags & _SPAWN_PLAYER:
             assert not self.default_ids.player_exists, "Player already exists."
             self.default_ids.player_id = obj_id
 
     def is_valid_source(self, obj_id: int) -> bool:
         data = self.game_obj_data_dct.get(obj_id)
-        return data is not None and data.status.is_valid_source
+        return data is not None and data.status not in _INVALID_SOURCE_STATUSES
 
     def is_valid_target(self, obj_id: int) -> bool:
         data = self.game_obj_data_dct.get(obj_id)
-        return data is not None and data.status.is_valid_target
+        return data is not None and data.status not in _INVALID_TARGET_STATUSES
 
     def select_targets_for_aoe(self, source_id: int, target_id: int) -> Iterable[int]:
         source_data = self.game_obj_data_dct.get(source_id)
@@ -337,5 +361,5 @@ class TargetingSystem:
                 (obj_data.is_enemy == source_is_enemy) ==
                 (source_is_enemy == target_is_enemy)
             )
-            if team_is_hit_by_aoe and obj_data.status.is_valid_target:
+            if team_is_hit_by_aoe and obj_data.status not in _INVALID_TARGET_STATUSES:
                 yield obj_id
\ No newline at end of file
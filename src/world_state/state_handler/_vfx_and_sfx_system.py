@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 
 from src.settings import Consts
+from ._spell_table import SpellTable, SpellTableDiff
 
 
 @dataclass(slots=True)
@@ -64,9 +65,43 @@ class VfxAndSfxSystem:
     """
     Manages all cosmetic rendering logic, sprites, animations, and sound effects.
     """
-    def __init__(self, spell_data_dct: Dict[int, SpellVfxData]) -> None:
-        self.spell_data_dct: Dict[int, SpellVfxData] = spell_data_dct
+    def __init__(self, spell_table: SpellTable) -> None:
+        self.spell_table: SpellTable = spell_table
         self.game_obj_vfx_dct: Dict[int, ObjVfxData] = {}
+        # Renderers consume whole SpellVfxData payloads, so they are assembled once per slot
+        self._spell_visuals: tuple[SpellVfxData, ...] = tuple(
+            self._create_spell_visuals(spell_table, slot) for slot in range(spell_table.size)
+        )
+
+    @staticmethod
+    def _create_spell_visuals(spell_table: SpellTable, slot: int) -> SpellVfxData:
+        spawn_template = None
+        spawn_color = spell_table.spawn_colors[slot]
+        if spawn_color is not None:
+            spawn_template = SpellVisualTemplate(
+                color=spawn_color,
+                sprite_name=spell_table.spawn_sprite_names[slot],
+                audio_name=spell_table.spawn_audio_names[slot],
+            )
+        return SpellVfxData(
+            audio_name=spell_table.audio_names[slot],
+            animation_name=spell_table.animation_names[slot],
+            animation_scale=spell_table.animation_scales[slot],
+            animate_on_target=spell_table.animate_on_target[slot],
+            spawn_template=spawn_template,
+        )
+
+    def patch_spell_table(self, spell_table: SpellTable, diff: SpellTableDiff) -> None:
+        """Swaps in a reloaded table, reassembling visuals only for the spells that changed."""
+        if spell_table.spell_ids != self.spell_table.spell_ids:
+            self._spell_visuals = tuple(self._create_spell_visuals(spell_table, slot) for slot in range(spell_table.size))
+        else:
+            spell_visuals = list(self._spell_visuals)
+            for spell_id in diff.changed:
+                slot = spell_table.slot_of(spell_id)
+                spell_visuals[slot] = self._create_spell_visuals(spell_table, slot)
+            self._spell_visuals = tuple(spell_visuals)
+        self.spell_table = spell_table
 
     def create_environment_obj(self, obj_id: int) -> None:
         """Sets up default, invisible rendering for the environment object."""
@@ -74,15 +109,22 @@ class VfxAndSfxSystem:
 
     def spawn_game_obj(self, obj_id: int, spell_id: int) -> None:
         """Assigns the cosmetic template of the spell to a newly spawned object."""
-        spell_data = self.spell_data_dct.get(spell_id)
-        self.game_obj_vfx_dct[obj_id] = ObjVfxData.create_from_spell(spell_data)
+        self.spawn_game_objs([obj_id], spell_id)
+
+    def spawn_game_objs(self, obj_ids: list[int], spell_id: int) -> None:
+        slot = self.spell_table.slot_of(spell_id)
+        spell_data = self._spell_visuals[slot] if slot != SpellTable.MISSING_SLOT else None
+        for obj_id in obj_ids:
+            self.game_obj_vfx_dct[obj_id] = ObjVfxData.create_from_spell(spell_data)
 
     def despawn_game_obj(self, obj_id: int) -> None:
         self.game_obj_vfx_dct.pop(obj_id, None)
 
     def get_spell_visuals(self, spell_id: int) -> SpellVfxData:
         """Returns visual/audio data to play when a spell is cast."""
-        return self.spell_data_dct[spell_id]
+        slot = self.spell_table.slot_of(spell_id)
+        assert slot != SpellTable.MISSING_SLOT, f"Spell with ID {spell_id} not found."
+        return self._spell_visuals[slot]
 
     def get_obj_visuals(self, obj_id: int) -> ObjVfxData:
         """Returns the sprite and color payload used to render an object."""
@@ -1,14 +1,24 @@
-from typing import Iterable
+from typing import Iterable, Optional
 from dataclasses import dataclass
 
+from src.settings import Consts
+from ._spell_data import SpawnedComponentFlags
 from ._spell_database import SpellDatabase
-from ._casting_system import CastingSystem
-from ._health_system import HealthSystem
-from ._movement_system import MovementSystem
+from ._spell_table import SpellConfigError, SpellTable, SpellTableDiff
+from ._casting_system import CastingSystem, Channel, QueuedCast
+from ._combat_meter import CombatMeter
+from ._health_system import HealthChange, HealthSystem
+from ._movement_system import MovementSystem, Pursuit, RangeWatch, WallContact
 from ._targeting_system import TargetingSystem
 from ._vfx_and_sfx_system import VfxAndSfxSystem, SpellVfxData
 
 
+# Plain-int masks for the spawn path
+_CASTING_COMPONENT = SpawnedComponentFlags.CASTING.value
+_HEALTH_COMPONENT = SpawnedComponentFlags.HEALTH.value
+_NO_BINDINGS: tuple[None, None] = (None, None)
+
+
 @dataclass(slots=True)
 class DisplayObj:
     obj_id: int
@@ -19,15 +29,55 @@ class DisplayObj:
 
 
 class StateHandler:
-    """ Encapsulates all ECS-like systems and exposes a unified interface. """
+    """
+    Encapsulates all ECS-like systems and exposes a unified interface.
+
+    Range watches, pursuits, wall contacts, queued casts and channels bind scheduled events to themselves.
+    The ids of all bound events are kept in one set, so the few events that have a binding to detach
+    are told apart from the rest with a single lookup.
 
-    def __init__(self) -> None:
+    A headless state handler has no VfxAndSfxSystem at all, so spawns never build cosmetic
+    components and nothing is spent on presentation data. Likewise, a spawn spell may leave out the
+    casting and health components, and every system treats an object without its component as inert.
+    """
+
+    def __init__(self, headless: bool = False) -> None:
         self.spell_database: SpellDatabase = SpellDatabase()
         self._health_system: HealthSystem = self.spell_database.create_health_system()
         self._casting_system: CastingSystem = self.spell_database.create_casting_system()
         self._movement_system: MovementSystem = self.spell_database.create_movement_system()
         self._targeting_system: TargetingSystem = self.spell_database.create_targeting_system()
-        self._vfx_and_sfx_system: VfxAndSfxSystem = self.spell_database.create_vfx_and_sfx_system()
+        self._vfx_and_sfx_system: Optional[VfxAndSfxSystem] = None if headless else self.spell_database.create_vfx_and_sfx_system()
+        self._bound_event_ids: set[int] = set()
+
+    @property
+    def is_headless(self) -> bool:
+        return self._vfx_and_sfx_system is None
+
+    @property
+    def spell_table(self) -> SpellTable:
+        return self.spell_database.spell_table
+
+    def reload_spell_table(self, spell_table: SpellTable) -> SpellTableDiff:
+        """
+        Patches reloaded spell definitions into every system without touching existing objects.
+
+        Objects keep the stats they were spawned with; changed spells take effect the next time they
+        are cast or spawn something. Spells cannot be removed, since scheduled events may refer to them.
+        """
+        diff = self.spell_database.spell_table.diff(spell_table)
+        if diff.removed:
+            raise SpellConfigError(f"Spells {sorted(diff.removed)} cannot be removed while the game is running.")
+        if diff.is_empty:
+            return diff
+        self.spell_database.spell_table = spell_table
+        self._health_system.patch_spell_table(spell_table, diff)
+        self._casting_system.patch_spell_table(spell_table, diff)
+        self._movement_system.patch_spell_table(spell_table, diff)
+        self._targeting_system.patch_spell_table(spell_table, diff)
+        if self._vfx_and_sfx_system is not None:
+            self._vfx_and_sfx_system.patch_spell_table(spell_table, diff)
+        return diff
 
     @property
     def environment_id(self) -> int:
@@ -41,6 +91,7 @@ class StateHandler:
         return self._targeting_system.game_obj_data_dct.keys()
 
     def get_obj_visuals(self, obj_id: int):
+        assert self._vfx_and_sfx_system is not None, "A headless state handler has no visuals."
         return self._vfx_and_sfx_system.get_obj_visuals(obj_id)
 
     def is_visible(self, obj_id: int) -> bool:
@@ -53,6 +104,7 @@ class StateHandler:
         return self._health_system.get_size(obj_id)
 
     def get_spell_visuals(self, spell_id: int) -> SpellVfxData:
+        assert self._vfx_and_sfx_system is not None, "A headless state handler has no visuals."
         return self._vfx_and_sfx_system.get_spell_visuals(spell_id)
 
     def decide_event_targeting(self, source_id: int, spell_id: int, undecided_target_id: int) -> int:
@@ -61,27 +113,126 @@ class StateHandler:
     def get_current_target_for_obj(self, obj_id: int) -> int:
         return self._targeting_system.get_current_target_for_obj(obj_id)
 
-    def get_ability_timeline(self, spell_id: int) -> dict[int, list[int]]:
+    def get_ability_timeline(self, spell_id: int) -> tuple[tuple[int, tuple[int, ...]], ...]:
         return self._casting_system.get_ability_timeline(spell_id)
 
+    def get_trampoline_expansion(self, spell_id: int) -> tuple[int, ...]:
+        return self._casting_system.get_trampoline_expansion(spell_id)
+
     def is_area_of_effect(self, spell_id: int) -> bool:
         return self._targeting_system.is_area_of_effect(spell_id)
 
     def select_targets_for_aoe(self, source_id: int, target_id: int) -> Iterable[int]:
         return self._targeting_system.select_targets_for_aoe(source_id, target_id)
 
+    def get_range_trigger(self, spell_id: int) -> tuple[int, int, int]:
+        """(spell_id, interval, duration) of the spell's range trigger; spell_id is EMPTY_ID if it has none."""
+        return self._casting_system.get_range_trigger(spell_id)
+
+    def start_range_watch(self, source_id: int, target_id: int, spell_id: int, start: int, interval: int, duration: int) -> RangeWatch:
+        return self._movement_system.start_range_watch(source_id, target_id, spell_id, start, interval, duration)
+
+    def stop_range_watch(self, watch: RangeWatch) -> None:
+        self._bound_event_ids.discard(watch.event_id)
+        self._movement_system.stop_range_watch(watch)
+
+    def bind_range_watch_event(self, watch: RangeWatch, event_id: int) -> None:
+        self._bound_event_ids.discard(watch.event_id)
+        self._bind_event(event_id)
+        self._movement_system.bind_range_watch_event(watch, event_id)
+
+    def pop_invalidated_range_watches(self) -> list[RangeWatch]:
+        return self._movement_system.pop_invalidated_range_watches()
+
+    def find_next_range_tick(self, watch: RangeWatch, earliest_time: int) -> int | None:
+        return self._movement_system.find_next_range_tick(watch, earliest_time)
+
+    def bind_pursuit_event(self, pursuit: Pursuit, event_id: int) -> None:
+        self._bound_event_ids.discard(pursuit.event_id)
+        self._bind_event(event_id)
+        self._movement_system.bind_pursuit_event(pursuit, event_id)
+
+    def pop_rescheduled_pursuits(self) -> list[Pursuit]:
+        return self._movement_system.pop_rescheduled_pursuits()
+
+    def stop_pursuit(self, follower_id: int) -> None:
+        self._movement_system.stop_pursuit(follower_id)
+
+    def bind_wall_contact_event(self, wall_contact: WallContact, event_id: int) -> None:
+        self._bound_event_ids.discard(wall_contact.event_id)
+        self._bind_event(event_id)
+        self._movement_system.bind_wall_contact_event(wall_contact, event_id)
+
+    def pop_rescheduled_wall_contacts(self) -> list[WallContact]:
+        return self._movement_system.pop_rescheduled_wall_contacts()
+
     def has_channel_start(self, spell_id: int) -> bool:
         return self._casting_system.has_channel_start(spell_id)
 
-    def get_spell_ids_for_inputs(self, source_id: int, player_inputs: list[str]) -> Iterable[int]:
+    def start_channel(self, source_id: int, spell_id: int) -> Channel:
+        return self._casting_system.start_channel(source_id, spell_id)
+
+    def bind_channel_event(self, channel: Channel, event_id: int) -> None:
+        self._bind_event(event_id)
+        self._casting_system.bind_channel_event(channel, event_id)
+
+    def add_channel_range_watch(self, channel: Channel, range_watch: RangeWatch) -> None:
+        self._casting_system.add_channel_range_watch(channel, range_watch)
+
+    def pop_interrupted_channels(self) -> list[Channel]:
+        """Interrupted channels, whose remaining events are about to be cancelled."""
+        channels = self._casting_system.pop_interrupted_channels()
+        for channel in channels:
+            self._bound_event_ids.difference_update(channel.event_ids)
+        return channels
+
+    def get_spell_ids_for_inputs(self, source_id: int, player_inputs: list[int]) -> Iterable[int]:
         return self._casting_system.get_spell_ids_for_inputs(source_id, player_inputs)
 
+    def get_cast_time(self, source_id: int, spell_id: int, timestamp: int) -> int:
+        return self._casting_system.get_cast_time(source_id, spell_id, timestamp)
+
+    def queue_cast(self, source_id: int, spell_id: int, cast_time: int, event_id: int) -> QueuedCast:
+        self._bind_event(event_id)
+        return self._casting_system.queue_cast(source_id, spell_id, cast_time, event_id)
+
+    def pop_queued_cast(self, source_id: int) -> QueuedCast | None:
+        queued_cast = self._casting_system.pop_queued_cast(source_id)
+        if queued_cast is not None:
+            self._bound_event_ids.discard(queued_cast.event_id)
+        return queued_cast
+
+    def pop_bindings_for_event(self, event_id: int) -> tuple[RangeWatch | None, Pursuit | None]:
+        """
+        Detaches everything bound to an event now that it is being processed.
+
+        Returns the event's range watch and pursuit, the bindings that still react to the event;
+        its wall contact, queued cast and channel binding are just dropped.
+        """
+        if event_id not in self._bound_event_ids:
+            return _NO_BINDINGS
+        self._bound_event_ids.remove(event_id)
+        self._movement_system.pop_wall_contact_for_event(event_id)
+        self._casting_system.pop_queued_cast_for_event(event_id)
+        self._casting_system.pop_channel_for_event(event_id)
+        return self._movement_system.pop_range_watch_for_event(event_id), self._movement_system.pop_pursuit_for_event(event_id)
+
+    def _bind_event(self, event_id: int) -> None:
+        if event_id != Consts.EMPTY_ID:
+            self._bound_event_ids.add(event_id)
+
     def is_valid_source(self, source_id: int) -> bool:
         return self._targeting_system.is_valid_source(source_id)
 
     def is_gcd_ready(self, source_id: int, spell_id: int, timestamp: int) -> bool:
         return self._casting_system.is_gcd_ready(source_id, spell_id, timestamp)
 
+    def is_cooldown_ready(self, source_id: int, spell_id: int, timestamp: int) -> bool:
+        return self._casting_system.is_cooldown_ready(source_id, spell_id, timestamp)
+
+    def get_next_ready_time(self, obj_id: int, current_timestamp: int, spell_ids: Iterable[int] | None = None) -> int:
+        return self._casting_system.get_next_ready_time(obj_id, current_timestamp, spell_ids)
+
     def is_valid_target(self, target_id: int) -> bool:
         return self._targeting_system.is_valid_target(target_id)
 
@@ -93,20 +244,53 @@ class StateHandler:
 
     def apply_event(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> None:
         self._casting_system.apply_casting_event(timestamp, source_id, spell_id)
-        self._health_system.apply_health_event(source_id, spell_id, target_id)
+        self._health_system.apply_health_event(timestamp, source_id, spell_id, target_id)
         self._movement_system.apply_movement_event(timestamp, source_id, spell_id, target_id)
-        self._targeting_system.apply_targeting_event(source_id, spell_id, target_id)
+        if self._targeting_system.apply_targeting_event(source_id, spell_id, target_id):
+            self._retarget_range_watches(source_id)
+        if self._casting_system.is_channeling(source_id) and not self._targeting_system.is_valid_source(source_id):
+            # Dying or despawning interrupts the channel the source was running
+            self._casting_system.interrupt_channel(source_id)
+
+    def _retarget_range_watches(self, source_id: int) -> None:
+        """The range watches of a source that switched targets resolve their target again, as a channel tick would."""
+        for watch in self._movement_system.get_range_watches_of_source(source_id):
+            target_id = self._targeting_system.decide_event_targeting(source_id, watch.spell_id, watch.target_id)
+            self._movement_system.retarget_range_watch(watch, target_id)
+
+    @property
+    def combat_meter(self) -> CombatMeter:
+        return self._health_system.combat_meter
+
+    def pop_health_changes(self) -> list[HealthChange]:
+        return self._health_system.pop_health_changes()
+
+    def flush_pending_health_events(self) -> None:
+        self._health_system.flush_pending_health_events()
+
+    def pop_crossed_hp_thresholds(self) -> list[tuple[int, int, int]]:
+        return self._health_system.pop_crossed_hp_thresholds()
+
+    def get_spawn_count(self, spell_id: int) -> int:
+        return self._targeting_system.get_spawn_count(spell_id)
 
-    def spawn_game_obj(self, timestamp: int, source_id: int, new_obj_id: int, spell_id: int, target_id: int) -> None:
-        self._movement_system.spawn_game_obj(timestamp, source_id, new_obj_id, spell_id)
-        self._casting_system.spawn_game_obj(timestamp, new_obj_id, spell_id)
-        self._health_system.spawn_game_obj(new_obj_id, spell_id)
-        self._targeting_system.spawn_game_obj(timestamp, source_id, new_obj_id, spell_id, target_id)
-        self._vfx_and_sfx_system.spawn_game_obj(new_obj_id, spell_id)
+    def spawn_game_objs(self, timestamp: int, source_id: int, new_obj_ids: list[int], spell_id: int, target_id: int) -> None:
+        """Spawns a block of objects, one system at a time, so each system resolves the spell once for the whole block."""
+        self._movement_system.spawn_game_objs(timestamp, source_id, new_obj_ids, spell_id)
+        slot = self.spell_table.slot_of(spell_id)
+        spawned_components = self.spell_table.spawned_components[slot] if slot != SpellTable.MISSING_SLOT else 0
+        if spawned_components & _CASTING_COMPONENT:
+            self._casting_system.spawn_game_objs(timestamp, new_obj_ids, spell_id)
+        if spawned_components & _HEALTH_COMPONENT:
+            self._health_system.spawn_game_objs(new_obj_ids, spell_id)
+        self._targeting_system.spawn_game_objs(timestamp, source_id, new_obj_ids, spell_id, target_id)
+        if self._vfx_and_sfx_system is not None:
+            self._vfx_and_sfx_system.spawn_game_objs(new_obj_ids, spell_id)
 
     def create_environment_obj(self, obj_id: int) -> None:
         self._casting_system.create_environment_obj(obj_id)
         self._health_system.create_environment_obj(obj_id)
         self._movement_system.create_environment_obj(obj_id)
         self._targeting_system.create_environment_obj(obj_id)
-        self._vfx_and_sfx_system.create_environment_obj(obj_id)
\ No newline at end of file
+        if self._vfx_and_sfx_system is not None:
+            self._vfx_and_sfx_system.create_environment_obj(obj_id)
\ No newline at end of file
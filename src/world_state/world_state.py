@@ -1,19 +1,38 @@
+from collections import deque
+from pathlib import Path
 from typing import Iterable
 
 from src.settings import Consts
-from .event_handler import EventHandler, IdGen
-from .state_handler import StateHandler, SpellVfxData, DisplayObj
+from .event_handler import EventHandler, FrameBudget, IdGen
+from .state_handler import StateHandler, Channel, CombatMeter, SpellConfigWatcher, SpellVfxData, DisplayObj, HealthChange, Pursuit, RangeWatch, WallContact
 
 
 class WorldState:
-    """ The entirely ECS-driven game state of the save file that is currently in use """
+    """
+    The entirely ECS-driven game state of the save file that is currently in use.
 
-    def __init__(self) -> None:
+    Headless world states (console simulations, batch runs, servers) skip every cosmetic system,
+    so they cannot be asked for display objects or spell visuals.
+    """
+
+    def __init__(self, headless: bool = False) -> None:
         self._game_obj_id_gen: IdGen = IdGen.create_preassigned_range(1, 10_000)
         self._event_handler: EventHandler = EventHandler()
-        self._state_handler: StateHandler = StateHandler()
+        self._state_handler: StateHandler = StateHandler(headless)
+        # Only the newest frame's changes are kept; the combat meter holds the totals of the whole fight
+        self._health_changes_frame_end: int = 0
+        self._health_changes_for_last_frame: list[HealthChange] = []
         self._create_environment_obj()
 
+    @property
+    def frame_budget(self) -> FrameBudget:
+        """Per-frame event counters, including how many due events the last frame had to carry over."""
+        return self._event_handler.frame_budget
+
+    def create_spell_config_watcher(self, config_dir: Path | None = None) -> SpellConfigWatcher:
+        """Watcher that hot-reloads edited spell config files into this world state."""
+        return SpellConfigWatcher(self._state_handler, config_dir)
+
     def view_display_objs(self, current_time: int) -> Iterable[DisplayObj]:
         for obj_id in self._state_handler.get_all_obj_ids():
             obj_vfx = self._state_handler.get_obj_visuals(obj_id)
@@ -22,18 +41,34 @@ class WorldState:
             x, y = self._state_handler.get_position(obj_id, current_time)
             yield DisplayObj(obj_id, (x, y), self._state_handler.get_size(obj_id), obj_vfx.color, obj_vfx.sprite_name)
 
+    @property
+    def is_headless(self) -> bool:
+        return self._state_handler.is_headless
+
     def get_spell_vfx_for_successful_events(self, timestamp: int) -> Iterable[SpellVfxData]:
+        assert not self.is_headless, "A headless world state has no spell visuals."
         for spell_id in self._event_handler.get_successful_spell_ids(timestamp):
             yield self._state_handler.get_spell_visuals(spell_id)
 
+    @property
+    def combat_meter(self) -> CombatMeter:
+        """Running damage and healing totals and rolling DPS/HPS per source, spell and target, over the whole fight."""
+        return self._state_handler.combat_meter
+
+    def view_health_changes(self, frame_timestamp: int) -> list[HealthChange]:
+        """Damage and healing dealt during the most recent frame, summed per timestamp, source, spell and target."""
+        if frame_timestamp != self._health_changes_frame_end:
+            return []
+        return self._health_changes_for_last_frame
+
     def process_setup_events(self, ingame_time: int, setup_spell_ids: list[int]) -> None:
         environment_id = self._state_handler.environment_id
         for spell_id in setup_spell_ids:
             self._event_handler.dispatch_upcoming_untargeted_event(ingame_time, environment_id, spell_id)
-        empty_list_of_player_inputs: list[str] = []
+        empty_list_of_player_inputs: list[int] = []
         self.process_frame(empty_list_of_player_inputs, ingame_time)
 
-    def process_frame(self, player_inputs: list[str], frame_end: int) -> None:
+    def process_frame(self, player_inputs: list[int], frame_end: int) -> None:
         """Execute state updates for current frame"""
         self._create_events_from_controls(player_inputs, frame_end)
         while self._event_handler.has_unprocessed_events(frame_end):
@@ -41,47 +76,194 @@ class WorldState:
             timestamp = self._event_handler.current_events_timestamp
             source_id = self._event_handler.current_events_source_id
             spell_id = self._event_handler.current_events_spell_id
-            undecided_target_id = self._event_handler.current_events_target_id
             assert timestamp <= frame_end, f"frame ends at {frame_end}, but event has timestamp {timestamp}."
 
-            finalized_target_id = self._state_handler.decide_event_targeting(source_id, spell_id, undecided_target_id)
-            event_is_valid = self._validate_event(timestamp, source_id, spell_id, finalized_target_id)
-            if event_is_valid:
-                new_obj_id = self._handle_spawn(timestamp, source_id, spell_id, finalized_target_id)
-                self._create_cascading_events(timestamp, new_obj_id, source_id, spell_id, finalized_target_id)
-                self._apply_event(timestamp, source_id, spell_id, finalized_target_id)
+            expansion = self._state_handler.get_trampoline_expansion(spell_id)
+            range_watch, pursuit = self._state_handler.pop_bindings_for_event(self._event_handler.current_events_id)
+            if expansion and self._state_handler.is_valid_source(source_id):
+                # A trampoline has no effect of its own, so the spells it would dispatch are processed in its place
+                self._event_handler.discard_current_event()
+                self._expand_trampoline(timestamp, source_id, spell_id)
+            else:
+                self._process_current_event(target_is_final=range_watch is not None)
+            if range_watch is not None and range_watch.is_active:
+                range_watch.last_fired_tick = timestamp
+                self._schedule_range_watch(range_watch, timestamp)
+            if pursuit is not None and pursuit.is_active:
+                # A successful arrival event replaces its pursuit, so the event must have failed
+                self._state_handler.stop_pursuit(pursuit.follower_id)
+            if not self._event_handler.has_due_events(timestamp):
+                # Every health event of this timestamp is in, so crossed hp thresholds react within the same timestamp.
+                # A frame that runs out of budget mid-timestamp leaves them pending until the timestamp is done.
+                self._dispatch_crossed_hp_thresholds()
+        self._health_changes_frame_end = frame_end
+        self._health_changes_for_last_frame = self._state_handler.pop_health_changes()
         self._event_handler.finalize_event_log_for_current_frame(frame_end)
 
-    def _create_cascading_events(self, timestamp: int, new_obj_id: int, source_id: int, spell_id: int, target_id: int) -> None:
+    def _expand_trampoline(self, timestamp: int, source_id: int, spell_id: int) -> None:
+        """
+        Processes the spells a trampoline chain dispatches, in the order the heap would have processed them.
+
+        Dispatched spells queue up behind every event that is already due at the timestamp. So a trampoline's
+        spells are only processed right away while nothing else is due, and are queued on the heap otherwise.
+        Once the frame budget is spent, the rest of the chain is deferred to the next frame, still ahead of
+        anything the processed part of the chain put on the heap.
+        """
+        pending_spell_ids = deque([spell_id])
+        while pending_spell_ids:
+            pending_spell_id = pending_spell_ids.popleft()
+            if not (self._state_handler.get_trampoline_expansion(pending_spell_id) and self._state_handler.is_valid_source(source_id)):
+                if self._event_handler.frame_budget.is_spent:
+                    self._event_handler.defer_immediate_events(timestamp, source_id, (pending_spell_id, *pending_spell_ids))
+                    return
+                self._event_handler.start_immediate_event(timestamp, source_id, pending_spell_id, source_id)
+                self._process_current_event()
+                continue
+            for _, dispatched_spell_ids in self._state_handler.get_ability_timeline(pending_spell_id):
+                if self._event_handler.has_due_events(timestamp):
+                    for dispatched_spell_id in dispatched_spell_ids:
+                        self._event_handler.dispatch_upcoming_targeted_event(timestamp, source_id, dispatched_spell_id, source_id)
+                else:
+                    pending_spell_ids.extend(dispatched_spell_ids)
+
+    def _process_current_event(self, target_is_final: bool = False) -> None:
+        timestamp = self._event_handler.current_events_timestamp
+        source_id = self._event_handler.current_events_source_id
+        spell_id = self._event_handler.current_events_spell_id
+        undecided_target_id = self._event_handler.current_events_target_id
+
+        if target_is_final:
+            # A range watch times its tick by the target it resolved, and resolves it again when its source switches targets
+            finalized_target_id = undecided_target_id
+        else:
+            finalized_target_id = self._state_handler.decide_event_targeting(source_id, spell_id, undecided_target_id)
+        event_is_valid = self._validate_event(timestamp, source_id, spell_id, finalized_target_id)
+        if event_is_valid:
+            new_obj_ids = self._handle_spawn(timestamp, source_id, spell_id, finalized_target_id)
+            self._create_cascading_events(timestamp, new_obj_ids, source_id, spell_id, finalized_target_id)
+            self._apply_event(timestamp, source_id, spell_id, finalized_target_id)
+        for channel in self._state_handler.pop_interrupted_channels():
+            self._retire_channel(channel)
+        for pursuit in self._state_handler.pop_rescheduled_pursuits():
+            self._schedule_pursuit_arrival(pursuit)
+        for wall_contact in self._state_handler.pop_rescheduled_wall_contacts():
+            self._schedule_wall_contact(wall_contact)
+        for range_watch in self._state_handler.pop_invalidated_range_watches():
+            self._schedule_range_watch(range_watch, timestamp)
+
+    def _create_cascading_events(self, timestamp: int, new_obj_ids: list[int], source_id: int, spell_id: int, target_id: int) -> None:
         timeline = self._state_handler.get_ability_timeline(spell_id)
-        if not timeline:
+        trigger_spell_id, trigger_interval, trigger_duration = self._state_handler.get_range_trigger(spell_id)
+        if not timeline and trigger_spell_id == Consts.EMPTY_ID:
             return
-        # Determine who casts the timeline events
-        if new_obj_id != Consts.EMPTY_ID:
-            timeline_source = new_obj_id
-        else:
-            timeline_source = source_id
-        # Determine targets
-        if self._state_handler.is_area_of_effect(spell_id):
-            timeline_targets = list(self._state_handler.select_targets_for_aoe(timeline_source, target_id))
-        else:
-            timeline_targets = [target_id]
-        # Dispatch
-        for trigger_timestamp, timeline_spell_ids in timeline.items():
-            for t_target in timeline_targets:
-                for t_spell in timeline_spell_ids:
-                    self._event_handler.dispatch_upcoming_targeted_event(
-                        timestamp + trigger_timestamp, timeline_source, t_spell, t_target
-                    )
-
-    def _create_events_from_controls(self, player_inputs: list[str], timestamp: int) -> None:
+        # Spawned objects cast the timeline events themselves, so a batch spawn runs the timeline once per object
+        timeline_sources = new_obj_ids or [source_id]
+        is_channel = self._state_handler.has_channel_start(spell_id)
+        for timeline_source in timeline_sources:
+            # Everything a channel schedules is tracked on the object running the timeline, so interrupting it can retire it
+            channel = self._state_handler.start_channel(timeline_source, spell_id) if is_channel else None
+            if trigger_spell_id != Consts.EMPTY_ID:
+                trigger_target_id = self._state_handler.decide_event_targeting(timeline_source, trigger_spell_id, target_id)
+                range_watch = self._state_handler.start_range_watch(
+                    timeline_source, trigger_target_id, trigger_spell_id, timestamp, trigger_interval, trigger_duration
+                )
+                if channel is not None:
+                    self._state_handler.add_channel_range_watch(channel, range_watch)
+                self._schedule_range_watch(range_watch, timestamp)
+            if not timeline:
+                continue
+            # Determine targets
+            if self._state_handler.is_area_of_effect(spell_id):
+                timeline_targets = list(self._state_handler.select_targets_for_aoe(timeline_source, target_id))
+            else:
+                timeline_targets = [target_id]
+            # Dispatch
+            for trigger_timestamp, timeline_spell_ids in timeline:
+                for t_target in timeline_targets:
+                    for t_spell in timeline_spell_ids:
+                        event_id = self._event_handler.dispatch_upcoming_targeted_event(
+                            timestamp + trigger_timestamp, timeline_source, t_spell, t_target
+                        )
+                        if channel is not None:
+                            self._state_handler.bind_channel_event(channel, event_id)
+
+    def _retire_channel(self, channel: Channel) -> None:
+        """Cancels every upcoming event of an interrupted channel at once, including those of its range watches."""
+        event_ids = list(channel.event_ids)
+        for range_watch in channel.range_watches:
+            if range_watch.event_id != Consts.EMPTY_ID:
+                event_ids.append(range_watch.event_id)
+            self._state_handler.stop_range_watch(range_watch)
+        self._event_handler.cancel_upcoming_events(event_ids)
+
+    def _dispatch_crossed_hp_thresholds(self) -> None:
+        self._state_handler.flush_pending_health_events()
+        for timestamp, obj_id, spell_id in self._state_handler.pop_crossed_hp_thresholds():
+            self._event_handler.dispatch_upcoming_targeted_event(timestamp, obj_id, spell_id, obj_id)
+
+    def _schedule_range_watch(self, range_watch: RangeWatch, current_time: int) -> None:
+        """(Re)schedules the event for the next tick where the watched target is within range."""
+        if range_watch.event_id != Consts.EMPTY_ID:
+            self._event_handler.cancel_upcoming_event(range_watch.event_id)
+            self._state_handler.bind_range_watch_event(range_watch, Consts.EMPTY_ID)
+        source_id, target_id = range_watch.source_id, range_watch.target_id
+        target_is_valid = self._state_handler.is_valid_target(target_id) or source_id == target_id
+        if not self._state_handler.is_valid_source(source_id) or not target_is_valid or current_time >= range_watch.end:
+            self._state_handler.stop_range_watch(range_watch)
+            return
+        earliest_time = max(current_time, range_watch.last_fired_tick + 1)
+        tick = self._state_handler.find_next_range_tick(range_watch, earliest_time)
+        # Without a tick in range, the watch stays idle until the source or target changes velocity
+        if tick is not None:
+            event_id = self._event_handler.dispatch_upcoming_targeted_event(tick, source_id, range_watch.spell_id, target_id)
+            self._state_handler.bind_range_watch_event(range_watch, event_id)
+
+    def _schedule_pursuit_arrival(self, pursuit: Pursuit) -> None:
+        """(Re)schedules the event at which a pursuit catches up with its target."""
+        if pursuit.event_id != Consts.EMPTY_ID:
+            self._event_handler.cancel_upcoming_event(pursuit.event_id)
+            self._state_handler.bind_pursuit_event(pursuit, Consts.EMPTY_ID)
+        if not pursuit.is_active or pursuit.arrival_time is None:
+            return
+        follower_id, target_id = pursuit.follower_id, pursuit.target_id
+        if not self._state_handler.is_valid_source(follower_id) or not self._state_handler.is_valid_target(target_id):
+            self._state_handler.stop_pursuit(follower_id)
+            return
+        # Arriving re-applies the pursuit's spell, which re-solves it from the caught-up position
+        event_id = self._event_handler.dispatch_upcoming_targeted_event(pursuit.arrival_time, follower_id, pursuit.spell_id, target_id)
+        self._state_handler.bind_pursuit_event(pursuit, event_id)
+
+    def _schedule_wall_contact(self, wall_contact: WallContact) -> None:
+        """(Re)schedules the event that stops a clamped object at the play-area bound it is heading for."""
+        if wall_contact.event_id != Consts.EMPTY_ID:
+            self._event_handler.cancel_upcoming_event(wall_contact.event_id)
+            self._state_handler.bind_wall_contact_event(wall_contact, Consts.EMPTY_ID)
+        if wall_contact.contact_time is None:
+            return
+        obj_id = wall_contact.obj_id
+        event_id = self._event_handler.dispatch_upcoming_targeted_event(wall_contact.contact_time, obj_id, Consts.WALL_CONTACT_SPELL_ID, obj_id)
+        self._state_handler.bind_wall_contact_event(wall_contact, event_id)
+
+    def _create_events_from_controls(self, player_inputs: list[int], timestamp: int) -> None:
         source_id = self._state_handler.player_id
         if not player_inputs or source_id == Consts.EMPTY_ID:
             return
         target_id = self._state_handler.get_current_target_for_obj(self._state_handler.player_id)
         spell_ids = self._state_handler.get_spell_ids_for_inputs(source_id, player_inputs)
         for spell_id in spell_ids:
-            self._event_handler.dispatch_upcoming_targeted_event(timestamp, source_id, spell_id, target_id)
+            cast_time = self._state_handler.get_cast_time(source_id, spell_id, timestamp)
+            if cast_time == timestamp:
+                self._event_handler.dispatch_upcoming_targeted_event(timestamp, source_id, spell_id, target_id)
+            else:
+                self._queue_cast(source_id, spell_id, target_id, cast_time)
+
+    def _queue_cast(self, source_id: int, spell_id: int, target_id: int, cast_time: int) -> None:
+        """Schedules an early input for the ms its GCD is ready, replacing the cast the source queued before."""
+        replaced_cast = self._state_handler.pop_queued_cast(source_id)
+        if replaced_cast is not None:
+            self._event_handler.cancel_upcoming_event(replaced_cast.event_id)
+        event_id = self._event_handler.dispatch_upcoming_targeted_event(cast_time, source_id, spell_id, target_id)
+        self._state_handler.queue_cast(source_id, spell_id, cast_time, event_id)
 
     def _validate_event(self, timestamp: int, source_id: int, spell_id: int, finalized_target_id: int) -> bool:
         if not self._state_handler.is_valid_source(source_id):
@@ -103,12 +285,13 @@ class WorldState:
     def _apply_event(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> None:
         self._state_handler.apply_event(timestamp, source_id, spell_id, target_id)
 
-    def _handle_spawn(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> int:
-        new_obj_id = Consts.EMPTY_ID
-        if self._state_handler.is_obj_spawn(spell_id):
-            new_obj_id = self._game_obj_id_gen.generate_new_id()
-            self._state_handler.spawn_game_obj(timestamp, source_id, new_obj_id, spell_id, target_id)
-        return new_obj_id
+    def _handle_spawn(self, timestamp: int, source_id: int, spell_id: int, target_id: int) -> list[int]:
+        """Spawns the spell's objects from one block of ids; no ids for spells that spawn nothing."""
+        if not self._state_handler.is_obj_spawn(spell_id):
+            return []
+        new_obj_ids = self._game_obj_id_gen.generate_new_id_block(self._state_handler.get_spawn_count(spell_id))
+        self._state_handler.spawn_game_objs(timestamp, source_id, new_obj_ids, spell_id, target_id)
+        return new_obj_ids
 
     def _create_environment_obj(self) -> None:
         obj_id = self._game_obj_id_gen.generate_new_id()
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from src.world_state.state_handler import SpellConfigLoader
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_cache_home(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Keeps compiled spell table caches out of the developer's home directory for the whole session.
+
+    Session-scoped fixtures, such as the one that starts the snapshot worker pool, are set up before any
+    function-scoped monkeypatch. XDG_CACHE_HOME is set as well, so workers that re-import the loader
+    instead of forking resolve the same directory.
+    """
+    cache_home = tmp_path_factory.mktemp("cache_home")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+        monkeypatch.setattr(SpellConfigLoader, "CACHE_DIR", cache_home / "dead_mmo" / "spell_tables")
+        yield cache_home
+
+
+@pytest.fixture(autouse=True)
+def spell_table_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Gives every test its own spell table cache, so tests that count cached tables start from an empty one."""
+    cache_dir = tmp_path / "spell_tables"
+    monkeypatch.setattr(SpellConfigLoader, "CACHE_DIR", cache_dir)
+    return cache_dir
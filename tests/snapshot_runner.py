@@ -0,0 +1,161 @@
+import contextlib
+import glob
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from src.settings import LevelSetupConsts
+from tests.sim_validation import SimValidation
+
+
+@dataclass(slots=True)
+class SnapshotScenario:
+    """A level setup that is simulated with the scripted test input and validated against its golden master."""
+    name: str
+    setup_spell_ids: list[int]
+    scripted_player_input: dict[int, list[int]]
+
+    @property
+    def snapshot_name(self) -> str:
+        return str(self.setup_spell_ids)
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    scenario_name: str
+    snapshot_name: str
+    passed: bool
+    duration_s: float
+    output: str
+    error: str = ""
+
+
+class SnapshotRunner:
+    """
+    Validates every scenario against its golden master, one scenario per worker process.
+
+    Scenarios are discovered from the `*_SETUP_SPELL_IDS` attributes of LevelSetupConsts. Each worker
+    captures the console output of its simulation, so the combined report stays readable.
+    """
+    SCENARIO_SUFFIX = "_SETUP_SPELL_IDS"
+
+    @staticmethod
+    def discover_scenarios() -> list[SnapshotScenario]:
+        scenarios: dict[str, SnapshotScenario] = {}
+        for attr_name, value in vars(LevelSetupConsts).items():
+            if not attr_name.endswith(SnapshotRunner.SCENARIO_SUFFIX):
+                continue
+            scenario = SnapshotScenario(
+                name=attr_name.removesuffix(SnapshotRunner.SCENARIO_SUFFIX),
+                setup_spell_ids=list(value),
+                scripted_player_input=LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING,
+            )
+            # Scenarios with identical setup ids share a golden master, so one run covers both
+            scenarios.setdefault(scenario.snapshot_name, scenario)
+        return list(scenarios.values())
+
+    @staticmethod
+    def find_orphan_goldens(scenarios: list[SnapshotScenario]) -> list[str]:
+        """Golden master files that no discovered scenario validates against."""
+        expected_paths = {
+            os.path.normpath(path)
+            for scenario in scenarios
+            for path in (SimValidation._snapshot_path(scenario.snapshot_name), SimValidation._legacy_snapshot_path(scenario.snapshot_name))
+        }
+        golden_paths = glob.glob(os.path.join(glob.escape(SimValidation.SNAPSHOT_DIR), "*.json*"))
+        return sorted(path for path in golden_paths if os.path.normpath(path) not in expected_paths)
+
+    @staticmethod
+    def run_scenarios(scenarios: list[SnapshotScenario], max_workers: int | None = None, create_missing_goldens: bool = False) -> list[ScenarioResult]:
+        """Missing golden masters fail their scenario unless `create_missing_goldens` is set, as it is for the console run."""
+        if not scenarios:
+            return []
+        if max_workers is None:
+            max_workers = min(len(scenarios), os.cpu_count() or 1)
+        if max_workers <= 1:
+            return [SnapshotRunner.run_scenario(scenario, create_missing_goldens) for scenario in scenarios]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(SnapshotRunner.run_scenario, scenarios, itertools.repeat(create_missing_goldens)))
+
+    @staticmethod
+    def run_scenario(scenario: SnapshotScenario, create_missing_golden: bool = False) -> ScenarioResult:
+        output = io.StringIO()
+        error = ""
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            try:
+                SimValidation.simulate_game_in_console(scenario.setup_spell_ids, scenario.scripted_player_input, create_missing_golden=create_missing_golden)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        return ScenarioResult(
+            scenario_name=scenario.name,
+            snapshot_name=scenario.snapshot_name,
+            passed=not error,
+            duration_s=time.perf_counter() - start,
+            output=output.getvalue(),
+            error=error,
+        )
+
+    @staticmethod
+    def run_all_scenarios(max_workers: int | None = None) -> list[ScenarioResult]:
+        """Runs every discovered scenario, creating missing golden masters, prints the combined report and raises if any scenario failed."""
+        scenarios = SnapshotRunner.discover_scenarios()
+        start = time.perf_counter()
+        results = SnapshotRunner.run_scenarios(scenarios, max_workers, create_missing_goldens=True)
+        SnapshotRunner.print_report(results, SnapshotRunner.find_orphan_goldens(scenarios), time.perf_counter() - start)
+        failed = [result.scenario_name for result in results if not result.passed]
+        if failed:
+            raise AssertionError(f"Snapshot scenarios failed: {failed}. See report above.")
+        return results
+
+    @staticmethod
+    def update_golden_masters(allow_event_changes: bool = False) -> list[str]:
+        """
+        Re-records the golden master of every scenario, printing how each differs from the one it replaces.
+
+        A golden master is only replaced when its events are unchanged, so a change that should only alter
+        what is recorded about the entities cannot change the simulation unnoticed. Pass `allow_event_changes`
+        when the simulation is meant to behave differently. Returns the paths of the replaced golden masters.
+        """
+        updated_paths = []
+        for scenario in SnapshotRunner.discover_scenarios():
+            golden_path = SimValidation._snapshot_path(scenario.snapshot_name)
+            candidate_path = f"{golden_path}.new"
+            SimValidation.record_golden_master(scenario.setup_spell_ids, scenario.scripted_player_input, candidate_path)
+            diffs = SimValidation.diff_golden_masters(golden_path, candidate_path) if os.path.exists(golden_path) else []
+            print(f"\n[Snapshot] {scenario.name} {scenario.snapshot_name}: {len(diffs)} differences from '{golden_path}'")
+            for line in SimValidation.summarize_diffs(diffs):
+                print(f"[Snapshot]   {line}")
+            if not allow_event_changes and any(SnapshotRunner._is_event_diff(diff) for diff in diffs):
+                os.remove(candidate_path)
+                print(f"[Snapshot] ✗ Events changed, so '{golden_path}' was kept. Pass allow_event_changes to replace it.")
+                continue
+            os.replace(candidate_path, golden_path)
+            updated_paths.append(golden_path)
+        return updated_paths
+
+    @staticmethod
+    def _is_event_diff(diff: str) -> bool:
+        # Every difference in recorded entity state names the entity; everything else is an event or a whole frame
+        return "[Entity " not in diff
+
+    @staticmethod
+    def print_report(results: list[ScenarioResult], orphan_goldens: list[str], wall_time_s: float) -> None:
+        for result in results:
+            if not result.passed:
+                print(f"\n[Snapshot] ---- Output of failed scenario {result.scenario_name} {result.snapshot_name} ----")
+                print(result.output.rstrip())
+        print(f"\n[Snapshot] {'Scenario':<12} {'Golden':<12} {'Result':<8} {'Time':>8}")
+        for result in results:
+            status = "PASS" if result.passed else "FAIL"
+            print(f"[Snapshot] {result.scenario_name:<12} {result.snapshot_name:<12} {status:<8} {result.duration_s:>7.2f}s")
+            if result.error:
+                print(f"[Snapshot]     {result.error}")
+        passed = sum(result.passed for result in results)
+        cpu_time_s = sum(result.duration_s for result in results)
+        print(f"[Snapshot] {passed}/{len(results)} passed in {wall_time_s:.2f}s ({cpu_time_s:.2f}s summed over scenarios)")
+        for path in orphan_goldens:
+            print(f"[Snapshot] ⚠ Golden master '{path}' is not validated by any scenario.")
@@ -0,0 +1,47 @@
+import math
+
+from src.world_state.event_handler import IdGen
+from src.world_state.state_handler import EventBudgetAnalyzer
+from src.world_state.state_handler._movement_system import MovementSystem
+from src.world_state.state_handler._spell_data import SpawnPattern, SpellData, TargetingSpellFlags
+from src.world_state.state_handler._spell_table import SpellTable
+
+RING_SPAWN_SPELL_ID = 1
+ROW_SPAWN_SPELL_ID = 2
+TICK_SPELL_ID = 3
+ENVIRONMENT_ID = 1
+
+
+def _spell_table() -> SpellTable:
+    return SpellTable.compile([
+        SpellData(
+            spell_id=RING_SPAWN_SPELL_ID, targeting_behavior=TargetingSpellFlags.SPAWN_OBJ, timeline={0: [TICK_SPELL_ID], 100: [TICK_SPELL_ID]},
+            spawned_x_offset=0.5, spawned_y_offset=0.5, spawn_count=8, spawn_pattern=SpawnPattern.RING, spawn_spacing=0.1,
+        ),
+        SpellData(spell_id=ROW_SPAWN_SPELL_ID, targeting_behavior=TargetingSpellFlags.SPAWN_OBJ, spawn_count=3, spawn_pattern=SpawnPattern.ROW, spawn_spacing=0.2),
+        SpellData(spell_id=TICK_SPELL_ID),
+    ])
+
+
+def test_batch_is_spawned_on_its_pattern_from_one_id_block() -> None:
+    spell_table = _spell_table()
+    id_gen = IdGen.create_preassigned_range(1, 100)
+    assert id_gen.generate_new_id() == ENVIRONMENT_ID
+    movement_system = MovementSystem(spell_table)
+    movement_system.create_environment_obj(ENVIRONMENT_ID)
+
+    ring_ids = id_gen.generate_new_id_block(8)
+    row_ids = id_gen.generate_new_id_block(3)
+    assert ring_ids == list(range(2, 10)) and row_ids == [10, 11, 12]
+    movement_system.spawn_game_objs(0, ENVIRONMENT_ID, ring_ids, RING_SPAWN_SPELL_ID)
+    movement_system.spawn_game_objs(0, ENVIRONMENT_ID, row_ids, ROW_SPAWN_SPELL_ID)
+    for obj_id in ring_ids:
+        x, y = movement_system.get_position(obj_id, 0)
+        assert math.isclose(math.hypot(x - 0.5, y - 0.5), 0.1)
+    assert [movement_system.get_position(obj_id, 0) for obj_id in row_ids] == [(-0.2, 0.0), (0.0, 0.0), (0.2, 0.0)]
+
+
+def test_budget_counts_the_timeline_of_every_spawned_object() -> None:
+    budget = next(budget for budget in EventBudgetAnalyzer(_spell_table()).analyze().budgets if budget.spell_id == RING_SPAWN_SPELL_ID)
+    assert budget.total_events == 1 + 8 * 2
+    assert budget.peak_events_per_timestamp == 1 + 8
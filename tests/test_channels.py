@@ -0,0 +1,84 @@
+from src.settings import Consts, LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.event_handler._combat_event import CombatEvent
+from src.world_state.event_handler._frame_heap import FrameHeap
+from src.world_state.state_handler import SpellConfigLoader
+from src.world_state.state_handler._casting_system import CastingSystem, ObjCastingData
+from src.world_state.state_handler._spell_data import CastingSpellFlags, SpellData, TargetingSpellFlags, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+CHANNEL_SPELL_ID = 10
+STOP_SPELL_ID = 20
+OBJ_ID = 1
+BRAVO_CHANNEL_SPELL_ID = 941
+BRAVO_CHANNEL_TICK_SPELL_ID = 911
+SPAWN_CHANNEL_SPELL_ID = 9101
+SPAWN_CHANNEL_TICK_SPELL_ID = 9102
+
+
+def test_stop_spell_interrupts_the_channel_with_its_unprocessed_events() -> None:
+    casting_system = CastingSystem(SpellTable.compile([
+        SpellData(spell_id=CHANNEL_SPELL_ID, casting_behavior=CastingSpellFlags.START_CHANNEL),
+        SpellData(spell_id=STOP_SPELL_ID, casting_behavior=CastingSpellFlags.STOP_CHANNEL),
+    ]))
+    casting_system.game_obj_data_dct[OBJ_ID] = ObjCastingData()
+    channel = casting_system.start_channel(OBJ_ID, CHANNEL_SPELL_ID)
+    for event_id in (1, 2, 3):
+        casting_system.bind_channel_event(channel, event_id)
+    assert casting_system.pop_channel_for_event(1) is channel
+    assert casting_system.pop_interrupted_channels() == []
+
+    casting_system.apply_casting_event(100, OBJ_ID, STOP_SPELL_ID)
+    assert casting_system.pop_interrupted_channels() == [channel]
+    assert channel.event_ids == {2, 3}
+    assert not casting_system.is_channeling(OBJ_ID) and casting_system.pop_channel_for_event(2) is None
+
+
+def test_mostly_cancelled_heap_is_compacted() -> None:
+    event_heap = FrameHeap.create_heap_from_list_of_events([CombatEvent(event_id, 100 * event_id) for event_id in range(1, 11)])
+    event_heap.cancel_events(range(2, 10))
+    assert len(event_heap._event_heap) == 2 and not event_heap._cancelled_event_ids
+    assert [event_heap.pop_next_event().event_id for _ in range(2)] == [1, 10]
+
+
+def test_death_retires_the_remaining_channel_ticks() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.BRAVO_SETUP_SPELL_IDS)
+    channel_ticks = []
+    for ingame_time in range(20, 4000, 20):
+        world_state.process_frame([], ingame_time)
+        for event in world_state._event_handler._event_log_for_each_frame[ingame_time].view_all_events:
+            if event.spell_id == BRAVO_CHANNEL_SPELL_ID:
+                # Kill the channeler right after its first tick
+                world_state._event_handler.dispatch_upcoming_targeted_event(event.timestamp + 400, event.source_id, Consts.DEATH_SPELL_ID, event.source_id)
+            elif event.spell_id == BRAVO_CHANNEL_TICK_SPELL_ID:
+                channel_ticks.append(event.timestamp)
+    assert len(channel_ticks) == 1
+    # The retired ticks are no longer looked up as bound
+    event_heap = world_state._event_handler._event_heap
+    scheduled_event_ids = {event_id for _, event_id, _ in event_heap._event_heap} - event_heap._cancelled_event_ids
+    assert world_state._state_handler._bound_event_ids <= scheduled_event_ids
+
+
+def test_spawn_spell_channels_on_the_spawned_objects_and_not_the_caster() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(
+            spell_id=SPAWN_CHANNEL_SPELL_ID, casting_behavior=CastingSpellFlags.START_CHANNEL, targeting_behavior=TargetingSpellFlags.SPAWN_OBJ,
+            targeting=TargetingSpellMode.SELF, timeline={100: [SPAWN_CHANNEL_TICK_SPELL_ID], 200: [SPAWN_CHANNEL_TICK_SPELL_ID]}, spawn_count=2,
+        ),
+        SpellData(spell_id=SPAWN_CHANNEL_TICK_SPELL_ID, targeting=TargetingSpellMode.SELF),
+    ]))
+    casting_system = state_handler._casting_system
+    player_id = state_handler.player_id
+    caster_channel = state_handler.start_channel(player_id, BRAVO_CHANNEL_SPELL_ID)
+
+    world_state._event_handler.dispatch_upcoming_targeted_event(20, player_id, SPAWN_CHANNEL_SPELL_ID, player_id)
+    world_state.process_frame([], 20)
+
+    assert casting_system._channels[player_id] is caster_channel
+    spawned_channels = [channel for channel in casting_system._channels.values() if channel.spell_id == SPAWN_CHANNEL_SPELL_ID]
+    assert len(spawned_channels) == 2
+    assert all(channel.obj_id != player_id and len(channel.event_ids) == 2 for channel in spawned_channels)
@@ -0,0 +1,47 @@
+import math
+
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler._combat_meter import CombatMeter, HealthChange
+
+SOURCE_ID = 1
+TARGET_ID = 2
+BOLT_SPELL_ID = 10
+DOT_SPELL_ID = 11
+
+
+def test_rolling_dps_drops_hits_older_than_the_window() -> None:
+    combat_meter = CombatMeter(window_ms=1000)
+    combat_meter.record(HealthChange(0, SOURCE_ID, BOLT_SPELL_ID, TARGET_ID, damage=100.0))
+    combat_meter.record(HealthChange(500, SOURCE_ID, DOT_SPELL_ID, TARGET_ID, damage=20.0))
+    combat_meter.record(HealthChange(500, SOURCE_ID, DOT_SPELL_ID, TARGET_ID, healing=5.0))
+    assert combat_meter.get_dps(SOURCE_ID, 999) == 120.0
+    assert combat_meter.get_dps(SOURCE_ID, 1000) == 20.0
+    assert combat_meter.get_hps(SOURCE_ID, 1000) == 5.0
+    assert combat_meter.get_damage_taken_per_second(TARGET_ID, 1500) == 0.0
+
+    breakdown = combat_meter.get_spell_breakdown(SOURCE_ID)
+    assert [(spell_id, entry.total_damage, entry.total_healing) for spell_id, entry in breakdown] == [
+        (BOLT_SPELL_ID, 100.0, 0.0),
+        (DOT_SPELL_ID, 20.0, 5.0),
+    ]
+    assert combat_meter.by_source[SOURCE_ID].total_damage == 120.0
+
+
+def test_meter_totals_match_the_health_change_log() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    health_changes = []
+    for ingame_time in range(20, 10_001, 20):
+        world_state.process_frame(LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING.get(ingame_time, []), ingame_time)
+        health_changes.extend(world_state.view_health_changes(ingame_time))
+
+    combat_meter = world_state.combat_meter
+    assert health_changes
+    # The world state only keeps the newest frame, so the meter is the one record of the whole fight
+    assert sum(len(world_state.view_health_changes(ingame_time)) for ingame_time in range(20, 10_001, 20)) < len(health_changes)
+    for source_id, entry in combat_meter.by_source.items():
+        logged_damage = sum(change.damage for change in health_changes if change.source_id == source_id)
+        assert math.isclose(entry.total_damage, logged_damage)
+        spell_damage = sum(spell_entry.total_damage for _, spell_entry in combat_meter.get_spell_breakdown(source_id))
+        assert math.isclose(spell_damage, logged_damage)
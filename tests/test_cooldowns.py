@@ -0,0 +1,60 @@
+from src.settings import Consts
+from src.world_state.state_handler._casting_system import CastingSystem, ObjCastingData
+from src.world_state.state_handler._spell_data import CastingSpellFlags, SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+GCD_SPELL_ID = 10
+COOLDOWN_SPELL_ID = 20
+OFF_GCD_COOLDOWN_SPELL_ID = 30
+NEW_COOLDOWN_SPELL_ID = 5
+OBJ_ID = 1
+
+
+def _spells() -> list[SpellData]:
+    return [
+        SpellData(spell_id=GCD_SPELL_ID, casting_behavior=CastingSpellFlags.TRIGGER_GCD),
+        SpellData(spell_id=COOLDOWN_SPELL_ID, casting_behavior=CastingSpellFlags.TRIGGER_GCD | CastingSpellFlags.TRIGGER_COOLDOWN, base_cooldown=5000.0),
+        SpellData(spell_id=OFF_GCD_COOLDOWN_SPELL_ID, casting_behavior=CastingSpellFlags.TRIGGER_COOLDOWN, base_cooldown=300.0),
+    ]
+
+
+def _casting_system() -> CastingSystem:
+    casting_system = CastingSystem(SpellTable.compile(_spells()))
+    casting_system.game_obj_data_dct[OBJ_ID] = ObjCastingData(gcd_mod=1.5)
+    for input_code, spell_id in enumerate((GCD_SPELL_ID, COOLDOWN_SPELL_ID, OFF_GCD_COOLDOWN_SPELL_ID), start=1):
+        casting_system.rebind_input(OBJ_ID, input_code, spell_id)
+    return casting_system
+
+
+def test_ready_times_follow_gcd_and_cooldowns() -> None:
+    casting_system = _casting_system()
+    assert casting_system.get_next_ready_time(OBJ_ID, 0) == 0
+    casting_system.apply_casting_event(100, OBJ_ID, COOLDOWN_SPELL_ID)
+    gcd_ready_at = 100 + int(Consts.BASE_GCD * 1.5)
+    assert not casting_system.is_gcd_ready(OBJ_ID, GCD_SPELL_ID, gcd_ready_at - 1)
+    assert casting_system.is_gcd_ready(OBJ_ID, GCD_SPELL_ID, gcd_ready_at)
+    assert casting_system.is_gcd_ready(OBJ_ID, OFF_GCD_COOLDOWN_SPELL_ID, 100)
+    assert not casting_system.is_cooldown_ready(OBJ_ID, COOLDOWN_SPELL_ID, 5099)
+    assert casting_system.is_cooldown_ready(OBJ_ID, COOLDOWN_SPELL_ID, 5100)
+    assert casting_system.get_ready_time(OBJ_ID, COOLDOWN_SPELL_ID) == 5100
+
+    # The off-GCD spell is castable right away, everything else waits for the GCD
+    assert casting_system.get_next_ready_time(OBJ_ID, 200) == 200
+    casting_system.apply_casting_event(200, OBJ_ID, OFF_GCD_COOLDOWN_SPELL_ID)
+    assert casting_system.get_next_ready_time(OBJ_ID, 200) == 500
+    assert casting_system.get_next_ready_time(OBJ_ID, 200, [GCD_SPELL_ID, COOLDOWN_SPELL_ID]) == gcd_ready_at
+
+
+def test_running_cooldowns_survive_shifted_cooldown_slots() -> None:
+    casting_system = _casting_system()
+    casting_system.apply_casting_event(0, OBJ_ID, COOLDOWN_SPELL_ID)
+    casting_system.apply_casting_event(0, OBJ_ID, OFF_GCD_COOLDOWN_SPELL_ID)
+    spell_table = SpellTable.compile(_spells() + [
+        SpellData(spell_id=NEW_COOLDOWN_SPELL_ID, casting_behavior=CastingSpellFlags.TRIGGER_COOLDOWN, base_cooldown=100.0),
+    ])
+    diff = casting_system.spell_table.diff(spell_table)
+    assert diff.added == {NEW_COOLDOWN_SPELL_ID} and not diff.changed
+    casting_system.patch_spell_table(spell_table, diff)
+    assert casting_system.get_ready_time(OBJ_ID, COOLDOWN_SPELL_ID) == 5000
+    assert casting_system.get_ready_time(OBJ_ID, OFF_GCD_COOLDOWN_SPELL_ID) == 300
+    assert casting_system.is_cooldown_ready(OBJ_ID, NEW_COOLDOWN_SPELL_ID, 0)
@@ -0,0 +1,39 @@
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from tests.sim_validation import SimValidation
+
+FRAME_DURATION_MS = 20
+SIMULATION_DURATION_MS = 10000
+DRAIN_DURATION_MS = 60  # Input-free frames at the end, so the throttled run can catch up
+
+
+def _simulate_with_budget(events_per_frame: int) -> tuple[WorldState, list[int]]:
+    world_state = WorldState(headless=True)
+    world_state.frame_budget.events_per_frame = events_per_frame
+    world_state.process_setup_events(0, LevelSetupConsts.BRAVO_SETUP_SPELL_IDS)
+    carried_over_per_frame = [world_state.frame_budget.carried_over_events]
+    for ingame_time in range(FRAME_DURATION_MS, SIMULATION_DURATION_MS + DRAIN_DURATION_MS + 1, FRAME_DURATION_MS):
+        player_inputs = [
+            player_input
+            for timestamp, inputs in LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING.items()
+            if ingame_time - FRAME_DURATION_MS < timestamp <= ingame_time
+            for player_input in inputs
+        ]
+        world_state.process_frame(player_inputs, ingame_time)
+        carried_over_per_frame.append(world_state.frame_budget.carried_over_events)
+    return world_state, carried_over_per_frame
+
+
+def _entity_states(world_state: WorldState) -> dict[int, dict]:
+    return {obj_id: SimValidation._serialize_ecs_entity(world_state, obj_id) for obj_id in SimValidation._all_obj_ids(world_state)}
+
+
+def test_overflowing_events_carry_over_without_changing_the_outcome() -> None:
+    unbounded_state, unbounded_carry_over = _simulate_with_budget(events_per_frame=10_000)
+    throttled_state, throttled_carry_over = _simulate_with_budget(events_per_frame=5)
+    assert not any(unbounded_carry_over)
+    assert any(throttled_carry_over)
+    assert throttled_carry_over[-1] == 0
+    assert throttled_state.frame_budget.overflowing_frames == sum(1 for carried_over in throttled_carry_over if carried_over)
+    assert throttled_state.frame_budget.total_events == unbounded_state.frame_budget.total_events
+    assert _entity_states(throttled_state) == _entity_states(unbounded_state)
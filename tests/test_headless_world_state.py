@@ -0,0 +1,21 @@
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from tests.sim_validation import SimValidation
+
+
+def _simulate(headless: bool) -> WorldState:
+    world_state = WorldState(headless=headless)
+    world_state.process_setup_events(0, LevelSetupConsts.BRAVO_SETUP_SPELL_IDS)
+    for ingame_time in range(20, 5001, 20):
+        player_inputs = LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING.get(ingame_time, [])
+        world_state.process_frame(player_inputs, ingame_time)
+    return world_state
+
+
+def test_headless_world_state_skips_cosmetics_without_changing_gameplay() -> None:
+    rendered_state = _simulate(headless=False)
+    headless_state = _simulate(headless=True)
+    assert headless_state.is_headless and not rendered_state.is_headless
+    assert headless_state._state_handler._vfx_and_sfx_system is None
+    assert [SimValidation._serialize_ecs_entity(headless_state, obj_id) for obj_id in SimValidation._all_obj_ids(headless_state)] == \
+        [SimValidation._serialize_ecs_entity(rendered_state, obj_id) for obj_id in SimValidation._all_obj_ids(rendered_state)]
@@ -0,0 +1,53 @@
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler._health_system import HealthChange, HealthSystem, ObjHealthData
+from src.world_state.state_handler._spell_data import HealthSpellFlags, SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+DAMAGE_SPELL_ID = 1
+HEAL_SPELL_ID = 2
+TARGET_ID = 1
+DAMAGE_SOURCE_ID = 2
+HEAL_SOURCE_ID = 3
+
+
+def _health_system() -> HealthSystem:
+    health_system = HealthSystem(SpellTable.compile([
+        SpellData(spell_id=DAMAGE_SPELL_ID, health_behavior=HealthSpellFlags.DAMAGING, power=10.0),
+        SpellData(spell_id=HEAL_SPELL_ID, health_behavior=HealthSpellFlags.HEALING, power=4.0),
+    ]))
+    for obj_id in (TARGET_ID, DAMAGE_SOURCE_ID, HEAL_SOURCE_ID):
+        health_system.game_obj_data_dct[obj_id] = ObjHealthData(hp=100.0, max_hp=100.0)
+    return health_system
+
+
+def test_same_timestamp_events_are_applied_once_with_attribution() -> None:
+    health_system = _health_system()
+    for _ in range(3):
+        health_system.apply_health_event(100, DAMAGE_SOURCE_ID, DAMAGE_SPELL_ID, TARGET_ID)
+        health_system.apply_health_event(100, HEAL_SOURCE_ID, HEAL_SPELL_ID, TARGET_ID)
+    # Nothing is written until the timestamp is flushed
+    assert health_system.game_obj_data_dct[TARGET_ID].hp == 100.0
+    health_system.apply_health_event(120, DAMAGE_SOURCE_ID, DAMAGE_SPELL_ID, TARGET_ID)
+    assert health_system.game_obj_data_dct[TARGET_ID].hp == 100.0 - 30.0 + 12.0
+    assert health_system.get_hp(TARGET_ID) == 100.0 - 40.0 + 12.0
+
+    health_system.flush_pending_health_events()
+    assert health_system.pop_health_changes() == [
+        HealthChange(100, DAMAGE_SOURCE_ID, DAMAGE_SPELL_ID, TARGET_ID, damage=30.0),
+        HealthChange(100, HEAL_SOURCE_ID, HEAL_SPELL_ID, TARGET_ID, healing=12.0),
+        HealthChange(120, DAMAGE_SOURCE_ID, DAMAGE_SPELL_ID, TARGET_ID, damage=10.0),
+    ]
+    assert health_system.pop_health_changes() == []
+
+
+def test_only_the_newest_frame_of_health_changes_is_kept() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    frames_with_changes = []
+    for ingame_time in range(20, 10_001, 20):
+        world_state.process_frame(LevelSetupConsts.SCRIPTED_PLAYER_INPUT_FOR_TESTING.get(ingame_time, []), ingame_time)
+        if world_state.view_health_changes(ingame_time):
+            frames_with_changes.append(ingame_time)
+    assert frames_with_changes and frames_with_changes[0] < 10_000
+    assert world_state.view_health_changes(frames_with_changes[0]) == []
@@ -0,0 +1,84 @@
+from src.settings import Consts, LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler import SpellConfigLoader
+from src.world_state.state_handler._health_system import HealthSystem, ObjHealthData
+from src.world_state.state_handler._spell_data import HealthSpellFlags, SpellData, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+SPAWN_SPELL_ID = 1
+HIT_SPELL_ID = 2
+HEAL_SPELL_ID = 3
+PHASE_SPELL_ID = 4
+ENRAGE_SPELL_ID = 5
+ATTACKER_ID = 1
+BOSS_ID = 2
+WORLD_HIT_SPELL_ID = 90001
+WORLD_HEAL_SPELL_ID = 90002
+WORLD_PHASE_SPELL_ID = 90003
+
+
+def _health_system() -> HealthSystem:
+    health_system = HealthSystem(SpellTable.compile([
+        SpellData(
+            spell_id=SPAWN_SPELL_ID, health_behavior=HealthSpellFlags.MORTAL, hp=100.0,
+            hp_triggers={0.5: [PHASE_SPELL_ID], 0.3: [ENRAGE_SPELL_ID]},
+        ),
+        SpellData(spell_id=HIT_SPELL_ID, health_behavior=HealthSpellFlags.DAMAGING, power=10.0),
+        SpellData(spell_id=HEAL_SPELL_ID, health_behavior=HealthSpellFlags.HEALING, power=10.0),
+    ]))
+    health_system.game_obj_data_dct[ATTACKER_ID] = ObjHealthData(hp=100.0, max_hp=100.0)
+    health_system.spawn_game_obj(BOSS_ID, SPAWN_SPELL_ID)
+    return health_system
+
+
+def _hit(health_system: HealthSystem, timestamp: int, spell_id: int = HIT_SPELL_ID, times: int = 1) -> list[tuple[int, int, int]]:
+    for _ in range(times):
+        health_system.apply_health_event(timestamp, ATTACKER_ID, spell_id, BOSS_ID)
+    health_system.flush_pending_health_events()
+    return health_system.pop_crossed_hp_thresholds()
+
+
+def test_thresholds_fire_only_when_crossed() -> None:
+    health_system = _health_system()
+    assert _hit(health_system, 100, times=4) == []
+    # One batched timestamp crossing two thresholds fires both, from the highest down
+    assert _hit(health_system, 200, times=3) == [(200, BOSS_ID, PHASE_SPELL_ID), (200, BOSS_ID, ENRAGE_SPELL_ID)]
+    assert _hit(health_system, 300) == []
+    # Healing back above a threshold re-arms it
+    assert _hit(health_system, 400, spell_id=HEAL_SPELL_ID, times=2) == []
+    assert _hit(health_system, 500, times=2) == [(500, BOSS_ID, ENRAGE_SPELL_ID)]
+
+
+def test_mortal_object_dies_once_at_zero_hp() -> None:
+    health_system = _health_system()
+    _hit(health_system, 100, times=9)
+    assert _hit(health_system, 200) == [(200, BOSS_ID, Consts.DEATH_SPELL_ID)]
+    assert _hit(health_system, 300) == []
+
+
+def test_budget_cut_timestamp_fires_thresholds_after_its_last_health_event() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(spell_id=WORLD_HIT_SPELL_ID, targeting=TargetingSpellMode.USE_EVENT_TARGET, health_behavior=HealthSpellFlags.DAMAGING, power=20.0),
+        SpellData(spell_id=WORLD_HEAL_SPELL_ID, targeting=TargetingSpellMode.USE_EVENT_TARGET, health_behavior=HealthSpellFlags.HEALING, power=20.0),
+        SpellData(spell_id=WORLD_PHASE_SPELL_ID, targeting=TargetingSpellMode.SELF),
+    ]))
+    attacker_id = state_handler.player_id
+    boss_id = next(obj_id for obj_id in state_handler._health_system.game_obj_data_dct if obj_id not in (attacker_id, state_handler.environment_id))
+    state_handler._health_system.watch_hp(boss_id, 15.0, WORLD_PHASE_SPELL_ID)
+    world_state.frame_budget.events_per_frame = 1
+
+    # The heal lands in the same timestamp as the hit, so the boss never drops below the threshold
+    for timestamp, spell_id, target_id in ((100, WORLD_HIT_SPELL_ID, boss_id), (100, WORLD_HEAL_SPELL_ID, boss_id), (200, WORLD_HIT_SPELL_ID, boss_id), (200, WORLD_HIT_SPELL_ID, boss_id)):
+        world_state._event_handler.dispatch_upcoming_targeted_event(timestamp, attacker_id, spell_id, target_id)
+    boss_events = []
+    for ingame_time in range(20, 301, 20):
+        world_state.process_frame([], ingame_time)
+        boss_events.extend(
+            (event.timestamp, event.spell_id)
+            for event in world_state._event_handler._event_log_for_each_frame[ingame_time].view_all_events
+            if event.target_id == boss_id and event.spell_id in (WORLD_HIT_SPELL_ID, WORLD_HEAL_SPELL_ID, WORLD_PHASE_SPELL_ID)
+        )
+    assert boss_events == [(100, WORLD_HIT_SPELL_ID), (100, WORLD_HEAL_SPELL_ID), (200, WORLD_HIT_SPELL_ID), (200, WORLD_HIT_SPELL_ID), (200, WORLD_PHASE_SPELL_ID)]
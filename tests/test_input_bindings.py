@@ -0,0 +1,44 @@
+from src.settings import Consts, HardwareInputConsts
+from src.world_state.state_handler._casting_system import CastingSystem
+from src.world_state.state_handler._spell_data import SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+SPAWN_SPELL_ID = 1
+PROJECTILE_SPELL_ID = 2
+BOLT_SPELL_ID = 10
+NOVA_SPELL_ID = 11
+FIRST_ID = 1
+SECOND_ID = 2
+PROJECTILE_ID = 3
+
+
+def _casting_system() -> CastingSystem:
+    casting_system = CastingSystem(SpellTable.compile([
+        SpellData(spell_id=SPAWN_SPELL_ID, hardware_bindings={HardwareInputConsts.KEYBOARD_KEYDOWN_1: BOLT_SPELL_ID}),
+        SpellData(spell_id=PROJECTILE_SPELL_ID),
+    ]))
+    casting_system.spawn_game_obj(0, FIRST_ID, SPAWN_SPELL_ID)
+    casting_system.spawn_game_obj(0, SECOND_ID, SPAWN_SPELL_ID)
+    casting_system.spawn_game_obj(0, PROJECTILE_ID, PROJECTILE_SPELL_ID)
+    return casting_system
+
+
+def _resolve(casting_system: CastingSystem, obj_id: int, input_codes: list[int]) -> list[int]:
+    return list(casting_system.get_spell_ids_for_inputs(obj_id, input_codes))
+
+
+def test_objects_share_binding_tables_until_rebound() -> None:
+    casting_system = _casting_system()
+    first, second = casting_system.game_obj_data_dct[FIRST_ID], casting_system.game_obj_data_dct[SECOND_ID]
+    assert first.binding_table_id == second.binding_table_id
+    assert _resolve(casting_system, PROJECTILE_ID, [HardwareInputConsts.KEYBOARD_KEYDOWN_1]) == []
+
+    casting_system.rebind_input(SECOND_ID, HardwareInputConsts.KEYBOARD_KEYDOWN_TAB, NOVA_SPELL_ID)
+    inputs = [HardwareInputConsts.KEYBOARD_KEYDOWN_1, HardwareInputConsts.KEYBOARD_KEYDOWN_TAB, HardwareInputConsts.KEYBOARD_KEYUP_ARROW_RIGHT]
+    assert _resolve(casting_system, FIRST_ID, inputs) == [BOLT_SPELL_ID]
+    assert _resolve(casting_system, SECOND_ID, inputs) == [BOLT_SPELL_ID, NOVA_SPELL_ID]
+
+    # Rebinding back to the original layout shares the original table again
+    casting_system.rebind_input(SECOND_ID, HardwareInputConsts.KEYBOARD_KEYDOWN_TAB, Consts.EMPTY_ID)
+    assert second.binding_table_id == first.binding_table_id
+    assert casting_system.get_bound_spell_ids(SECOND_ID) == [BOLT_SPELL_ID]
@@ -0,0 +1,64 @@
+import math
+
+from src.settings import Consts, HardwareInputConsts, LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler._movement_system import MovementSystem
+from src.world_state.state_handler._spell_data import MovementSpellFlags, SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+CLAMPED_SPAWN_SPELL_ID = 1
+FREE_SPAWN_SPELL_ID = 2
+ENVIRONMENT_ID = 1
+CLAMPED_ID = 2
+FREE_ID = 3
+
+
+def _simulate(player_inputs: dict[int, list[int]], frame_end: int) -> tuple[WorldState, int]:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    wall_contacts = 0
+    for ingame_time in range(20, frame_end + 1, 20):
+        world_state.process_frame(player_inputs.get(ingame_time, []), ingame_time)
+        wall_contacts += sum(
+            event.spell_id == Consts.WALL_CONTACT_SPELL_ID
+            for event in world_state._event_handler._event_log_for_each_frame[ingame_time].view_all_events
+        )
+    return world_state, wall_contacts
+
+
+def test_player_stops_at_play_area_bounds() -> None:
+    player_inputs = {
+        200: [HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_RIGHT],
+        1000: [HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_UP],
+        9000: [HardwareInputConsts.KEYBOARD_KEYUP_ARROW_UP, HardwareInputConsts.KEYBOARD_KEYDOWN_ARROW_DOWN],
+    }
+    world_state, wall_contacts = _simulate(player_inputs, 12_000)
+    player_id = world_state._state_handler.player_id
+    movement = world_state._state_handler._movement_system.game_obj_data_dct[player_id]
+    x, y = world_state._state_handler.get_position(player_id, 12_000)
+
+    # Pinned to the right wall, while still moving down after leaving the top wall
+    assert x == Consts.PLAY_AREA_MAX and movement.x_vel == 0.0
+    assert Consts.PLAY_AREA_MIN < y < Consts.PLAY_AREA_MAX and movement.y_vel < 0.0
+    assert wall_contacts == 2
+
+
+def test_wall_contact_is_scheduled_only_for_clamped_objects() -> None:
+    movement_system = MovementSystem(SpellTable.compile([
+        SpellData(spell_id=CLAMPED_SPAWN_SPELL_ID, movement_behavior=MovementSpellFlags.CLAMP_TO_PLAY_AREA, spawned_x_offset=0.5),
+        SpellData(spell_id=FREE_SPAWN_SPELL_ID, spawned_x_offset=0.5),
+        SpellData(spell_id=Consts.WALL_CONTACT_SPELL_ID, movement_behavior=MovementSpellFlags.STOP_AT_PLAY_AREA_BOUND),
+    ]))
+    movement_system.create_environment_obj(ENVIRONMENT_ID)
+    movement_system.spawn_game_obj(0, ENVIRONMENT_ID, CLAMPED_ID, CLAMPED_SPAWN_SPELL_ID)
+    movement_system.spawn_game_obj(0, ENVIRONMENT_ID, FREE_ID, FREE_SPAWN_SPELL_ID)
+    movement_system.set_velocity(CLAMPED_ID, 0.0001, -0.001, 100)
+    movement_system.set_velocity(FREE_ID, 0.0001, -0.001, 100)
+
+    wall_contacts = movement_system.pop_rescheduled_wall_contacts()
+    assert [(wall_contact.obj_id, wall_contact.contact_time) for wall_contact in wall_contacts] == [(CLAMPED_ID, 100)]
+    movement_system.apply_movement_event(100, CLAMPED_ID, Consts.WALL_CONTACT_SPELL_ID, CLAMPED_ID)
+    x, y = movement_system.get_position(CLAMPED_ID, 5000)
+    assert math.isclose(x, 0.5 + 0.0001 * 4900) and y == Consts.PLAY_AREA_MIN
+    assert movement_system.pop_rescheduled_wall_contacts()[0].contact_time == 5100
+    assert movement_system.get_position(FREE_ID, 5000)[1] < Consts.PLAY_AREA_MIN
@@ -0,0 +1,20 @@
+from src.world_state.state_handler._movement_system import MovementSystem, ObjMovementData
+from src.world_state.state_handler._spell_table import SpellTable
+
+OBJ_ID = 1
+
+
+def test_memoized_position_is_dropped_when_the_object_moves_differently() -> None:
+    movement_system = MovementSystem(SpellTable.compile([]))
+    movement_system.game_obj_data_dct[OBJ_ID] = ObjMovementData.create_environment()
+    movement_system.set_velocity(OBJ_ID, 0.001, 0.0, 0)
+    assert movement_system.get_position(OBJ_ID, 100) == (0.1, 0.0)
+    assert movement_system._positions == {OBJ_ID: (0.1, 0.0)}
+
+    movement_system.set_velocity(OBJ_ID, 0.0, 0.002, 100)
+    assert OBJ_ID not in movement_system._positions
+    assert movement_system.get_position(OBJ_ID, 100) == (0.1, 0.0)
+    assert movement_system.get_position(OBJ_ID, 200) == (0.1, 0.2)
+
+    movement_system.teleport(OBJ_ID, 0.5, 0.5, 200)
+    assert movement_system.get_position(OBJ_ID, 200) == (0.5, 0.5)
@@ -0,0 +1,87 @@
+import math
+
+from src.world_state.state_handler._movement_system import MovementSystem, ObjMovementData
+from src.world_state.state_handler._spell_data import SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+PURSUIT_SPELL_ID = 1
+FOLLOWER_ID = 1
+TARGET_ID = 2
+SPEED = 0.0005
+
+
+def _movement_system(target_x: float, target_y: float, target_vx: float, target_vy: float) -> MovementSystem:
+    movement_system = MovementSystem(SpellTable.compile([SpellData(spell_id=PURSUIT_SPELL_ID)]))
+    movement_system.game_obj_data_dct[FOLLOWER_ID] = ObjMovementData(0.0, 0.0, 0.0, 0.0, 0, 0)
+    movement_system.game_obj_data_dct[TARGET_ID] = ObjMovementData(target_x, target_y, target_vx, target_vy, 0, 0)
+    return movement_system
+
+
+def _distance(movement_system: MovementSystem, timestamp: int) -> float:
+    follower_x, follower_y = movement_system.get_position(FOLLOWER_ID, timestamp)
+    target_x, target_y = movement_system.get_position(TARGET_ID, timestamp)
+    return math.hypot(target_x - follower_x, target_y - follower_y)
+
+
+def test_follower_meets_target_at_arrival_time() -> None:
+    trajectories = [
+        (0.5, 0.0, 0.0, 0.0),  # Standing still
+        (0.5, 0.0, -0.0002, 0.0),  # Coming closer
+        (0.3, 0.4, 0.0001, -0.0002),  # Crossing
+        (0.5, 0.0, 0.0004, 0.0),  # Running away, but slower than the follower
+    ]
+    for trajectory in trajectories:
+        movement_system = _movement_system(*trajectory)
+        pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+        follower = movement_system.game_obj_data_dct[FOLLOWER_ID]
+        assert math.isclose(math.hypot(follower.x_vel, follower.y_vel), SPEED), trajectory
+        assert pursuit.arrival_time is not None, trajectory
+        # Arrival is rounded up to the next ms, so both objects may have moved past the meeting point
+        assert _distance(movement_system, pursuit.arrival_time) <= 2 * SPEED, trajectory
+        assert movement_system.pop_rescheduled_pursuits() == [pursuit]
+
+
+def test_follower_moves_along_once_caught_up() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.0001, 0.0)
+    pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    arrival_time = pursuit.arrival_time
+    assert arrival_time is not None
+    # The arrival event re-applies the pursuit from where the follower caught up
+    pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, arrival_time)
+    assert pursuit.arrival_time is None
+    assert math.isclose(_distance(movement_system, arrival_time + 10_000), _distance(movement_system, arrival_time), abs_tol=1e-9)
+
+
+def test_faster_target_is_chased_without_arrival() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.001, 0.0)
+    pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    assert pursuit.arrival_time is None
+    assert math.isclose(movement_system.game_obj_data_dct[FOLLOWER_ID].x_vel, SPEED)
+
+
+def test_target_velocity_change_resolves_pursuit() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.0, 0.0)
+    pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    movement_system.pop_rescheduled_pursuits()
+    movement_system.set_velocity(TARGET_ID, 0.0, 0.0003, 200)
+    assert movement_system.pop_rescheduled_pursuits() == [pursuit]
+    assert pursuit.arrival_time is not None
+    assert _distance(movement_system, pursuit.arrival_time) <= 2 * SPEED
+
+
+def test_objects_pursuing_each_other_settle() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.0, 0.0)
+    movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    movement_system.start_pursuit(TARGET_ID, FOLLOWER_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    movement_system.set_velocity(FOLLOWER_ID, 0.0, 0.0001, 100)
+    assert {pursuit.follower_id for pursuit in movement_system.pop_rescheduled_pursuits()} == {FOLLOWER_ID, TARGET_ID}
+
+
+def test_stopping_keeps_velocity_and_reschedules() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.0, 0.0)
+    pursuit = movement_system.start_pursuit(FOLLOWER_ID, TARGET_ID, PURSUIT_SPELL_ID, SPEED, 0)
+    movement_system.pop_rescheduled_pursuits()
+    movement_system.stop_pursuit(FOLLOWER_ID)
+    assert not pursuit.is_active and movement_system.get_pursuit(FOLLOWER_ID) is None
+    assert movement_system.pop_rescheduled_pursuits() == [pursuit]
+    assert math.isclose(movement_system.game_obj_data_dct[FOLLOWER_ID].x_vel, SPEED)
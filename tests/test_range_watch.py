@@ -0,0 +1,128 @@
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.event_handler._combat_event import CombatEvent
+from src.world_state.event_handler._frame_heap import FrameHeap
+from src.world_state.state_handler._movement_system import MovementSystem, ObjMovementData
+from src.world_state.state_handler import SpellConfigLoader
+from src.world_state.state_handler._spell_data import SpellData, TargetingSpellFlags, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+TRIGGERED_SPELL_ID = 1
+SOURCE_ID = 1
+TARGET_ID = 2
+WATCH_SPELL_ID = 9201
+RANGE_TRIGGERED_SPELL_ID = 9202
+RETARGET_SPELL_ID = 9203
+SPAWN_DUMMY_SPELL_ID = 9204
+
+
+def _movement_system(target_x: float, target_y: float, target_vx: float, target_vy: float) -> MovementSystem:
+    movement_system = MovementSystem(SpellTable.compile([SpellData(spell_id=TRIGGERED_SPELL_ID, range_limit=0.1)]))
+    movement_system.game_obj_data_dct[SOURCE_ID] = ObjMovementData(0.0, 0.0, 0.0, 0.0, 0, 0)
+    movement_system.game_obj_data_dct[TARGET_ID] = ObjMovementData(target_x, target_y, target_vx, target_vy, 0, 0)
+    return movement_system
+
+
+def _first_polled_tick(movement_system: MovementSystem, start: int, interval: int, duration: int) -> int | None:
+    for tick in range(start + interval, start + duration + 1, interval):
+        if movement_system.is_within_range(tick, SOURCE_ID, TRIGGERED_SPELL_ID, TARGET_ID):
+            return tick
+    return None
+
+
+def test_range_entry_tick_matches_polling_every_tick() -> None:
+    trajectories = [
+        (0.5, 0.0, -0.0004, 0.0),  # Approaches head-on
+        (0.5, 0.05, -0.0001, 0.0),  # Passes by slowly
+        (0.5, 0.05, -0.01, 0.0),  # Passes by faster than one tick can observe
+        (0.5, 0.5, 0.0001, 0.0),  # Moves away
+        (0.05, 0.0, 0.0, 0.0),  # Already in range
+        (0.1, 0.0, 0.0, 0.0),  # Exactly on the boundary
+    ]
+    for trajectory in trajectories:
+        movement_system = _movement_system(*trajectory)
+        watch = movement_system.start_range_watch(SOURCE_ID, TARGET_ID, TRIGGERED_SPELL_ID, start=0, interval=100, duration=15000)
+        assert movement_system.find_next_range_tick(watch, 0) == _first_polled_tick(movement_system, 0, 100, 15000), trajectory
+
+
+def test_velocity_changes_invalidate_watches_of_both_objects() -> None:
+    movement_system = _movement_system(0.5, 0.0, 0.0, 0.0)
+    watch = movement_system.start_range_watch(SOURCE_ID, TARGET_ID, TRIGGERED_SPELL_ID, start=0, interval=100, duration=15000)
+    assert movement_system.find_next_range_tick(watch, 0) is None
+    movement_system.set_velocity(TARGET_ID, 0.0, 0.0, 100)
+    assert movement_system.pop_invalidated_range_watches() == []
+    movement_system.set_velocity(TARGET_ID, -0.0004, 0.0, 100)
+    assert movement_system.pop_invalidated_range_watches() == [watch]
+    assert movement_system.find_next_range_tick(watch, 100) == _first_polled_tick(movement_system, 100, 100, 14900)
+
+
+def test_cancelled_events_are_skipped_lazily() -> None:
+    frame_heap = FrameHeap.create_heap_from_list_of_events([
+        CombatEvent(event_id=event_id, timestamp=timestamp) for event_id, timestamp in ((1, 10), (2, 10), (3, 20))
+    ])
+    frame_heap.cancel_event(1)
+    frame_heap.cancel_event(3)
+    assert frame_heap.count_unprocessed_events(20) == 1
+    assert frame_heap.pop_next_event().event_id == 2
+    assert not frame_heap.has_unprocessed_events(20)
+
+
+def test_rescheduling_a_watch_keeps_the_event_heap_bounded() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    event_heap = world_state._event_handler._event_heap
+    # A watch on the player itself is always in range, so every reschedule cancels one event and dispatches another
+    player_id = state_handler.player_id
+    watch = state_handler.start_range_watch(player_id, player_id, 114, start=0, interval=100, duration=15000)
+    heap_size_before = len(event_heap._event_heap)
+    for _ in range(1000):
+        world_state._schedule_range_watch(watch, 0)
+    assert len(event_heap._event_heap) <= 2 * (heap_size_before + 1)
+    assert len(event_heap._cancelled_event_ids) <= heap_size_before + 1
+
+
+def _world_state_with_range_trigger() -> tuple[WorldState, int, int]:
+    """Player with a far boss (0.57 away) and a dummy 0.1 away, and spells to watch, trigger and retarget."""
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(spell_id=WATCH_SPELL_ID, targeting=TargetingSpellMode.SELF, range_trigger_spell_id=RANGE_TRIGGERED_SPELL_ID, range_trigger_interval=100, range_trigger_duration=3000),
+        SpellData(spell_id=RANGE_TRIGGERED_SPELL_ID, targeting=TargetingSpellMode.TARGET, range_limit=0.3),
+        SpellData(spell_id=RETARGET_SPELL_ID, targeting=TargetingSpellMode.USE_EVENT_TARGET, targeting_behavior=TargetingSpellFlags.UPDATE_CURRENT_TARGET),
+        SpellData(spell_id=SPAWN_DUMMY_SPELL_ID, targeting=TargetingSpellMode.SELF, targeting_behavior=TargetingSpellFlags.SPAWN_OBJ, spawned_x_offset=0.1),
+    ]))
+    player_id = state_handler.player_id
+    obj_ids = set(state_handler.get_all_obj_ids())
+    world_state._event_handler.dispatch_upcoming_targeted_event(20, player_id, SPAWN_DUMMY_SPELL_ID, player_id)
+    world_state.process_frame([], 20)
+    (dummy_id,) = set(state_handler.get_all_obj_ids()) - obj_ids
+    return world_state, state_handler._targeting_system.default_ids.boss1_id, dummy_id
+
+
+def _triggered_events(world_state: WorldState, initial_target_id: int, new_target_id: int) -> list[CombatEvent]:
+    """Starts the watch on the initial target, switches to the new one before the first tick, and runs the watch out."""
+    player_id = world_state._state_handler.player_id
+    world_state._event_handler.dispatch_upcoming_targeted_event(40, player_id, RETARGET_SPELL_ID, initial_target_id)
+    world_state._event_handler.dispatch_upcoming_targeted_event(60, player_id, WATCH_SPELL_ID, player_id)
+    world_state._event_handler.dispatch_upcoming_targeted_event(100, player_id, RETARGET_SPELL_ID, new_target_id)
+    triggered_events = []
+    for ingame_time in range(40, 3500, 20):
+        world_state.process_frame([], ingame_time)
+        event_log = world_state._event_handler._event_log_for_each_frame.get(ingame_time)
+        if event_log is not None:
+            triggered_events.extend(event for event in event_log.view_all_events if event.spell_id == RANGE_TRIGGERED_SPELL_ID)
+    return triggered_events
+
+
+def test_range_watch_follows_the_caster_to_a_target_in_range() -> None:
+    world_state, boss_id, dummy_id = _world_state_with_range_trigger()
+    triggered_events = _triggered_events(world_state, boss_id, dummy_id)
+    assert len(triggered_events) == 30
+    assert all(event.target_id == dummy_id and event.outcome_is_valid for event in triggered_events)
+
+
+def test_range_watch_stops_firing_when_the_caster_switches_to_a_target_out_of_range() -> None:
+    world_state, boss_id, dummy_id = _world_state_with_range_trigger()
+    assert _triggered_events(world_state, dummy_id, boss_id) == []
@@ -0,0 +1,76 @@
+import shutil
+
+import pytest
+
+from tests.sim_validation import SimValidation
+from tests.snapshot_runner import ScenarioResult, SnapshotRunner
+
+SCENARIOS = SnapshotRunner.discover_scenarios()
+
+
+@pytest.fixture(scope="session")
+def scenario_results() -> dict[str, ScenarioResult]:
+    # All scenarios run once, in parallel, the first time any of them is requested
+    return {result.scenario_name: result for result in SnapshotRunner.run_scenarios(SCENARIOS)}
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[scenario.name for scenario in SCENARIOS])
+def test_scenario_matches_golden_master(scenario, scenario_results: dict[str, ScenarioResult]) -> None:
+    result = scenario_results[scenario.name]
+    assert result.passed, f"{result.error}\n{result.output}"
+
+
+def test_every_golden_master_is_validated_by_a_scenario() -> None:
+    assert SnapshotRunner.find_orphan_goldens(SCENARIOS) == []
+
+
+def test_missing_golden_master_fails_without_creating_one(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    snapshot_dir = tmp_path / "goldens"
+    snapshot_dir.mkdir()
+    monkeypatch.setattr(SimValidation, "SNAPSHOT_DIR", str(snapshot_dir))
+    result = SnapshotRunner.run_scenario(SCENARIOS[0])
+    assert not result.passed
+    assert "No golden master" in result.error
+    assert not list(snapshot_dir.iterdir())
+
+
+def test_golden_master_diff_reports_every_frame_of_a_changed_field(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scenario = SCENARIOS[0]
+    golden_path = SimValidation._snapshot_path(scenario.snapshot_name)
+    assert SimValidation.diff_golden_masters(golden_path, golden_path) == []
+
+    serialize_ecs_entity = SimValidation._serialize_ecs_entity
+    def serialize_with_extra_field(state, obj_id: int) -> dict:
+        data = serialize_ecs_entity(state, obj_id)
+        if "movement" in data:
+            data["movement"]["extra_field"] = 0
+        return data
+    monkeypatch.setattr(SimValidation, "_serialize_ecs_entity", staticmethod(serialize_with_extra_field))
+    changed_path = str(tmp_path / "changed.jsonl")
+    SimValidation.record_golden_master(scenario.setup_spell_ids, scenario.scripted_player_input, changed_path)
+
+    diffs = SimValidation.diff_golden_masters(golden_path, changed_path)
+    assert diffs and all(".movement.extra_field: ADDED" in diff for diff in diffs)
+    summary = SimValidation.summarize_diffs(diffs)
+    assert [line.split("x ", 1)[1] for line in summary] == [
+        "[Frame *][Entity *].movement.extra_field: ADDED",
+        "[Entity *].movement.extra_field: ADDED",
+    ]
+
+
+def test_golden_masters_are_only_updated_when_their_events_are_unchanged(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    first, second = SCENARIOS[0], SCENARIOS[1]
+    first_golden, second_golden = (SimValidation._snapshot_path(scenario.snapshot_name) for scenario in (first, second))
+    snapshot_dir = tmp_path / "goldens"
+    snapshot_dir.mkdir()
+    shutil.copy(first_golden, snapshot_dir / f"{first.snapshot_name}.jsonl")
+    # A golden master recorded by another scenario has different events
+    shutil.copy(first_golden, snapshot_dir / f"{second.snapshot_name}.jsonl")
+    monkeypatch.setattr(SimValidation, "SNAPSHOT_DIR", str(snapshot_dir))
+
+    assert SnapshotRunner.update_golden_masters() == [str(snapshot_dir / f"{first.snapshot_name}.jsonl")]
+    assert (snapshot_dir / f"{second.snapshot_name}.jsonl").read_bytes() == open(first_golden, "rb").read()
+    assert sorted(path.name for path in snapshot_dir.iterdir()) == sorted(f"{scenario.snapshot_name}.jsonl" for scenario in (first, second))
+
+    assert len(SnapshotRunner.update_golden_masters(allow_event_changes=True)) == 2
+    assert SimValidation.diff_golden_masters(second_golden, str(snapshot_dir / f"{second.snapshot_name}.jsonl")) == []
@@ -0,0 +1,54 @@
+import dataclasses
+import re
+
+import pytest
+
+from src.settings import HardwareInputConsts, LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler import SpellConfigLoader
+from src.world_state.state_handler._spell_data import SpawnedComponentFlags, SpellData, TargetingSpellFlags
+from src.world_state.state_handler._spell_table import SpellTable
+from tests.sim_validation import SimValidation
+from tests.snapshot_runner import SnapshotRunner
+
+SPAWN_SPELL_ID = 1
+
+
+def test_projectiles_are_spawned_without_casting_and_health() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    world_state.process_frame([HardwareInputConsts.KEYBOARD_KEYDOWN_TAB], 20)
+    obj_ids = set(world_state._state_handler.get_all_obj_ids())
+    world_state.process_frame([HardwareInputConsts.KEYBOARD_KEYDOWN_4], 40)
+    projectile_ids = set(world_state._state_handler.get_all_obj_ids()) - obj_ids
+    assert projectile_ids
+    state_handler = world_state._state_handler
+    for projectile_id in projectile_ids:
+        assert projectile_id in state_handler._movement_system.game_obj_data_dct
+        assert projectile_id not in state_handler._casting_system.game_obj_data_dct
+        assert projectile_id not in state_handler._health_system.game_obj_data_dct
+
+    # The projectiles still fly and hit without either component
+    boss_hp = {obj_id: state_handler._health_system.get_hp(obj_id) for obj_id in obj_ids}
+    for ingame_time in range(60, 3000, 20):
+        world_state.process_frame([], ingame_time)
+    assert any(state_handler._health_system.get_hp(obj_id) < hp for obj_id, hp in boss_hp.items())
+
+
+def test_hp_requires_a_health_component() -> None:
+    spell = SpellData(spell_id=SPAWN_SPELL_ID, targeting_behavior=TargetingSpellFlags.SPAWN_OBJ, hp=10.0, spawned_components=SpawnedComponentFlags.CASTING)
+    with pytest.raises(ValueError, match="no health component"):
+        SpellConfigLoader._validate_references({SPAWN_SPELL_ID: spell})
+
+
+def test_leaving_out_components_only_changes_the_recorded_components(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    every_component = SpawnedComponentFlags.CASTING | SpawnedComponentFlags.HEALTH
+    spell_table = SpellTable.compile([dataclasses.replace(spell, spawned_components=every_component) for spell in SpellConfigLoader.load_spells()])
+    monkeypatch.setattr(SpellConfigLoader, "load_spell_table", staticmethod(lambda config_dir=None: spell_table))
+    for scenario in SnapshotRunner.discover_scenarios():
+        path = str(tmp_path / f"{scenario.snapshot_name}.jsonl")
+        SimValidation.record_golden_master(scenario.setup_spell_ids, scenario.scripted_player_input, path)
+        diffs = SimValidation.diff_golden_masters(SimValidation._snapshot_path(scenario.snapshot_name), path)
+        assert diffs, scenario.name
+        for diff in diffs:
+            assert re.fullmatch(r"(\[Frame \d+\])?\[Entity \d+\]\.(casting|health): ADDED → .*", diff), diff
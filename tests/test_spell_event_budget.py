@@ -0,0 +1,38 @@
+import math
+
+from src.world_state.state_handler import EventBudgetAnalyzer, SpellConfigLoader
+from src.world_state.state_handler._spell_data import SpellData, TargetingSpellFlags, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+
+def test_configured_spells_stay_within_event_budget() -> None:
+    report = EventBudgetAnalyzer(SpellConfigLoader.load_spell_table()).analyze()
+    assert not report.timeline_cycles, "\n".join(report.format_lines())
+    assert not report.over_limit, "\n".join(report.format_lines())
+
+
+def test_fan_out_counts_channels_and_aoe_targets() -> None:
+    spell_table = SpellTable.compile([
+        SpellData(spell_id=1, name="tick"),
+        SpellData(spell_id=2, name="channel", timeline={100: [1], 200: [1], 1300: [1]}),
+        SpellData(spell_id=3, name="aoe", targeting_behavior=TargetingSpellFlags.AOE, timeline={0: [2]}),
+    ])
+    budgets = {budget.spell_id: budget for budget in EventBudgetAnalyzer(spell_table, aoe_target_count=3).analyze().budgets}
+    assert budgets[2].total_events == 4
+    assert budgets[2].duration_ms == 1300
+    assert budgets[2].peak_events_per_second == 3
+    assert budgets[3].total_events == 1 + 3 * 4
+    assert budgets[3].peak_events_per_timestamp == 1 + 3
+
+
+def test_cycles_are_flagged_as_unbounded() -> None:
+    spell_table = SpellTable.compile([
+        SpellData(spell_id=1, name="ping", targeting=TargetingSpellMode.SELF, timeline={0: [2]}),
+        SpellData(spell_id=2, name="pong", targeting=TargetingSpellMode.SELF, timeline={0: [1]}),
+        SpellData(spell_id=3, name="repeat", timeline={500: [3]}),
+        SpellData(spell_id=4, name="cast_repeat", timeline={0: [3]}),
+    ])
+    report = EventBudgetAnalyzer(spell_table).analyze()
+    assert report.timeline_cycles == [[1, 2], [3]]
+    assert report.zero_delay_cycles == [[1, 2]]
+    assert all(math.isinf(budget.total_events) for budget in report.budgets)
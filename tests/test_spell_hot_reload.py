@@ -0,0 +1,104 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler import SpellConfigError, SpellConfigLoader
+from tests.sim_validation import SimValidation
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    config_dir = tmp_path / "spell_configs"
+    shutil.copytree(SpellConfigLoader.CONFIG_DIR, config_dir)
+    return config_dir
+
+
+def _running_world_state() -> WorldState:
+    world_state = WorldState()
+    world_state.process_setup_events(0, LevelSetupConsts.BRAVO_SETUP_SPELL_IDS)
+    for ingame_time in range(20, 2001, 20):
+        world_state.process_frame([], ingame_time)
+    return world_state
+
+
+def _edit(path: Path, old: str, new: str) -> None:
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new, 1))
+
+
+def test_edited_spells_are_patched_into_a_running_game(config_dir: Path) -> None:
+    world_state = _running_world_state()
+    watcher = world_state.create_spell_config_watcher(config_dir)
+    entities_before = {obj_id: SimValidation._serialize_ecs_entity(world_state, obj_id) for obj_id in SimValidation._all_obj_ids(world_state)}
+    scheduled_events_before = len(world_state._event_handler._event_heap._event_heap)
+
+    assert watcher.reload_if_changed() is None
+    _edit(config_dir / "spec_warlock.toml", "power = 13.0", "power = 26.0")
+    diff = watcher.reload_if_changed()
+
+    assert diff is not None and diff.changed == {111} and not diff.added and not diff.removed
+    spell_table = world_state._state_handler.spell_table
+    assert spell_table.powers[spell_table.slot_of(111)] == 26.0
+    assert world_state._state_handler._health_system.spell_table is spell_table
+    assert world_state._state_handler._vfx_and_sfx_system.spell_table is spell_table
+    entities_after = {obj_id: SimValidation._serialize_ecs_entity(world_state, obj_id) for obj_id in SimValidation._all_obj_ids(world_state)}
+    assert entities_after == entities_before
+    assert len(world_state._event_handler._event_heap._event_heap) == scheduled_events_before
+    world_state.process_frame([], 2020)
+
+
+def test_invalid_edits_keep_the_running_spells(config_dir: Path) -> None:
+    world_state = _running_world_state()
+    watcher = world_state.create_spell_config_watcher(config_dir)
+    spell_table = world_state._state_handler.spell_table
+
+    _edit(config_dir / "spec_warlock.toml", "power = 13.0", "power = ")
+    assert watcher.reload_if_changed() is None
+    _edit(config_dir / "spec_warlock.toml", "power = ", "power = 13.0")
+    _edit(config_dir / "spec_warlock.toml", "spell_id = 911", "spell_id = 9911")
+    assert watcher.reload_if_changed() is None
+
+    assert world_state._state_handler.spell_table is spell_table
+
+
+def test_edits_that_fail_to_compile_keep_the_running_spells(config_dir: Path) -> None:
+    world_state = _running_world_state()
+    watcher = world_state.create_spell_config_watcher(config_dir)
+    spell_table = world_state._state_handler.spell_table
+
+    # Parses and passes the reference checks, but no slot can be given to a negative id
+    _edit(config_dir / "basic_movement.toml", "spell_id = 363", "spell_id = -363")
+    assert watcher.reload_if_changed() is None
+    with pytest.raises(SpellConfigError, match="cannot be given a slot"):
+        SpellConfigLoader.load_spell_table(config_dir)
+
+    assert world_state._state_handler.spell_table is spell_table
+    world_state.process_frame([], 2020)
+
+
+def test_compiled_caches_of_other_configs_are_kept(config_dir: Path) -> None:
+    _edit(config_dir / "spec_warlock.toml", "power = 13.0", "power = 17.0")
+    first_hash = SpellConfigLoader._hash_config_files(SpellConfigLoader._find_config_files(config_dir))
+    first_table = SpellConfigLoader.load_spell_table(config_dir)
+    _edit(config_dir / "spec_warlock.toml", "power = 17.0", "power = 19.0")
+    SpellConfigLoader.load_spell_table(config_dir)
+
+    assert len(list(SpellConfigLoader.CACHE_DIR.glob("spell_table.*.pickle"))) == 2
+    assert not list(SpellConfigLoader.CACHE_DIR.glob("*.tmp"))
+    assert SpellConfigLoader._read_cached_table(first_hash) == first_table
+
+
+def test_only_the_newest_compiled_tables_are_kept(config_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(SpellConfigLoader, "CACHED_TABLES_TO_KEEP", 2)
+    monkeypatch.setattr(SpellConfigLoader, "_loaded_tables", {})
+    for power in ("17.0", "19.0", "23.0"):
+        _edit(config_dir / "spec_warlock.toml", "power = 13.0", f"power = {power}")
+        SpellConfigLoader.load_spell_table(config_dir)
+        _edit(config_dir / "spec_warlock.toml", f"power = {power}", "power = 13.0")
+
+    assert len(list(SpellConfigLoader.CACHE_DIR.glob("spell_table.*.pickle"))) == 2
+    assert len(SpellConfigLoader._loaded_tables) == 2
@@ -0,0 +1,54 @@
+from src.settings import Consts, HardwareInputConsts, LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.event_handler._outcome import OutcomeCode
+from src.world_state.state_handler._casting_system import CastingSystem, ObjCastingData
+from src.world_state.state_handler._spell_data import CastingSpellFlags, SpellData
+from src.world_state.state_handler._spell_table import SpellTable
+
+GCD_SPELL_ID = 10
+OFF_GCD_SPELL_ID = 20
+OBJ_ID = 1
+SHADOWBOLT_SPELL_ID = 124
+FIRE_BLAST_SPELL_ID = 128
+
+
+def test_only_inputs_within_the_window_are_held_back() -> None:
+    casting_system = CastingSystem(SpellTable.compile([
+        SpellData(spell_id=GCD_SPELL_ID, casting_behavior=CastingSpellFlags.TRIGGER_GCD),
+        SpellData(spell_id=OFF_GCD_SPELL_ID),
+    ]))
+    casting_system.game_obj_data_dct[OBJ_ID] = ObjCastingData(spell_queue_window=200)
+    casting_system.apply_casting_event(0, OBJ_ID, GCD_SPELL_ID)
+    assert casting_system.get_cast_time(OBJ_ID, GCD_SPELL_ID, 799) == 799
+    assert casting_system.get_cast_time(OBJ_ID, GCD_SPELL_ID, 800) == Consts.BASE_GCD
+    assert casting_system.get_cast_time(OBJ_ID, OFF_GCD_SPELL_ID, 800) == 800
+    assert casting_system.get_cast_time(OBJ_ID, GCD_SPELL_ID, Consts.BASE_GCD + 1) == Consts.BASE_GCD + 1
+
+    queued_cast = casting_system.queue_cast(OBJ_ID, GCD_SPELL_ID, Consts.BASE_GCD, 7)
+    assert casting_system.pop_queued_cast_for_event(7) is queued_cast
+    assert casting_system.pop_queued_cast(OBJ_ID) is None
+
+
+def test_early_input_is_cast_when_the_gcd_is_ready() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    player_id = world_state._state_handler.player_id
+    world_state.process_frame([HardwareInputConsts.KEYBOARD_KEYDOWN_TAB], 20)
+    world_state.process_frame([HardwareInputConsts.KEYBOARD_KEYDOWN_4], 40)
+    gcd_ready_at = world_state._state_handler._casting_system.game_obj_data_dct[player_id].gcd_ready_at
+
+    # The second early input replaces the first one in the queue
+    queued_inputs = {gcd_ready_at - 100: [HardwareInputConsts.KEYBOARD_KEYDOWN_1], gcd_ready_at - 60: [HardwareInputConsts.KEYBOARD_KEYDOWN_4]}
+    player_casts = []
+    for ingame_time in range(60, gcd_ready_at + 100, 20):
+        world_state.process_frame(queued_inputs.get(ingame_time, []), ingame_time)
+        player_casts.extend(
+            (event.timestamp, event.spell_id, event.outcome)
+            for event in world_state._event_handler._event_log_for_each_frame[ingame_time].view_all_events
+            if event.source_id == player_id and event.spell_id in (SHADOWBOLT_SPELL_ID, FIRE_BLAST_SPELL_ID)
+        )
+    assert player_casts == [(gcd_ready_at, SHADOWBOLT_SPELL_ID, OutcomeCode.SUCCESS)]
+    # Neither the replaced nor the cast event is still looked up as bound
+    event_heap = world_state._event_handler._event_heap
+    scheduled_event_ids = {event_id for _, event_id, _ in event_heap._event_heap} - event_heap._cancelled_event_ids
+    assert world_state._state_handler._bound_event_ids <= scheduled_event_ids
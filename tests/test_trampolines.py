@@ -0,0 +1,86 @@
+import pytest
+
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler import SpellConfigLoader, StateHandler
+from src.world_state.state_handler._spell_data import SpellData, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+OUTER_TRAMPOLINE_SPELL_ID = 90001
+INNER_TRAMPOLINE_SPELL_ID = 90002
+FIRST_MARKER_SPELL_ID = 90003
+SECOND_MARKER_SPELL_ID = 90004
+OTHER_MARKER_SPELL_ID = 90005
+TRAMPOLINE_SPELL_IDS = (OUTER_TRAMPOLINE_SPELL_ID, INNER_TRAMPOLINE_SPELL_ID)
+
+
+def _marker_order(queue_other_first: bool) -> list[tuple[int, int]]:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(spell_id=OUTER_TRAMPOLINE_SPELL_ID, targeting=TargetingSpellMode.SELF, timeline={0: [INNER_TRAMPOLINE_SPELL_ID, FIRST_MARKER_SPELL_ID]}),
+        SpellData(spell_id=INNER_TRAMPOLINE_SPELL_ID, targeting=TargetingSpellMode.SELF, timeline={0: [SECOND_MARKER_SPELL_ID]}),
+        SpellData(spell_id=FIRST_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+        SpellData(spell_id=SECOND_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+        SpellData(spell_id=OTHER_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+    ]))
+    player_id = state_handler.player_id
+    other_id = next(obj_id for obj_id in state_handler.get_all_obj_ids() if obj_id not in (player_id, state_handler.environment_id))
+    dispatches = [(player_id, OUTER_TRAMPOLINE_SPELL_ID), (other_id, OTHER_MARKER_SPELL_ID)]
+    for source_id, spell_id in (reversed(dispatches) if queue_other_first else dispatches):
+        world_state._event_handler.dispatch_upcoming_untargeted_event(100, source_id, spell_id)
+    world_state.process_frame([], 100)
+    return [
+        (event.source_id, event.spell_id)
+        for event in world_state._event_handler._event_log_for_each_frame[100].view_all_events
+        if event.spell_id >= OUTER_TRAMPOLINE_SPELL_ID
+    ]
+
+
+@pytest.mark.parametrize("queue_other_first", [False, True])
+def test_expansion_keeps_the_order_of_same_timestamp_events(queue_other_first: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    expanded_order = _marker_order(queue_other_first)
+    # Without expansion, every trampoline goes through the heap, as it did before trampolines were expanded
+    monkeypatch.setattr(StateHandler, "get_trampoline_expansion", lambda self, spell_id: ())
+    heap_order = _marker_order(queue_other_first)
+    assert expanded_order == [event for event in heap_order if event[1] not in TRAMPOLINE_SPELL_IDS]
+    assert [spell_id for _, spell_id in expanded_order] == [OTHER_MARKER_SPELL_ID, FIRST_MARKER_SPELL_ID, SECOND_MARKER_SPELL_ID]
+
+
+ECHOING_MARKER_SPELL_ID = 90006
+ECHO_MARKER_SPELL_ID = 90007
+
+
+def _marker_order_with_budget(events_per_frame: int) -> list[int]:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(spell_id=OUTER_TRAMPOLINE_SPELL_ID, targeting=TargetingSpellMode.SELF, timeline={0: [INNER_TRAMPOLINE_SPELL_ID, ECHOING_MARKER_SPELL_ID, FIRST_MARKER_SPELL_ID]}),
+        SpellData(spell_id=INNER_TRAMPOLINE_SPELL_ID, targeting=TargetingSpellMode.SELF, timeline={0: [SECOND_MARKER_SPELL_ID]}),
+        # Not a trampoline, since it has an effect of its own, but it dispatches a spell with zero delay
+        SpellData(spell_id=ECHOING_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF, audio_name="echo", timeline={0: [ECHO_MARKER_SPELL_ID]}),
+        SpellData(spell_id=ECHO_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+        SpellData(spell_id=FIRST_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+        SpellData(spell_id=SECOND_MARKER_SPELL_ID, targeting=TargetingSpellMode.SELF),
+    ]))
+    world_state.frame_budget.events_per_frame = events_per_frame
+    world_state._event_handler.dispatch_upcoming_untargeted_event(100, state_handler.player_id, OUTER_TRAMPOLINE_SPELL_ID)
+    marker_order = []
+    for ingame_time in range(100, 300, 20):
+        world_state.process_frame([], ingame_time)
+        marker_order.extend(
+            event.spell_id for event in world_state._event_handler._event_log_for_each_frame[ingame_time].view_all_events
+            if event.spell_id >= OUTER_TRAMPOLINE_SPELL_ID and event.spell_id not in TRAMPOLINE_SPELL_IDS
+        )
+        assert world_state.frame_budget.events_last_frame <= events_per_frame
+    return marker_order
+
+
+@pytest.mark.parametrize("events_per_frame", [1, 2, 3])
+def test_expansion_stops_when_the_frame_budget_is_spent(events_per_frame: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    expanded_order = _marker_order_with_budget(events_per_frame)
+    monkeypatch.setattr(StateHandler, "get_trampoline_expansion", lambda self, spell_id: ())
+    assert expanded_order == _marker_order_with_budget(10_000)
+    assert expanded_order == [ECHOING_MARKER_SPELL_ID, FIRST_MARKER_SPELL_ID, SECOND_MARKER_SPELL_ID, ECHO_MARKER_SPELL_ID]
@@ -0,0 +1,102 @@
+import math
+import random
+
+from src.settings import LevelSetupConsts
+from src.world_state import WorldState
+from src.world_state.state_handler import SpellConfigLoader
+from src.world_state.state_handler._movement_system import MovementSystem, ObjMovementData
+from src.world_state.state_handler._spell_data import MovementSpellFlags, SpellData, TargetingSpellFlags, TargetingSpellMode
+from src.world_state.state_handler._spell_table import SpellTable
+
+KNOCKBACK_SPELL_ID = 1
+RELEASE_SPELL_ID = 2
+PURSUIT_SPELL_ID = 3
+OBJ_ID = 1
+PUSHER_ID = 2
+OTHER_PUSHER_ID = 3
+WORLD_KNOCKBACK_SPELL_ID = 90001
+WORLD_PURSUIT_SPELL_ID = 90002
+WORLD_VANISH_SPELL_ID = 90003
+
+
+def _movement_system() -> MovementSystem:
+    movement_system = MovementSystem(SpellTable.compile([
+        SpellData(spell_id=KNOCKBACK_SPELL_ID, movement_behavior=MovementSpellFlags.APPLY_VELOCITY, power=2.0),
+        SpellData(spell_id=RELEASE_SPELL_ID, movement_behavior=MovementSpellFlags.REMOVE_VELOCITY),
+        SpellData(spell_id=PURSUIT_SPELL_ID, movement_behavior=MovementSpellFlags.MOVE_TOWARDS_TARGET, power=5.0),
+    ]))
+    movement_system.game_obj_data_dct[OBJ_ID] = ObjMovementData(0.5, 0.5, 0.0, 0.0, 0, 0)
+    movement_system.game_obj_data_dct[PUSHER_ID] = ObjMovementData(0.4, 0.5, 0.0, 0.0, 0, 0)
+    movement_system.game_obj_data_dct[OTHER_PUSHER_ID] = ObjMovementData(0.5, 0.4, 0.0, 0.0, 0, 0)
+    return movement_system
+
+
+def test_pushes_stack_on_own_movement_and_unwind_exactly() -> None:
+    movement_system = _movement_system()
+    movement_system.set_x_velocity(OBJ_ID, 0.0001, 0)
+    movement_system.apply_movement_event(100, PUSHER_ID, KNOCKBACK_SPELL_ID, OBJ_ID)
+    assert movement_system.get_velocity(OBJ_ID) == (0.0001 + 0.0002, 0.0)
+    movement_system.set_y_velocity(OBJ_ID, 0.0001, 200)
+    assert math.isclose(movement_system.get_velocity(OBJ_ID)[0], 0.0003)
+
+    movement_system.apply_movement_event(300, PUSHER_ID, RELEASE_SPELL_ID, OBJ_ID)
+    assert movement_system.get_velocity(OBJ_ID) == (0.0001, 0.0001)
+    x, y = movement_system.get_position(OBJ_ID, 300)
+    assert math.isclose(x, 0.5 + 0.0001 * 300 + 0.0002 * 200) and math.isclose(y, 0.5 + 0.0001 * 100)
+
+
+def test_summed_velocity_matches_contributions() -> None:
+    movement_system = _movement_system()
+    rng = random.Random(7)
+    for timestamp in range(0, 2000, 10):
+        source_id = rng.choice((OBJ_ID, PUSHER_ID, OTHER_PUSHER_ID))
+        if rng.random() < 0.3:
+            movement_system.remove_velocity(OBJ_ID, source_id, timestamp)
+        else:
+            movement_system.apply_velocity(OBJ_ID, source_id, rng.uniform(-0.001, 0.001), rng.uniform(-0.001, 0.001), timestamp)
+        data = movement_system.game_obj_data_dct[OBJ_ID]
+        assert math.isclose(data.x_vel, sum(contribution.x_vel for contribution in data.velocities.values()), abs_tol=1e-15)
+        assert math.isclose(data.y_vel, sum(contribution.y_vel for contribution in data.velocities.values()), abs_tol=1e-15)
+    for source_id in (OBJ_ID, PUSHER_ID, OTHER_PUSHER_ID):
+        movement_system.remove_velocity(OBJ_ID, source_id, 2000)
+    assert movement_system.get_velocity(OBJ_ID) == (0.0, 0.0)
+
+
+def test_despawned_pusher_stops_pushing_and_being_pursued() -> None:
+    world_state = WorldState(headless=True)
+    world_state.process_setup_events(0, LevelSetupConsts.TEST_SETUP_SPELL_IDS)
+    state_handler = world_state._state_handler
+    state_handler.reload_spell_table(SpellTable.compile(SpellConfigLoader.load_spells() + [
+        SpellData(spell_id=WORLD_KNOCKBACK_SPELL_ID, targeting=TargetingSpellMode.USE_EVENT_TARGET, movement_behavior=MovementSpellFlags.APPLY_VELOCITY, power=2.0),
+        SpellData(spell_id=WORLD_PURSUIT_SPELL_ID, targeting=TargetingSpellMode.USE_EVENT_TARGET, movement_behavior=MovementSpellFlags.MOVE_TOWARDS_TARGET, power=0.5),
+        SpellData(
+            spell_id=WORLD_VANISH_SPELL_ID, targeting=TargetingSpellMode.SELF,
+            movement_behavior=MovementSpellFlags.DESPAWN_SELF, targeting_behavior=TargetingSpellFlags.DESPAWN_SELF,
+        ),
+    ]))
+    player_id = state_handler.player_id
+    pusher_id = next(obj_id for obj_id in state_handler.get_all_obj_ids() if obj_id not in (player_id, state_handler.environment_id))
+    world_state._event_handler.dispatch_upcoming_targeted_event(100, pusher_id, WORLD_KNOCKBACK_SPELL_ID, player_id)
+    world_state._event_handler.dispatch_upcoming_targeted_event(100, player_id, WORLD_PURSUIT_SPELL_ID, pusher_id)
+    world_state._event_handler.dispatch_upcoming_untargeted_event(200, pusher_id, WORLD_VANISH_SPELL_ID)
+    world_state.process_frame([], 100)
+    movement_system = state_handler._movement_system
+    assert pusher_id in movement_system.game_obj_data_dct[player_id].velocities
+    assert movement_system.get_pursuit(player_id) is not None
+
+    world_state.process_frame([], 200)
+    assert pusher_id not in movement_system.game_obj_data_dct[player_id].velocities
+    assert movement_system.get_pursuit(player_id) is None
+    # The despawned object stays put where it vanished
+    assert movement_system.get_velocity(pusher_id) == (0.0, 0.0)
+    assert movement_system.get_position(pusher_id, 300) == movement_system.get_position(pusher_id, 200)
+
+
+def test_pursuit_corrects_for_pushes_on_the_follower() -> None:
+    movement_system = _movement_system()
+    movement_system.apply_movement_event(0, OBJ_ID, PURSUIT_SPELL_ID, OTHER_PUSHER_ID)
+    movement_system.apply_movement_event(100, PUSHER_ID, KNOCKBACK_SPELL_ID, OBJ_ID)
+    pursuit = movement_system.get_pursuit(OBJ_ID)
+    assert pursuit is not None and pursuit.arrival_time is not None
+    x, y = movement_system.get_position(OBJ_ID, pursuit.arrival_time)
+    assert math.hypot(x - 0.5, y - 0.4) <= 2 * pursuit.speed